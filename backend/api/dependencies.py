@@ -0,0 +1,72 @@
+"""Shared FastAPI dependencies for API routers."""
+
+from __future__ import annotations
+
+import httpx
+from fastapi import HTTPException, Request
+
+from services.http_clients import HttpClientRegistry
+from services.jobs import JobRunner
+from services.llamacloud_keys import check_llama_key
+
+
+def _http_clients(request: Request) -> HttpClientRegistry | None:
+    """Return the app-wide client registry, if the lifespan has created one."""
+    return getattr(request.app.state, "http_clients", None)
+
+
+def get_extraction_client(request: Request) -> httpx.AsyncClient | None:
+    """Pooled client for tweet metadata upstreams."""
+    clients = _http_clients(request)
+    return clients.extraction if clients else None
+
+
+def get_media_client(request: Request) -> httpx.AsyncClient | None:
+    """Pooled client for tweet image downloads."""
+    clients = _http_clients(request)
+    return clients.media if clients else None
+
+
+def get_llamacloud_client(request: Request) -> httpx.AsyncClient | None:
+    """Pooled client for LlamaCloud REST calls."""
+    clients = _http_clients(request)
+    return clients.llamacloud if clients else None
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    """Background job runner started by the app lifespan."""
+    runner = getattr(request.app.state, "job_runner", None)
+    if runner is None:
+        raise HTTPException(
+            status_code=503,
+            detail={"error_code": "JOBS_UNAVAILABLE", "message": "Background job runner is not running."},
+        )
+    return runner
+
+
+def require_llamacloud_key_format(api_key: str) -> None:
+    """Reject API keys that cannot be LlamaCloud keys."""
+    if not api_key.startswith("llx-"):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error_code": "INVALID_API_KEY",
+                "message": "LlamaCloud API key must start with llx-",
+            },
+        )
+
+
+async def ensure_key_accepted(api_key: str, client: httpx.AsyncClient | None) -> None:
+    """Fail fast when LlamaCloud rejects api_key; an unreachable probe is not fatal."""
+    try:
+        validation = await check_llama_key(api_key, client)
+    except httpx.RequestError:
+        return
+    if validation.rejected:
+        raise HTTPException(
+            status_code=validation.status_code,
+            detail={
+                "error_code": "INVALID_API_KEY",
+                "message": "LlamaCloud rejected this API key.",
+            },
+        )
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, Depends, HTTPException
 
+from api.dependencies import get_extraction_client
 from models import ErrorResponse, ExtractTweetImagesRequest, ExtractTweetImagesResponse
 from services.tweet_media import TweetMediaError, extract_tweet_images
 
@@ -15,12 +17,16 @@ router = APIRouter(tags=["extract"])
     response_model=ExtractTweetImagesResponse,
     responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
 )
-async def extract_images(request: ExtractTweetImagesRequest) -> ExtractTweetImagesResponse:
+async def extract_images(
+    request: ExtractTweetImagesRequest,
+    http_client: httpx.AsyncClient | None = Depends(get_extraction_client),
+) -> ExtractTweetImagesResponse:
     """Extract image attachments from a tweet URL."""
     try:
         extracted = await extract_tweet_images(
             tweet_url=request.tweet_url,
             x_bearer_token=request.x_bearer_token,
+            client=http_client,
         )
     except TweetMediaError as exc:
         raise HTTPException(
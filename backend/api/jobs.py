@@ -0,0 +1,102 @@
+"""Asynchronous parse job routes."""
+
+from __future__ import annotations
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException
+
+from api.dependencies import (
+    ensure_key_accepted,
+    get_job_runner,
+    get_llamacloud_client,
+    require_llamacloud_key_format,
+)
+from models import ErrorResponse, JobResponse, ParseTweetRequest, ParseTweetResponse
+from services.deadline import EXTRACTION_DEADLINE_SHARE, deadline_scope, request_deadline, run_within_deadline
+from services.http_clients import HttpClientRegistry
+from services.jobs import JobHandler, JobRecord, JobRunner
+from services.llamacloud_parser import ParseSettings
+from services.parse_pipeline import build_parse_response, parse_images, request_concurrency
+from services.tweet_media import extract_tweet_images
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    response_model=JobResponse,
+    responses={400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def create_job(
+    request: ParseTweetRequest,
+    runner: JobRunner = Depends(get_job_runner),
+    llamacloud_client: httpx.AsyncClient | None = Depends(get_llamacloud_client),
+) -> JobResponse:
+    """Enqueue a parse-tweet job and return its id immediately."""
+    require_llamacloud_key_format(request.api_key)
+    await ensure_key_accepted(request.api_key, llamacloud_client)
+    record = await runner.submit(request)
+    return _job_response(record)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    responses={404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def get_job(job_id: str, runner: JobRunner = Depends(get_job_runner)) -> JobResponse:
+    """Report job status, with the parse result or error once finished."""
+    record = await runner.get(job_id)
+    if record is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error_code": "JOB_NOT_FOUND", "message": f"No job with id {job_id}."},
+        )
+    return _job_response(record)
+
+
+def build_parse_job_handler(clients: HttpClientRegistry | None) -> JobHandler:
+    """Create the job body: the same extraction and parsing as /parse-tweet.
+
+    A job's deadline_seconds counts from when the job starts running.
+    """
+
+    async def handle(request: ParseTweetRequest) -> ParseTweetResponse:
+        deadline = request_deadline(request.deadline_seconds)
+        with deadline_scope(deadline):
+            extracted = await run_within_deadline(
+                extract_tweet_images(
+                    tweet_url=request.tweet_url,
+                    x_bearer_token=request.x_bearer_token,
+                    client=clients.extraction if clients else None,
+                ),
+                "Tweet media extraction",
+                EXTRACTION_DEADLINE_SHARE,
+            )
+            settings = ParseSettings(
+                tier=request.tier,
+                enable_chart_parsing=request.enable_chart_parsing,
+            )
+            results = await parse_images(
+                image_urls=extracted.image_urls,
+                api_key=request.api_key,
+                settings=settings,
+                max_concurrency=request_concurrency(request),
+                client=clients.media if clients else None,
+                deadline=deadline,
+            )
+        return build_parse_response(extracted, results)
+
+    return handle
+
+
+def _job_response(record: JobRecord) -> JobResponse:
+    return JobResponse(
+        job_id=record.id,
+        status=record.status,
+        created_at=record.created_at,
+        updated_at=record.updated_at,
+        result=record.result,
+        error=record.error,
+    )
@@ -2,36 +2,387 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import os
+from collections.abc import AsyncIterator, Awaitable
+from typing import Literal, TypeVar
 
-from models import ErrorResponse, ParseTweetRequest, ParseTweetResponse
-from services.llamacloud_parser import ParseSettings, build_combined_markdown, parse_image_from_url
-from services.tweet_media import TweetMediaError, extract_tweet_images
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from api.dependencies import (
+    ensure_key_accepted,
+    get_extraction_client,
+    get_llamacloud_client,
+    get_media_client,
+    require_llamacloud_key_format,
+)
+from models import (
+    ErrorResponse,
+    ExtractTweetImagesResponse,
+    MediaExtractionErrorCode,
+    ParseCompleteEvent,
+    ParsedImageEvent,
+    ParsedImageResult,
+    ParseTweetRequest,
+    ParseTweetResponse,
+    ParseTweetsRequest,
+    ParseTweetsResponse,
+    ResponseInclude,
+    TableFormat,
+)
+from services.deadline import (
+    EXTRACTION_DEADLINE_SHARE,
+    Deadline,
+    DeadlineExceededError,
+    deadline_scope,
+    request_deadline,
+    run_within_deadline,
+)
+from services.llamacloud_parser import ParseSettings
+from services.parse_pipeline import (
+    build_parse_response,
+    parse_images,
+    parse_one,
+    request_concurrency,
+    timed_out_result,
+)
+from services.table_formats import arrow_available, format_results
+from services.timing import current_request_timings
+from services.tweet_media import ExtractedTweetMedia, TweetMediaError, extract_tweet_images
+from services.tweet_urls import InvalidTweetUrlError, parse_tweet_url
+
+T = TypeVar("T")
 
 router = APIRouter(tags=["parse"])
 
+# Batch-wide ceilings for /parse-tweets, shared by every tweet in the batch.
+BATCH_EXTRACTION_CONCURRENCY = max(1, int(os.environ.get("BATCH_EXTRACTION_CONCURRENCY", "8")))
+BATCH_PARSE_CONCURRENCY = max(1, int(os.environ.get("BATCH_PARSE_CONCURRENCY", "8")))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
 
 @router.post(
     "/parse-tweet",
     response_model=ParseTweetResponse,
-    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+    responses={
+        400: {"model": ErrorResponse},
+        401: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    },
+)
+async def parse_tweet(
+    request: ParseTweetRequest,
+    http_request: Request,
+    table_format: TableFormat = Query(default=TableFormat.markdown, alias="format"),
+    include: ResponseInclude = Query(default=ResponseInclude.all),
+    deadline_header: float | None = Header(default=None, alias="X-Deadline-Seconds", gt=0),
+    extraction_client: httpx.AsyncClient | None = Depends(get_extraction_client),
+    media_client: httpx.AsyncClient | None = Depends(get_media_client),
+    llamacloud_client: httpx.AsyncClient | None = Depends(get_llamacloud_client),
+) -> ParseTweetResponse:
+    """Extract tweet images and parse each with LlamaCloud.
+
+    Tables are returned in the representation selected with `format`. `include` trims the
+    response: `combined_only` keeps only each image's status next to the combined markdown,
+    `results_only` leaves combined_markdown empty and `no_tables` drops tables everywhere.
+
+    A deadline from `deadline_seconds` or the X-Deadline-Seconds header bounds the whole
+    request: images still parsing when it passes are returned as timed-out results.
+    Work stops when the client disconnects.
+    """
+    require_llamacloud_key_format(request.api_key)
+    _require_table_format_support(table_format)
+    deadline = request_deadline(request.deadline_seconds, deadline_header)
+
+    async def run() -> ParseTweetResponse:
+        with deadline_scope(deadline):
+            extracted = await _extract_with_key_check(request, extraction_client, llamacloud_client)
+            settings = ParseSettings(
+                tier=request.tier,
+                enable_chart_parsing=request.enable_chart_parsing,
+            )
+            results = await parse_images(
+                image_urls=extracted.image_urls,
+                api_key=request.api_key,
+                settings=settings,
+                max_concurrency=request_concurrency(request),
+                client=media_client,
+                deadline=deadline,
+            )
+        response = build_parse_response(extracted, results, table_format, include)
+        timings = current_request_timings()
+        if request.include_timings and timings is not None:
+            response.timings = timings.to_model(extracted.image_urls)
+        return response
+
+    return await _cancel_on_disconnect(http_request, run())
+
+
+@router.post(
+    "/parse-tweet/stream",
+    responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}, SSE_MEDIA_TYPE: {}}},
+        400: {"model": ErrorResponse},
+        401: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    },
+)
+async def parse_tweet_stream(
+    request: ParseTweetRequest,
+    http_request: Request,
+    stream_format: Literal["ndjson", "sse"] = Query(default="ndjson"),
+    deadline_header: float | None = Header(default=None, alias="X-Deadline-Seconds", gt=0),
+    extraction_client: httpx.AsyncClient | None = Depends(get_extraction_client),
+    media_client: httpx.AsyncClient | None = Depends(get_media_client),
+    llamacloud_client: httpx.AsyncClient | None = Depends(get_llamacloud_client),
+) -> StreamingResponse:
+    """Stream parse progress: an extracted event, one image event per parsed image, then complete.
+
+    Events are sent as NDJSON lines, or as server-sent events with `stream_format=sse`.
+    Tables are always rendered as markdown.
+    Extraction errors are returned as regular error responses before streaming starts.
+    Images still parsing at the request deadline are streamed as timed-out results.
+    """
+    require_llamacloud_key_format(request.api_key)
+    deadline = request_deadline(request.deadline_seconds, deadline_header)
+    with deadline_scope(deadline):
+        extracted = await _cancel_on_disconnect(
+            http_request,
+            _extract_with_key_check(request, extraction_client, llamacloud_client),
+        )
+
+    settings = ParseSettings(
+        tier=request.tier,
+        enable_chart_parsing=request.enable_chart_parsing,
+    )
+    events = _stream_parse_events(
+        extracted=extracted,
+        api_key=request.api_key,
+        settings=settings,
+        max_concurrency=request_concurrency(request),
+        client=media_client,
+        stream_format=stream_format,
+        deadline=deadline,
+    )
+    return StreamingResponse(
+        events,
+        media_type=SSE_MEDIA_TYPE if stream_format == "sse" else NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/parse-tweets",
+    response_model=ParseTweetsResponse,
+    responses={400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
 )
-async def parse_tweet(request: ParseTweetRequest) -> ParseTweetResponse:
-    """Extract tweet images and parse each with LlamaCloud."""
-    if not request.api_key.startswith("llx-"):
+async def parse_tweets(
+    request: ParseTweetsRequest,
+    extraction_client: httpx.AsyncClient | None = Depends(get_extraction_client),
+    media_client: httpx.AsyncClient | None = Depends(get_media_client),
+    llamacloud_client: httpx.AsyncClient | None = Depends(get_llamacloud_client),
+) -> ParseTweetsResponse:
+    """Extract and parse many tweets with shared settings and global concurrency limits.
+
+    Tweets are keyed by tweet_id (or by the submitted URL when it is not a tweet URL), and
+    image URLs shared between tweets are parsed once.
+    """
+    require_llamacloud_key_format(request.api_key)
+    await ensure_key_accepted(request.api_key, llamacloud_client)
+
+    settings = ParseSettings(
+        tier=request.tier,
+        enable_chart_parsing=request.enable_chart_parsing,
+    )
+    extraction_semaphore = asyncio.Semaphore(BATCH_EXTRACTION_CONCURRENCY)
+    parse_semaphore = asyncio.Semaphore(BATCH_PARSE_CONCURRENCY)
+    image_tasks: dict[str, asyncio.Task[ParsedImageResult]] = {}
+
+    def parse_shared(image_url: str) -> asyncio.Task[ParsedImageResult]:
+        if image_url not in image_tasks:
+            image_tasks[image_url] = asyncio.create_task(
+                parse_one(image_url, request.api_key, settings, parse_semaphore, media_client)
+            )
+        return image_tasks[image_url]
+
+    async def run_tweet(tweet_url: str) -> ParseTweetResponse:
+        async with extraction_semaphore:
+            extracted = await extract_tweet_images(
+                tweet_url=tweet_url,
+                x_bearer_token=request.x_bearer_token,
+                client=extraction_client,
+            )
+        results = await asyncio.gather(*(parse_shared(image_url) for image_url in extracted.image_urls))
+        return build_parse_response(extracted, list(results))
+
+    response = ParseTweetsResponse()
+    tweet_urls: dict[str, str] = {}
+    for tweet_url in request.tweet_urls:
+        try:
+            tweet_urls.setdefault(parse_tweet_url(tweet_url).tweet_id, tweet_url)
+        except InvalidTweetUrlError as exc:
+            response.errors[tweet_url] = ErrorResponse(
+                error_code=MediaExtractionErrorCode.invalid_tweet_url.value,
+                message=str(exc),
+            )
+
+    try:
+        outcomes = await asyncio.gather(
+            *(run_tweet(tweet_url) for tweet_url in tweet_urls.values()),
+            return_exceptions=True,
+        )
+    finally:
+        for task in image_tasks.values():
+            task.cancel()
+
+    for key, outcome in zip(tweet_urls, outcomes):
+        if isinstance(outcome, TweetMediaError):
+            response.errors[key] = ErrorResponse(
+                error_code=outcome.code.value,
+                message=outcome.message,
+                details=outcome.details or None,
+            )
+        elif isinstance(outcome, BaseException):
+            response.errors[key] = ErrorResponse(error_code="INTERNAL_ERROR", message=str(outcome))
+        else:
+            response.results[key] = outcome
+    return response
+
+
+async def _stream_parse_events(
+    extracted: ExtractedTweetMedia,
+    api_key: str,
+    settings: ParseSettings,
+    max_concurrency: int,
+    client: httpx.AsyncClient | None,
+    stream_format: str,
+    deadline: Deadline | None = None,
+) -> AsyncIterator[str]:
+    """Yield encoded parse events as each image finishes, cancelling work if the client goes away."""
+    yield _encode_event(
+        "extracted",
+        ExtractTweetImagesResponse(
+            tweet_id=extracted.tweet_id,
+            normalized_tweet_url=extracted.normalized_tweet_url,
+            image_urls=extracted.image_urls,
+            source=extracted.source,
+            warnings=extracted.warnings,
+        ),
+        stream_format,
+    )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def parse_indexed(index: int, image_url: str) -> tuple[int, ParsedImageResult]:
+        return index, await parse_one(image_url, api_key, settings, semaphore, client)
+
+    tasks = [
+        asyncio.create_task(parse_indexed(index, image_url))
+        for index, image_url in enumerate(extracted.image_urls)
+    ]
+    results: list[ParsedImageResult | None] = [None] * len(tasks)
+    try:
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=deadline.remaining() if deadline else None):
+                index, parsed = await next_done
+                results[index] = format_results([parsed], TableFormat.markdown)[0]
+                yield _encode_event("image", ParsedImageEvent(index=index, result=results[index]), stream_format)
+        except asyncio.TimeoutError:
+            for index, image_url in enumerate(extracted.image_urls):
+                if results[index] is None:
+                    results[index] = timed_out_result(image_url)
+                    yield _encode_event("image", ParsedImageEvent(index=index, result=results[index]), stream_format)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    response = build_parse_response(extracted, [result for result in results if result is not None])
+    yield _encode_event(
+        "complete",
+        ParseCompleteEvent(combined_markdown=response.combined_markdown, warnings=response.warnings),
+        stream_format,
+    )
+
+
+def _encode_event(event: str, payload: BaseModel, stream_format: str) -> str:
+    """Encode one stream event as an NDJSON line or an SSE message."""
+    data = payload.model_dump_json()
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {data}\n\n"
+    return f'{{"event":"{event}","data":{data}}}\n'
+
+
+async def _extract_with_key_check(
+    request: ParseTweetRequest,
+    extraction_client: httpx.AsyncClient | None,
+    llamacloud_client: httpx.AsyncClient | None,
+) -> ExtractedTweetMedia:
+    """Extract tweet media while confirming, in parallel, that LlamaCloud accepts the key."""
+    key_check = asyncio.create_task(ensure_key_accepted(request.api_key, llamacloud_client))
+    try:
+        extracted = await _extract_or_raise(request.tweet_url, request.x_bearer_token, extraction_client)
+    except BaseException:
+        key_check.cancel()
+        raise
+    await key_check
+    return extracted
+
+
+async def _cancel_on_disconnect(http_request: Request, work: Awaitable[T]) -> T:
+    """Await work, cancelling it when the client disconnects first."""
+    task = asyncio.ensure_future(work)
+    disconnect = asyncio.create_task(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({task, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if task.cancelled():
         raise HTTPException(
-            status_code=400,
-            detail={
-                "error_code": "INVALID_API_KEY",
-                "message": "LlamaCloud API key must start with llx-",
-            },
+            status_code=499,
+            detail={"error_code": "CLIENT_CLOSED_REQUEST", "message": "Client disconnected before completion."},
         )
+    return task.result()
 
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    """Return once the client disconnects; the request body has already been read."""
+    while (await http_request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _extract_or_raise(
+    tweet_url: str,
+    x_bearer_token: str | None,
+    client: httpx.AsyncClient | None,
+) -> ExtractedTweetMedia:
+    """Extract tweet media within its share of the request deadline, mapping domain errors to HTTP errors."""
     try:
-        extracted = await extract_tweet_images(
-            tweet_url=request.tweet_url,
-            x_bearer_token=request.x_bearer_token,
+        return await run_within_deadline(
+            extract_tweet_images(
+                tweet_url=tweet_url,
+                x_bearer_token=x_bearer_token,
+                client=client,
+            ),
+            "Tweet media extraction",
+            EXTRACTION_DEADLINE_SHARE,
         )
+    except DeadlineExceededError as exc:
+        raise HTTPException(
+            status_code=504,
+            detail={"error_code": "DEADLINE_EXCEEDED", "message": str(exc)},
+        ) from exc
     except TweetMediaError as exc:
         raise HTTPException(
             status_code=exc.status_code,
@@ -42,31 +393,14 @@ async def parse_tweet(request: ParseTweetRequest) -> ParseTweetResponse:
             },
         ) from exc
 
-    settings = ParseSettings(
-        tier=request.tier,
-        enable_chart_parsing=request.enable_chart_parsing,
-    )
 
-    results = []
-    for image_url in extracted.image_urls:
-        parsed = await parse_image_from_url(
-            image_url=image_url,
-            api_key=request.api_key,
-            settings=settings,
+def _require_table_format_support(table_format: TableFormat) -> None:
+    """Reject table formats whose optional dependency is not installed."""
+    if table_format is TableFormat.arrow and not arrow_available():
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error_code": "UNSUPPORTED_FORMAT",
+                "message": "Arrow table output requires pyarrow on the server.",
+            },
         )
-        results.append(parsed)
-
-    combined_markdown = build_combined_markdown(results)
-    warnings = list(extracted.warnings)
-    failed = [result.filename for result in results if not result.success]
-    if failed:
-        warnings.append(f"Failed to parse {len(failed)} image(s): {', '.join(failed)}")
-
-    return ParseTweetResponse(
-        tweet_id=extracted.tweet_id,
-        normalized_tweet_url=extracted.normalized_tweet_url,
-        source=extracted.source,
-        results=results,
-        combined_markdown=combined_markdown,
-        warnings=warnings,
-    )
@@ -0,0 +1,16 @@
+"""Upstream health introspection routes."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from models import UpstreamsResponse
+from services.upstreams import upstreams_snapshot
+
+router = APIRouter(tags=["upstreams"])
+
+
+@router.get("/upstreams", response_model=UpstreamsResponse)
+async def get_upstreams() -> UpstreamsResponse:
+    """Report circuit breaker, rate limiter and retry budget state per upstream."""
+    return upstreams_snapshot()
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
+from api.dependencies import get_llamacloud_client
 from models import ValidateLlamaKeyRequest, ValidateLlamaKeyResponse
+from services.llamacloud_keys import check_llama_key
 
 router = APIRouter(tags=["validation"])
 
 
 @router.post("/validate-llama-key", response_model=ValidateLlamaKeyResponse)
-async def validate_llama_key(request: ValidateLlamaKeyRequest) -> ValidateLlamaKeyResponse:
+async def validate_llama_key(
+    request: ValidateLlamaKeyRequest,
+    client: httpx.AsyncClient | None = Depends(get_llamacloud_client),
+) -> ValidateLlamaKeyResponse:
     """Validate LlamaCloud API key by probing projects endpoint."""
     api_key = request.api_key.strip()
     if not api_key.startswith("llx-"):
@@ -21,19 +26,15 @@ async def validate_llama_key(request: ValidateLlamaKeyRequest) -> ValidateLlamaK
         )
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                "https://api.cloud.llamaindex.ai/api/v1/projects",
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
+        validation = await check_llama_key(api_key, client)
     except httpx.RequestError as exc:
         raise HTTPException(status_code=502, detail=f"Failed to reach LlamaCloud: {exc}") from exc
 
-    if response.status_code == 401:
+    if validation.status_code == 401:
         raise HTTPException(status_code=401, detail="Invalid LlamaCloud API key.")
-    if response.status_code == 403:
+    if validation.status_code == 403:
         raise HTTPException(status_code=403, detail="API key lacks LlamaCloud permissions.")
-    if response.status_code >= 400:
-        raise HTTPException(status_code=response.status_code, detail="LlamaCloud validation failed.")
+    if validation.status_code >= 400:
+        raise HTTPException(status_code=validation.status_code, detail="LlamaCloud validation failed.")
 
     return ValidateLlamaKeyResponse(valid=True, message="API key is valid")
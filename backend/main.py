@@ -6,26 +6,71 @@ import json
 import logging
 import os
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.datastructures import Default
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from api.extract import router as extract_router
+from api.jobs import build_parse_job_handler
+from api.jobs import router as jobs_router
+from api.metrics import router as metrics_router
 from api.parse import router as parse_router
+from api.upstreams import router as upstreams_router
 from api.validate import router as validate_router
-
-logging.basicConfig(level=logging.INFO)
+from services import fast_json
+from services.compression import CompressionMiddleware
+from services.fast_json import FastJSONResponse
+from services.http_clients import build_http_clients
+from services.jobs import JobRunner, JobStore
+from services.llamacloud_clients import llamacloud_client_pool
+from services.log_format import configure_logging
+from services.timing import start_request_timings
+
+configure_logging(os.environ.get("LOG_FORMAT", "json"))
 logger = logging.getLogger("twitter_chart_parser")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create shared upstream resources once and release them on shutdown."""
+    app.state.http_clients = build_http_clients()
+    # Queued jobs hold API keys, so the job store is only created at an explicitly chosen path.
+    jobs_db_path = os.environ.get("JOBS_DB_PATH")
+    job_runner = None
+    if jobs_db_path:
+        job_runner = JobRunner(
+            store=JobStore(jobs_db_path),
+            handler=build_parse_job_handler(app.state.http_clients),
+            workers=int(os.environ.get("JOB_WORKERS", "2")),
+            retention_seconds=float(os.environ.get("JOB_RETENTION_SECONDS", "86400")),
+        )
+        await job_runner.start()
+        app.state.job_runner = job_runner
+    try:
+        yield
+    finally:
+        if job_runner is not None:
+            await job_runner.stop()
+            del app.state.job_runner
+        await app.state.http_clients.aclose()
+        del app.state.http_clients
+        await llamacloud_client_pool.aclose()
+
+
 app = FastAPI(
     title="Twitter Chart Parser API",
     version="1.0.0",
     description="Extract tweet images and parse chart/table content into markdown.",
+    lifespan=lifespan,
+    # Without orjson, keep FastAPI's default so it can serialize response models with pydantic-core directly.
+    default_response_class=FastJSONResponse if fast_json.available() else Default(JSONResponse),
 )
 
 
@@ -45,27 +90,37 @@ def _build_error_payload(
     return payload
 
 
+# Routes whose per-stage timings are reported in a Server-Timing header.
+SERVER_TIMING_PATHS = {"/parse-tweet", "/extract-tweet-images"}
+
+
 @app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
     """Log request context and latency for every request."""
     start = time.perf_counter()
+    timings = start_request_timings()
     response = await call_next(request)
     duration_ms = (time.perf_counter() - start) * 1000
-    logger.info(
-        "request",
-        extra={
-            "method": request.method,
-            "path": request.url.path,
-            "status": response.status_code,
-            "duration_ms": round(duration_ms, 2),
-        },
-    )
+    log_fields: dict[str, Any] = {
+        "method": request.method,
+        "path": request.url.path,
+        "status": response.status_code,
+        "duration_ms": round(duration_ms, 2),
+    }
+    if timings.stages or timings.images:
+        log_fields["stage_ms"] = {stage: round(value, 1) for stage, value in timings.stages.items()}
+        log_fields["image_stage_ms"] = [
+            {stage: round(value, 1) for stage, value in stages.items()} for stages in timings.images.values()
+        ]
+    logger.info("request", extra=log_fields)
     response.headers["X-Process-Time-Ms"] = f"{duration_ms:.2f}"
+    if request.url.path in SERVER_TIMING_PATHS:
+        response.headers["Server-Timing"] = timings.server_timing()
     return response
 
 
 @app.exception_handler(HTTPException)
-async def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(_: Request, exc: HTTPException) -> FastJSONResponse:
     """Return HTTP errors in consistent format."""
     detail = exc.detail
     if isinstance(detail, dict) and "error_code" in detail and "message" in detail:
@@ -75,13 +130,13 @@ async def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse
     else:
         payload = _build_error_payload(error_code="HTTP_ERROR", message="Request failed", details={"detail": detail})
 
-    return JSONResponse(status_code=exc.status_code, content=payload)
+    return FastJSONResponse(status_code=exc.status_code, content=payload)
 
 
 @app.exception_handler(RequestValidationError)
-async def validation_exception_handler(_: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(_: Request, exc: RequestValidationError) -> FastJSONResponse:
     """Return input validation errors in consistent format."""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=422,
         content=_build_error_payload(
             error_code="VALIDATION_ERROR",
@@ -92,10 +147,10 @@ async def validation_exception_handler(_: Request, exc: RequestValidationError)
 
 
 @app.exception_handler(Exception)
-async def unhandled_exception_handler(_: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(_: Request, exc: Exception) -> FastJSONResponse:
     """Return fallback error envelope for uncaught errors."""
     logger.exception("unhandled_error", extra={"error": str(exc)})
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content=_build_error_payload(error_code="INTERNAL_ERROR", message="Unexpected server error"),
     )
@@ -117,9 +172,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses of at least this many bytes with brotli (when installed) or gzip.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+    gzip_level=int(os.environ.get("COMPRESSION_GZIP_LEVEL", "4")),
+    brotli_quality=int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4")),
+)
+
 app.include_router(validate_router)
 app.include_router(extract_router)
 app.include_router(parse_router)
+app.include_router(jobs_router)
+app.include_router(upstreams_router)
+app.include_router(metrics_router)
 
 
 @app.get("/health")
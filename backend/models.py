@@ -5,16 +5,17 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, SerializerFunctionWrapHandler, model_serializer
 
 
 class ParseTier(str, Enum):
-    """Supported LlamaParse tiers."""
+    """Supported LlamaParse tiers, plus `auto`, which escalates through cheaper tiers first."""
 
     fast = "fast"
     cost_effective = "cost_effective"
     agentic = "agentic"
     agentic_plus = "agentic_plus"
+    auto = "auto"
 
 
 class MediaExtractionSource(str, Enum):
@@ -36,6 +37,33 @@ class MediaExtractionErrorCode(str, Enum):
     upstream_error = "UPSTREAM_ERROR"
 
 
+class TableFormat(str, Enum):
+    """Representations a parsed table can be returned in."""
+
+    markdown = "markdown"
+    csv = "csv"
+    json = "json"
+    arrow = "arrow"
+
+
+class ResponseInclude(str, Enum):
+    """Parts of a parse response to return; the rest are left empty."""
+
+    all = "all"
+    combined_only = "combined_only"
+    results_only = "results_only"
+    no_tables = "no_tables"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a background parse job."""
+
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
 class ValidateLlamaKeyRequest(BaseModel):
     """Request payload for LlamaCloud API key validation."""
 
@@ -66,15 +94,39 @@ class ExtractTweetImagesResponse(BaseModel):
     warnings: list[str] = Field(default_factory=list)
 
 
+# TableResult fields holding one rendering of the table; unset ones are omitted when serialized.
+TABLE_REPRESENTATION_FIELDS = ("columns", "markdown", "csv", "arrow")
+
+
 class TableResult(BaseModel):
-    """Table extracted from parsed image page items."""
+    """Table extracted from parsed image page items.
+
+    Tables are stored as columns, each its header cell followed by its body cells. Responses
+    carry only the representation selected with `format` (markdown by default); the others
+    are left out rather than sent as nulls.
+    """
 
     page_number: int
     row_count: int
     column_count: int
-    markdown: str
+    columns: list[list[str]] | None = Field(
+        default=None,
+        description="Columns, each its header cell followed by its body cells; sent for format=json.",
+    )
+    markdown: str | None = None
+    csv: str | None = None
+    arrow: str | None = Field(default=None, description="Base64-encoded Arrow IPC stream.")
     bbox: list[float] | None = None
 
+    # Unannotated return: an annotation would replace the model's schema in the OpenAPI document.
+    @model_serializer(mode="wrap")
+    def _omit_unselected_formats(self, handler: SerializerFunctionWrapHandler):  # noqa: ANN202
+        data = handler(self)
+        for name in TABLE_REPRESENTATION_FIELDS:
+            if data.get(name) is None:
+                data.pop(name, None)
+        return data
+
 
 class ParsedImageResult(BaseModel):
     """Per-image parsing output."""
@@ -85,6 +137,12 @@ class ParsedImageResult(BaseModel):
     markdown: str = ""
     tables: list[TableResult] = Field(default_factory=list)
     error: str | None = None
+    from_cache: bool = False
+    timed_out: bool = False
+    tier: ParseTier | None = None
+    escalation_reasons: list[str] = Field(default_factory=list)
+    reused_from: str | None = None
+    perceptual_distance: int | None = None
 
 
 class ParseTweetRequest(BaseModel):
@@ -95,6 +153,26 @@ class ParseTweetRequest(BaseModel):
     tier: ParseTier = ParseTier.agentic
     enable_chart_parsing: bool = True
     x_bearer_token: str | None = None
+    max_concurrency: int | None = Field(default=None, ge=1)
+    include_timings: bool = False
+    deadline_seconds: float | None = Field(default=None, gt=0)
+
+
+class ImageTimings(BaseModel):
+    """Time spent on each stage for one image, in milliseconds."""
+
+    image_url: str
+    download_ms: float | None = None
+    upload_ms: float | None = None
+    parse_ms: float | None = None
+
+
+class ParseTimings(BaseModel):
+    """Where a parse request spent its time, in milliseconds."""
+
+    extraction_ms: float | None = None
+    images: list[ImageTimings] = Field(default_factory=list)
+    total_ms: float
 
 
 class ParseTweetResponse(BaseModel):
@@ -106,6 +184,21 @@ class ParseTweetResponse(BaseModel):
     results: list[ParsedImageResult]
     combined_markdown: str
     warnings: list[str] = Field(default_factory=list)
+    timings: ParseTimings | None = None
+
+
+class ParsedImageEvent(BaseModel):
+    """Streamed event carrying one parsed image and its position in the tweet."""
+
+    index: int
+    result: ParsedImageResult
+
+
+class ParseCompleteEvent(BaseModel):
+    """Final streamed event with the merged document."""
+
+    combined_markdown: str
+    warnings: list[str] = Field(default_factory=list)
 
 
 class ErrorResponse(BaseModel):
@@ -114,3 +207,54 @@ class ErrorResponse(BaseModel):
     error_code: str
     message: str
     details: dict[str, Any] | None = None
+
+
+class ParseTweetsRequest(BaseModel):
+    """Request payload for parsing many tweets with shared settings."""
+
+    api_key: str = Field(min_length=1)
+    tweet_urls: list[str] = Field(min_length=1, max_length=500)
+    tier: ParseTier = ParseTier.agentic
+    enable_chart_parsing: bool = True
+    x_bearer_token: str | None = None
+
+
+class ParseTweetsResponse(BaseModel):
+    """Batch parse results and per-item errors, keyed by tweet_id."""
+
+    results: dict[str, ParseTweetResponse] = Field(default_factory=dict)
+    errors: dict[str, ErrorResponse] = Field(default_factory=dict)
+
+
+class JobResponse(BaseModel):
+    """State of a background parse job."""
+
+    job_id: str
+    status: JobStatus
+    created_at: float
+    updated_at: float
+    result: ParseTweetResponse | None = None
+    error: ErrorResponse | None = None
+
+
+class UpstreamStatus(BaseModel):
+    """Rate limiter and circuit breaker state for one upstream host."""
+
+    circuit_state: str
+    consecutive_failures: int
+    retry_in_seconds: float
+    available_tokens: float
+
+
+class RetryBudgetStatus(BaseModel):
+    """Process-wide retry budget state."""
+
+    balance: float
+    retries_denied: int
+
+
+class UpstreamsResponse(BaseModel):
+    """Introspection payload for upstream guards."""
+
+    upstreams: dict[str, UpstreamStatus]
+    retry_budget: RetryBudgetStatus
@@ -0,0 +1,156 @@
+"""Small in-process and on-disk caches used by backend services."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Bounded in-memory mapping that evicts the least recently used entry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Return cached value and mark it as recently used."""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def set(self, key: K, value: V) -> None:
+        """Store value, evicting the oldest entries beyond capacity."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Remove and return value for key, if present."""
+        return self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-memory mapping whose entries expire after a per-entry TTL."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._entries: LRUCache[K, tuple[float, V]] = LRUCache(max_entries)
+
+    def get(self, key: K) -> V | None:
+        """Return unexpired value for key."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key)
+            return None
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: float) -> None:
+        """Store value for ttl_seconds; non-positive TTLs are not cached."""
+        if ttl_seconds <= 0:
+            return
+        self._entries.set(key, (time.monotonic() + ttl_seconds, value))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """Directory of zlib-compressed blobs bounded by total size on disk.
+
+    Methods perform blocking file I/O; async callers should run them in a thread.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(path.stat().st_size for path in self._entry_paths())
+
+    def get(self, key: str) -> bytes | None:
+        """Return decompressed blob for key, refreshing its recency."""
+        path = self._path_for(key)
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except (FileNotFoundError, zlib.error):
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def set(self, key: str, value: bytes) -> None:
+        """Compress and store blob, then evict oldest entries over budget."""
+        compressed = zlib.compress(value)
+        if len(compressed) > self.max_bytes:
+            return
+
+        path = self._path_for(key)
+        previous_size = path.stat().st_size if path.exists() else 0
+        # A unique temp file per writer keeps concurrent writers of one key from tearing it.
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(compressed)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self._total_bytes += len(compressed) - previous_size
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        """Delete every stored entry."""
+        for path in self._entry_paths():
+            path.unlink(missing_ok=True)
+        self._total_bytes = 0
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the size budget."""
+        entries = []
+        for path in self._entry_paths():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+
+    def _entry_paths(self) -> list[Path]:
+        return list(self.directory.glob("*.zz"))
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.zz"
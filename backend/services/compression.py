@@ -0,0 +1,183 @@
+"""Response compression: brotli when the client accepts it and brotli is installed, else gzip."""
+
+from __future__ import annotations
+
+import zlib
+from typing import Protocol
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # brotli is optional; without it clients get gzip.
+    import brotli
+except ImportError:  # pragma: no cover - environment-specific guard
+    brotli = None
+
+# Event streams must reach the client chunk by chunk, untouched.
+DEFAULT_EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings named in an Accept-Encoding header, minus those refused with q=0."""
+    encodings: set[str] = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        refused = False
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    refused = float(value) == 0
+                except ValueError:
+                    pass
+        if coding and not refused:
+            encodings.add(coding)
+    return encodings
+
+
+class _Encoder(Protocol):
+    content_encoding: str
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes: ...
+
+
+class _GzipEncoder:
+    content_encoding = "gzip"
+
+    def __init__(self, level: int) -> None:
+        # wbits=31 selects the gzip container rather than a raw zlib stream.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        flush_mode = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        return self._compressor.compress(body) + self._compressor.flush(flush_mode)
+
+
+class _BrotliEncoder:
+    content_encoding = "br"
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        if more_body:
+            return self._compressor.process(body) + self._compressor.flush()
+        return self._compressor.process(body) + self._compressor.finish()
+
+
+class _CompressingSend:
+    """send wrapper that encodes one response once its first body chunk shows it is worth it."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoder: _Encoder,
+        minimum_size: int,
+        thread_minimum_size: int,
+        exclude_content_types: tuple[str, ...],
+    ) -> None:
+        self.send = send
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+        self.exclude_content_types = exclude_content_types
+        self.start_message: Message | None = None
+        self.compressing = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk decides whether to compress.
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+            self.compressing = self._should_compress(headers, body, more_body)
+            if self.compressing:
+                body = await self._compress(body, more_body)
+                headers["Content-Encoding"] = self.encoder.content_encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    # The final length is unknown until the stream ends.
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                start_message = {**start_message, "headers": headers.raw}
+            await self.send(start_message)
+        elif self.compressing:
+            body = await self._compress(body, more_body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _should_compress(self, headers: Headers, body: bytes, more_body: bool) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if any(content_type.startswith(excluded) for excluded in self.exclude_content_types):
+            return False
+        return more_body or len(body) >= self.minimum_size
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            # Compressing large bodies inline would block the event loop.
+            return await anyio.to_thread.run_sync(lambda: self.encoder.compress(body, more_body=more_body))
+        return self.encoder.compress(body, more_body=more_body)
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            await self.send(start_message)
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses responses with brotli or gzip, whichever the client prefers.
+
+    Bodies smaller than minimum_size, responses already carrying a Content-Encoding, and
+    content types in exclude_content_types are sent uncompressed. Streamed bodies are
+    flushed per chunk, so NDJSON progress events are not held back.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 4,
+        brotli_quality: int = 4,
+        thread_minimum_size: int = 128 * 1024,
+        exclude_content_types: tuple[str, ...] = DEFAULT_EXCLUDED_CONTENT_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+        self.exclude_content_types = tuple(exclude_content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":  # pragma: no cover
+            await self.app(scope, receive, send)
+            return
+
+        encoder = self._encoder(accepted_encodings(Headers(scope=scope).get("Accept-Encoding", "")))
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+        compressing_send = _CompressingSend(
+            send, encoder, self.minimum_size, self.thread_minimum_size, self.exclude_content_types
+        )
+        await self.app(scope, receive, compressing_send)
+
+    def _encoder(self, encodings: set[str]) -> _Encoder | None:
+        if "br" in encodings and brotli is not None:
+            return _BrotliEncoder(self.brotli_quality)
+        if "gzip" in encodings:
+            return _GzipEncoder(self.gzip_level)
+        return None
@@ -0,0 +1,83 @@
+"""Request-wide deadlines shared by the extraction and parsing stages of one request."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Deadline for requests that do not send one; 0 leaves them unbounded.
+DEFAULT_REQUEST_DEADLINE_SECONDS = float(os.environ.get("DEFAULT_REQUEST_DEADLINE_SECONDS", "0"))
+# Share of the remaining budget tweet media extraction may use; parsing gets the rest.
+EXTRACTION_DEADLINE_SHARE = float(os.environ.get("EXTRACTION_DEADLINE_SHARE", "0.3"))
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a stage does not finish within its share of the request deadline."""
+
+
+class Deadline:
+    """Monotonic point in time by which a request's work must be finished."""
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def share(self, fraction: float) -> Deadline:
+        """Earlier deadline leaving the rest of the remaining budget to later stages."""
+        return Deadline(self.remaining() * min(1.0, max(0.0, fraction)))
+
+
+def request_deadline(*budgets: float | None) -> Deadline | None:
+    """Deadline for the tightest positive budget in seconds, else the configured default."""
+    chosen = [budget for budget in budgets if budget is not None and budget > 0]
+    if not chosen and DEFAULT_REQUEST_DEADLINE_SECONDS > 0:
+        chosen = [DEFAULT_REQUEST_DEADLINE_SECONDS]
+    return Deadline(min(chosen)) if chosen else None
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Make deadline current for work started inside the block, including tasks it creates."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+async def run_within_deadline(work: Awaitable[T], stage: str, share: float = 1.0) -> T:
+    """Await work within share of the current deadline's remaining budget.
+
+    The shorter stage deadline is current while work runs, so nested retries see it.
+    Without a current deadline work is awaited unbounded.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return await work
+    stage_deadline = deadline.share(share)
+    try:
+        with deadline_scope(stage_deadline):
+            return await asyncio.wait_for(work, timeout=stage_deadline.remaining())
+    except asyncio.TimeoutError as exc:
+        if not stage_deadline.expired():
+            raise
+        raise DeadlineExceededError(f"{stage} did not finish within the request deadline.") from exc
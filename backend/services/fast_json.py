@@ -0,0 +1,52 @@
+"""JSON encoding and decoding through orjson when installed, else the stdlib json module."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:  # orjson is optional; every function here falls back to the stdlib.
+    import orjson
+except ImportError:  # pragma: no cover - environment-specific guard
+    orjson = None
+
+
+def available() -> bool:
+    """Whether the orjson fast path is in use."""
+    return orjson is not None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON; raises ValueError on malformed input with either backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON bytes, accepting pydantic models."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_encode_model)
+    return json.dumps(
+        content,
+        default=_encode_model,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _encode_model(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,45 @@
+"""Pooled HTTP clients shared across requests for each upstream service."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass(frozen=True)
+class HttpClientRegistry:
+    """One long-lived, connection-pooled client per upstream service."""
+
+    extraction: httpx.AsyncClient
+    media: httpx.AsyncClient
+    llamacloud: httpx.AsyncClient
+
+    async def aclose(self) -> None:
+        """Close every pooled client."""
+        for client in (self.extraction, self.media, self.llamacloud):
+            await client.aclose()
+
+
+def build_http_clients() -> HttpClientRegistry:
+    """Create pooled clients using limits and timeouts from the environment."""
+    limits = httpx.Limits(
+        max_connections=int(os.environ.get("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.environ.get("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")),
+    )
+    return HttpClientRegistry(
+        extraction=httpx.AsyncClient(
+            timeout=float(os.environ.get("EXTRACTION_TIMEOUT_SECONDS", "20")),
+            limits=limits,
+        ),
+        media=httpx.AsyncClient(
+            timeout=float(os.environ.get("MEDIA_DOWNLOAD_TIMEOUT_SECONDS", "30")),
+            limits=limits,
+        ),
+        llamacloud=httpx.AsyncClient(
+            timeout=float(os.environ.get("LLAMACLOUD_VALIDATE_TIMEOUT_SECONDS", "10")),
+            limits=limits,
+        ),
+    )
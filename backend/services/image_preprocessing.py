@@ -0,0 +1,97 @@
+"""Shrink tweet images before upload: pick a pbs size variant and optionally recompress."""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+from urllib.parse import parse_qs, urlparse
+
+try:  # Pillow is optional; without it images are uploaded as downloaded.
+    from PIL import Image
+except ImportError:  # pragma: no cover - environment-specific guard
+    Image = None
+
+# pbs.twimg.com size variant to download: small, medium, large or orig; empty (the default)
+# keeps the URL as extracted.
+IMAGE_VARIANT_NAME = os.environ.get("IMAGE_VARIANT_NAME", "")
+# pbs.twimg.com format to request (jpg or png); empty keeps the image's own format.
+IMAGE_VARIANT_FORMAT = os.environ.get("IMAGE_VARIANT_FORMAT", "")
+# Downscale images with more pixels than this before upload; 0 disables. Requires Pillow.
+IMAGE_MAX_PIXELS = int(os.environ.get("IMAGE_MAX_PIXELS", "0"))
+# Recompress images larger than this many bytes before upload; 0 disables. Requires Pillow.
+IMAGE_MAX_UPLOAD_BYTES = int(os.environ.get("IMAGE_MAX_UPLOAD_BYTES", "0"))
+IMAGE_JPEG_QUALITY = int(os.environ.get("IMAGE_JPEG_QUALITY", "90"))
+
+_PBS_MEDIA_PATH_RE = re.compile(r"^/media/(?P<media_id>[A-Za-z0-9_\-]+)(?:\.(?P<ext>jpe?g|png|webp))?$")
+_VARIANT_NAMES = {"small", "medium", "large", "orig"}
+
+
+def media_variant_url(
+    image_url: str,
+    name: str | None = None,
+    image_format: str | None = None,
+) -> str:
+    """Rewrite a pbs.twimg.com media URL to the requested size variant and format.
+
+    Defaults come from IMAGE_VARIANT_NAME and IMAGE_VARIANT_FORMAT. Any other URL, or
+    an unknown variant name, is returned unchanged.
+    """
+    name = IMAGE_VARIANT_NAME if name is None else name
+    image_format = IMAGE_VARIANT_FORMAT if image_format is None else image_format
+    parsed = urlparse(image_url)
+    match = _PBS_MEDIA_PATH_RE.match(parsed.path)
+    if parsed.netloc != "pbs.twimg.com" or not match or name not in _VARIANT_NAMES:
+        return image_url
+
+    query_format = parse_qs(parsed.query).get("format", [""])[0]
+    resolved_format = image_format or query_format or match.group("ext") or "jpg"
+    if resolved_format == "jpeg":
+        resolved_format = "jpg"
+    return f"https://pbs.twimg.com/media/{match.group('media_id')}?format={resolved_format}&name={name}"
+
+
+def preprocessing_enabled() -> bool:
+    """Whether optimize_image_bytes can change anything in this environment."""
+    return Image is not None and (IMAGE_MAX_PIXELS > 0 or IMAGE_MAX_UPLOAD_BYTES > 0)
+
+
+def optimize_image_bytes(
+    image_bytes: bytes,
+    max_pixels: int | None = None,
+    max_bytes: int | None = None,
+) -> bytes:
+    """Downscale and recompress an image over the pixel or byte budget, keeping its format.
+
+    The pixel budget is a hard cap. Returns the original bytes when Pillow is missing,
+    the image is within budget, it is not a JPEG or PNG, or recompressing an image
+    within the pixel budget would not make it smaller. CPU-bound; call it through
+    asyncio.to_thread.
+    """
+    max_pixels = IMAGE_MAX_PIXELS if max_pixels is None else max_pixels
+    max_bytes = IMAGE_MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    if Image is None:
+        return image_bytes
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        image_format = image.format
+        pixels = image.width * image.height
+    except Exception:
+        return image_bytes
+
+    over_pixels = max_pixels > 0 and pixels > max_pixels
+    over_bytes = max_bytes > 0 and len(image_bytes) > max_bytes
+    if image_format not in {"JPEG", "PNG"} or not (over_pixels or over_bytes):
+        return image_bytes
+
+    if over_pixels:
+        scale = (max_pixels / pixels) ** 0.5
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.LANCZOS)
+
+    output = io.BytesIO()
+    if image_format == "JPEG":
+        image.convert("RGB").save(output, format="JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True)
+    else:
+        image.save(output, format="PNG", optimize=True)
+    optimized = output.getvalue()
+    return optimized if over_pixels or len(optimized) < len(image_bytes) else image_bytes
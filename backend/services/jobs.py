@@ -0,0 +1,238 @@
+"""Background parse jobs: SQLite-backed job store and in-process worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from models import ErrorResponse, JobStatus, ParseTweetRequest, ParseTweetResponse
+from services.deadline import DeadlineExceededError
+from services.tweet_media import TweetMediaError
+
+logger = logging.getLogger("twitter_chart_parser")
+
+JobHandler = Callable[[ParseTweetRequest], Awaitable[ParseTweetResponse]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    request_json TEXT,
+    result_json TEXT,
+    error_json TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+_FINISHED_INDEX = "CREATE INDEX IF NOT EXISTS jobs_status_updated_at ON jobs (status, updated_at)"
+
+# How often the runner deletes finished jobs past their retention, at most.
+_PURGE_INTERVAL_SECONDS = 3600.0
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """Persisted state of one parse job."""
+
+    id: str
+    status: JobStatus
+    request: ParseTweetRequest | None
+    result: ParseTweetResponse | None
+    error: ErrorResponse | None
+    created_at: float
+    updated_at: float
+
+
+class JobStore:
+    """SQLite persistence for parse jobs.
+
+    The request, including its API key, is stored so queued jobs can resume after a
+    restart; it is erased once the job finishes. The database file is therefore made
+    readable by its owner only; SQLite gives its WAL files the same mode. Methods are
+    blocking and are meant to be called through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(self.path, 0o600)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            connection.execute(_FINISHED_INDEX)
+
+    def create(self, request: ParseTweetRequest) -> JobRecord:
+        """Insert a queued job for request."""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, request_json, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.queued.value, request.model_dump_json(), now, now),
+            )
+        return JobRecord(job_id, JobStatus.queued, request, None, None, now, now)
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Load a job by id."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _record_from_row(row) if row else None
+
+    def unfinished_ids(self) -> list[str]:
+        """Ids of queued or interrupted jobs, oldest first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (JobStatus.queued.value, JobStatus.running.value),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def mark_running(self, job_id: str) -> None:
+        """Record that a worker picked up the job."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (JobStatus.running.value, time.time(), job_id),
+            )
+
+    def finish(
+        self,
+        job_id: str,
+        result: ParseTweetResponse | None = None,
+        error: ErrorResponse | None = None,
+    ) -> None:
+        """Store the outcome and drop the persisted request."""
+        status = JobStatus.failed if error else JobStatus.succeeded
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, request_json = NULL, result_json = ?, error_json = ?, updated_at = ? "
+                "WHERE id = ?",
+                (
+                    status.value,
+                    result.model_dump_json() if result else None,
+                    error.model_dump_json() if error else None,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def delete_finished_before(self, cutoff: float) -> int:
+        """Delete succeeded and failed jobs last updated before cutoff; returns how many went."""
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JobStatus.succeeded.value, JobStatus.failed.value, cutoff),
+            )
+        return cursor.rowcount
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+class JobRunner:
+    """Queue feeding a fixed pool of asyncio worker tasks.
+
+    Finished jobs are kept for retention_seconds and then deleted; 0 keeps them forever.
+    """
+
+    def __init__(self, store: JobStore, handler: JobHandler, workers: int, retention_seconds: float = 0) -> None:
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Start workers and re-enqueue jobs left unfinished by a previous process."""
+        self._queue = asyncio.Queue()
+        for job_id in await asyncio.to_thread(self.store.unfinished_ids):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self.retention_seconds > 0:
+            self._tasks.append(asyncio.create_task(self._purge_expired()))
+
+    async def stop(self) -> None:
+        """Cancel workers; in-progress jobs stay persisted and resume on next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, request: ParseTweetRequest) -> JobRecord:
+        """Persist and enqueue a parse job."""
+        if self._queue is None:
+            raise RuntimeError("JobRunner has not been started")
+        record = await asyncio.to_thread(self.store.create, request)
+        self._queue.put_nowait(record.id)
+        return record
+
+    async def get(self, job_id: str) -> JobRecord | None:
+        """Load current job state."""
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _purge_expired(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.store.delete_finished_before, time.time() - self.retention_seconds)
+            except sqlite3.Error:
+                logger.exception("job_purge_failed")
+            await asyncio.sleep(min(self.retention_seconds, _PURGE_INTERVAL_SECONDS))
+
+    async def _run(self, job_id: str) -> None:
+        record = await asyncio.to_thread(self.store.get, job_id)
+        if record is None or record.request is None:
+            return
+
+        await asyncio.to_thread(self.store.mark_running, job_id)
+        try:
+            result = await self.handler(record.request)
+        except TweetMediaError as exc:
+            error = ErrorResponse(error_code=exc.code.value, message=exc.message, details=exc.details or None)
+            await asyncio.to_thread(self.store.finish, job_id, None, error)
+        except DeadlineExceededError as exc:
+            error = ErrorResponse(error_code="DEADLINE_EXCEEDED", message=str(exc))
+            await asyncio.to_thread(self.store.finish, job_id, None, error)
+        except Exception as exc:
+            logger.exception("job_failed", extra={"job_id": job_id})
+            error = ErrorResponse(error_code="INTERNAL_ERROR", message=str(exc))
+            await asyncio.to_thread(self.store.finish, job_id, None, error)
+        else:
+            await asyncio.to_thread(self.store.finish, job_id, result, None)
+
+
+def _record_from_row(row: sqlite3.Row) -> JobRecord:
+    return JobRecord(
+        id=row["id"],
+        status=JobStatus(row["status"]),
+        request=ParseTweetRequest.model_validate_json(row["request_json"]) if row["request_json"] else None,
+        result=ParseTweetResponse.model_validate_json(row["result_json"]) if row["result_json"] else None,
+        error=ErrorResponse.model_validate_json(row["error_json"]) if row["error_json"] else None,
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
@@ -0,0 +1,108 @@
+"""Pool of AsyncLlamaCloud clients reused across requests with the same API key."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+
+class LlamaCloudClientError(Exception):
+    """Raised when a LlamaCloud client cannot be constructed."""
+
+
+@dataclass
+class _PooledClient:
+    """Client plus bookkeeping for eviction."""
+
+    client: Any
+    last_used: float
+    in_use: int = 0
+
+
+def create_llamacloud_client(api_key: str) -> Any:
+    """Construct an AsyncLlamaCloud client for api_key."""
+    try:
+        from llama_cloud import AsyncLlamaCloud  # type: ignore
+    except ImportError as exc:  # pragma: no cover - environment-specific guard
+        raise LlamaCloudClientError(
+            "Failed to import AsyncLlamaCloud from llama_cloud: "
+            f"{exc}. Python executable: {sys.executable}. "
+            "Install backend requirements in this same environment and restart the backend."
+        ) from exc
+
+    return AsyncLlamaCloud(api_key=api_key)
+
+
+class LlamaCloudClientPool:
+    """Bounded pool of AsyncLlamaCloud clients keyed by a hash of the API key.
+
+    Idle clients are closed once they exceed idle_seconds or the pool grows past
+    max_clients; clients currently lent out are never closed from under a caller.
+    """
+
+    def __init__(
+        self,
+        max_clients: int,
+        idle_seconds: float,
+        factory: Callable[[str], Any] = create_llamacloud_client,
+    ) -> None:
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self._factory = factory
+        self._clients: OrderedDict[str, _PooledClient] = OrderedDict()
+
+    @asynccontextmanager
+    async def client(self, api_key: str) -> AsyncIterator[Any]:
+        """Lend the pooled client for api_key, creating it on first use."""
+        key = hashlib.sha256(api_key.encode()).hexdigest()
+        entry = self._clients.get(key)
+        if entry is None:
+            entry = _PooledClient(client=self._factory(api_key), last_used=time.monotonic())
+            self._clients[key] = entry
+        self._clients.move_to_end(key)
+        entry.in_use += 1
+        try:
+            yield entry.client
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            await self._evict()
+
+    async def aclose(self) -> None:
+        """Close every pooled client."""
+        entries = list(self._clients.values())
+        self._clients.clear()
+        for entry in entries:
+            await entry.client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def _evict(self) -> None:
+        """Close idle clients that expired or overflow the pool, oldest first."""
+        now = time.monotonic()
+        excess = len(self._clients) - self.max_clients
+        evicted: list[_PooledClient] = []
+        for key, entry in list(self._clients.items()):
+            if entry.in_use:
+                continue
+            if excess > 0 or now - entry.last_used > self.idle_seconds:
+                del self._clients[key]
+                evicted.append(entry)
+                excess -= 1
+
+        for entry in evicted:
+            await entry.client.close()
+
+
+llamacloud_client_pool = LlamaCloudClientPool(
+    max_clients=int(os.environ.get("LLAMACLOUD_CLIENT_POOL_SIZE", "32")),
+    idle_seconds=float(os.environ.get("LLAMACLOUD_CLIENT_IDLE_SECONDS", "300")),
+)
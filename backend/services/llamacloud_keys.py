@@ -0,0 +1,76 @@
+"""LlamaCloud API key validation with a TTL cache of outcomes."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+
+import httpx
+
+from services.cache import TTLCache
+from services.metrics import record_cache_lookup
+from services.singleflight import SingleFlight
+
+LLAMACLOUD_PROJECTS_URL = "https://api.cloud.llamaindex.ai/api/v1/projects"
+
+KEY_VALIDATION_TTL_SECONDS = float(os.environ.get("KEY_VALIDATION_TTL_SECONDS", "600"))
+KEY_REJECTION_TTL_SECONDS = float(os.environ.get("KEY_REJECTION_TTL_SECONDS", "60"))
+
+
+@dataclass(frozen=True)
+class KeyValidation:
+    """Outcome of probing LlamaCloud with an API key."""
+
+    status_code: int
+
+    @property
+    def valid(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def rejected(self) -> bool:
+        """True when LlamaCloud refused the key itself, rather than failing."""
+        return self.status_code in {401, 403}
+
+
+# Outcomes keyed by SHA-256 of the API key; plaintext keys are never stored.
+key_validation_cache: TTLCache[str, KeyValidation] = TTLCache(
+    max_entries=int(os.environ.get("KEY_VALIDATION_CACHE_MAX_ENTRIES", "4096")),
+)
+_key_validation_flights: SingleFlight[KeyValidation] = SingleFlight()
+
+
+async def check_llama_key(api_key: str, client: httpx.AsyncClient | None = None) -> KeyValidation:
+    """Validate api_key against LlamaCloud, answering repeats from cache.
+
+    Raises httpx.RequestError when LlamaCloud cannot be reached; such failures and
+    non-auth error statuses are not cached.
+    """
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    cached = key_validation_cache.get(key_hash)
+    record_cache_lookup("key_validation", cached is not None)
+    if cached is not None:
+        return cached
+
+    validation = await _key_validation_flights.run(key_hash, lambda: _probe_llama_key(api_key, client))
+    if validation.valid:
+        key_validation_cache.set(key_hash, validation, KEY_VALIDATION_TTL_SECONDS)
+    elif validation.rejected:
+        key_validation_cache.set(key_hash, validation, KEY_REJECTION_TTL_SECONDS)
+    return validation
+
+
+async def _probe_llama_key(api_key: str, client: httpx.AsyncClient | None) -> KeyValidation:
+    """Call the projects endpoint with api_key."""
+    should_close = client is None
+    http_client = client or httpx.AsyncClient(timeout=10.0)
+    try:
+        response = await http_client.get(
+            LLAMACLOUD_PROJECTS_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+    finally:
+        if should_close:
+            await http_client.aclose()
+    return KeyValidation(status_code=response.status_code)
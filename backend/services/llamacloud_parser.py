@@ -2,17 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import mimetypes
 import os
-import sys
-import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 import httpx
 
 from models import ParsedImageResult, ParseTier, TableResult
+from services.cache import DiskCache, LRUCache
+from services.image_preprocessing import media_variant_url, optimize_image_bytes, preprocessing_enabled
+from services.llamacloud_clients import llamacloud_client_pool
+from services.metrics import (
+    IMAGE_DOWNLOAD_SECONDS,
+    LLAMACLOUD_PARSE_SECONDS,
+    LLAMACLOUD_UPLOAD_SECONDS,
+    PARSES_IN_FLIGHT,
+    TIER_ESCALATIONS,
+    record_cache_lookup,
+)
+from services.perceptual_hash import (
+    PERCEPTUAL_DEDUPE_MAX_DISTANCE,
+    image_hash,
+    perceptual_dedupe_enabled,
+    perceptual_index,
+)
+from services.singleflight import SingleFlight
+from services.table_formats import render_markdown, rows_to_columns
+from services.tier_cascade import TIER_CASCADE, quality_issue
+from services.timing import RequestTimings, collect_timings, merge_timings, timed_stage
 
 
 class LlamaCloudParseError(Exception):
@@ -27,27 +49,121 @@ class ParseSettings:
     enable_chart_parsing: bool = True
 
 
+# Bumped when cached ParsedImageResult payloads change shape, so stale disk entries are not read.
+RESULT_SCHEMA_VERSION = 4
+
+
+class ParseResultCache:
+    """Content-addressed cache of successful parse results.
+
+    Entries are keyed by the SHA-256 of the image bytes plus the parse settings, so
+    reposts of the same chart hit regardless of URL. An in-memory LRU tier sits in
+    front of an optional size-bounded on-disk tier of compressed JSON entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        disk_directory: str | None = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self._memory: LRUCache[str, ParsedImageResult] = LRUCache(max_entries)
+        self._disk = DiskCache(disk_directory, disk_max_bytes) if disk_directory else None
+
+    @staticmethod
+    def key_for(image_bytes: bytes, settings: ParseSettings) -> str:
+        """Build cache key from image content and parse settings."""
+        digest = hashlib.sha256(image_bytes)
+        digest.update(f"|{settings.tier.value}|{int(settings.enable_chart_parsing)}|v{RESULT_SCHEMA_VERSION}".encode())
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> ParsedImageResult | None:
+        """Look up a cached result in memory, then on disk."""
+        cached = self._memory.get(key)
+        if cached is not None or self._disk is None:
+            return cached
+
+        payload = await asyncio.to_thread(self._disk.get, key)
+        if payload is None:
+            return None
+        cached = ParsedImageResult.model_validate_json(payload)
+        self._memory.set(key, cached)
+        return cached
+
+    async def set(self, key: str, result: ParsedImageResult) -> None:
+        """Store a successful result in every tier."""
+        if not result.success:
+            return
+        self._memory.set(key, result)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, result.model_dump_json().encode())
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+
+# Downloads larger than this are rejected rather than buffered for upload.
+MAX_IMAGE_BYTES = int(os.environ.get("MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
+
+# In-flight parses keyed by (image_url, settings, SHA-256 of the API key), so a parse
+# only ever runs on, and is billed to, the key of the callers sharing it.
+parse_flights: SingleFlight[tuple[RequestTimings, ParsedImageResult]] = SingleFlight()
+
+parse_result_cache = ParseResultCache(
+    max_entries=int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", "512")),
+    disk_directory=os.environ.get("PARSE_CACHE_DIR") or None,
+    disk_max_bytes=int(os.environ.get("PARSE_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))),
+)
+
+
 async def parse_image_from_url(
     image_url: str,
     api_key: str,
     settings: ParseSettings,
     client: httpx.AsyncClient | None = None,
 ) -> ParsedImageResult:
-    """Download an image and parse it using LlamaCloud."""
+    """Download an image and parse it using LlamaCloud.
+
+    Concurrent calls for the same image URL, settings and API key share one download and
+    parse, whose stage timings are added to every caller's request.
+    """
+    timings, result = await parse_flights.run(
+        (image_url, settings, hashlib.sha256(api_key.encode()).hexdigest()),
+        lambda: collect_timings(_download_and_parse(image_url, api_key, settings, client)),
+    )
+    merge_timings(timings)
+    return result
+
+
+async def _download_and_parse(
+    image_url: str,
+    api_key: str,
+    settings: ParseSettings,
+    client: httpx.AsyncClient | None,
+) -> ParsedImageResult:
+    """Download the configured pbs variant of an image, shrink it if over budget and parse it."""
     should_close = client is None
     http_client = client or httpx.AsyncClient(timeout=30.0)
 
-    filename = _filename_from_url(image_url)
+    filename = filename_from_url(image_url)
     try:
-        response = await http_client.get(image_url)
-        response.raise_for_status()
-        return await parse_image_bytes(
-            image_bytes=response.content,
-            filename=filename,
-            image_url=image_url,
-            api_key=api_key,
-            settings=settings,
-        )
+        with PARSES_IN_FLIGHT.track_inprogress():
+            download_url = media_variant_url(image_url)
+            with timed_stage("download", IMAGE_DOWNLOAD_SECONDS, image_url):
+                image_bytes = await _download_image(http_client, download_url)
+            if preprocessing_enabled():
+                image_bytes = await asyncio.to_thread(optimize_image_bytes, image_bytes)
+            return await parse_image_bytes(
+                image_bytes=image_bytes,
+                filename=filename,
+                image_url=image_url,
+                api_key=api_key,
+                settings=settings,
+                upload_name=_upload_name(filename, download_url),
+            )
     except Exception as exc:
         return ParsedImageResult(
             image_url=image_url,
@@ -60,14 +176,35 @@ async def parse_image_from_url(
             await http_client.aclose()
 
 
+def _upload_name(filename: str, download_url: str) -> str:
+    """filename with the extension of the format download_url requests, so uploads are typed by what was fetched."""
+    image_format = parse_qs(urlparse(download_url).query).get("format", [""])[0]
+    return f"{Path(filename).stem}.{image_format}" if image_format else filename
+
+
+@dataclass
+class _Upload:
+    """LlamaCloud file id of an image, uploaded once and shared by every tier of a cascade."""
+
+    name: str | None = None
+    file_id: str | None = None
+
+
 async def parse_image_bytes(
     image_bytes: bytes,
     filename: str,
     image_url: str,
     api_key: str,
     settings: ParseSettings,
+    upload_name: str | None = None,
 ) -> ParsedImageResult:
-    """Parse image bytes using AsyncLlamaCloud parse APIs."""
+    """Parse image bytes using AsyncLlamaCloud parse APIs.
+
+    With tier=auto the tiers in TIER_CASCADE are tried in order until a result passes
+    quality_issue. The result reports the tier that produced it and why cheaper tiers
+    were passed over. upload_name, when given, names the uploaded file in place of
+    filename, for bytes whose format differs from the one filename suggests.
+    """
     if not api_key.startswith("llx-"):
         return ParsedImageResult(
             image_url=image_url,
@@ -75,53 +212,138 @@ async def parse_image_bytes(
             success=False,
             error="Invalid LlamaCloud API key format.",
         )
+    if settings.tier is not ParseTier.auto:
+        return await _parse_at_tier(image_bytes, filename, image_url, api_key, settings, _Upload(upload_name))
+
+    upload = _Upload(upload_name)
+    reasons: list[str] = []
+    last_success: ParsedImageResult | None = None
+    for index, tier in enumerate(TIER_CASCADE):
+        parsed = await _parse_at_tier(image_bytes, filename, image_url, api_key, replace(settings, tier=tier), upload)
+        if parsed.success:
+            last_success = parsed
+        issue = quality_issue(parsed)
+        if issue is None or index == len(TIER_CASCADE) - 1:
+            break
+        TIER_ESCALATIONS.inc(tier=tier.value, reason=issue)
+        reasons.append(f"{tier.value}: {issue}")
+    # A higher tier that fails outright does not replace a usable cheaper result.
+    chosen = parsed if parsed.success or last_success is None else last_success
+    return chosen.model_copy(update={"escalation_reasons": reasons})
+
+
+async def _parse_at_tier(
+    image_bytes: bytes,
+    filename: str,
+    image_url: str,
+    api_key: str,
+    settings: ParseSettings,
+    upload: _Upload,
+) -> ParsedImageResult:
+    """Parse at settings.tier, serving repeats from the parse cache and reusing upload when set."""
+    cache_key = ParseResultCache.key_for(image_bytes, settings)
+    cached = await parse_result_cache.get(cache_key)
+    record_cache_lookup("parse_result", cached is not None)
+    if cached is not None:
+        return ParsedImageResult.model_validate(
+            {
+                **cached.model_dump(),
+                "image_url": image_url,
+                "filename": filename,
+                "from_cache": True,
+                "tier": settings.tier,
+            }
+        )
 
-    try:
-        from llama_cloud import AsyncLlamaCloud  # type: ignore
-    except ImportError as exc:  # pragma: no cover - environment-specific guard
-        raise LlamaCloudParseError(
-            "Failed to import AsyncLlamaCloud from llama_cloud: "
-            f"{exc}. Python executable: {sys.executable}. "
-            "Install backend requirements in this same environment and restart the backend."
-        ) from exc
+    perceptual_hash: int | None = None
+    if perceptual_dedupe_enabled():
+        perceptual_hash = await asyncio.to_thread(image_hash, image_bytes)
+        reused = await _find_perceptual_match(perceptual_hash, settings)
+        record_cache_lookup("perceptual", reused is not None)
+        if reused is not None:
+            match, distance = reused
+            return ParsedImageResult.model_validate(
+                {
+                    **match.model_dump(),
+                    "image_url": image_url,
+                    "filename": filename,
+                    "from_cache": True,
+                    "reused_from": str(match.image_url),
+                    "perceptual_distance": distance,
+                    "tier": settings.tier,
+                }
+            )
 
     processing_options: dict[str, Any] = {}
     if settings.enable_chart_parsing:
         processing_options["specialized_chart_parsing"] = "agentic_plus"
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix or ".png") as temp_file:
-        temp_file.write(image_bytes)
-        temp_path = temp_file.name
+    upload_name = upload.name or (filename if Path(filename).suffix else f"{filename}.png")
+    content_type = mimetypes.guess_type(upload_name)[0] or "application/octet-stream"
 
     try:
-        client = AsyncLlamaCloud(api_key=api_key)
-        uploaded = await client.files.create(file=temp_path, purpose="parse")
-        result = await client.parsing.parse(
-            file_id=uploaded.id,
-            tier=settings.tier.value,
-            version="latest",
-            processing_options=processing_options,
-            expand=["markdown", "items", "text"],
-        )
+        async with llamacloud_client_pool.client(api_key) as client:
+            if upload.file_id is None:
+                with timed_stage("upload", LLAMACLOUD_UPLOAD_SECONDS, image_url, tier=settings.tier.value):
+                    uploaded = await client.files.create(
+                        file=(upload_name, image_bytes, content_type),
+                        purpose="parse",
+                    )
+                upload.file_id = uploaded.id
+            with timed_stage("parse", LLAMACLOUD_PARSE_SECONDS, image_url, tier=settings.tier.value):
+                result = await client.parsing.parse(
+                    file_id=upload.file_id,
+                    tier=settings.tier.value,
+                    version="latest",
+                    processing_options=processing_options,
+                    expand=["markdown", "items", "text"],
+                )
 
         markdown = extract_markdown_text(result)
         tables = extract_tables(result)
-        return ParsedImageResult(
+        parsed = ParsedImageResult(
             image_url=image_url,
             filename=filename,
             success=True,
             markdown=markdown,
             tables=tables,
+            tier=settings.tier,
         )
+        await parse_result_cache.set(cache_key, parsed)
+        if perceptual_hash is not None:
+            perceptual_index.add(_perceptual_namespace(settings), perceptual_hash, cache_key)
+        return parsed
     except Exception as exc:
         return ParsedImageResult(
             image_url=image_url,
             filename=filename,
             success=False,
             error=str(exc),
+            tier=settings.tier,
         )
-    finally:
-        os.unlink(temp_path)
+
+
+async def _find_perceptual_match(
+    perceptual_hash: int | None,
+    settings: ParseSettings,
+) -> tuple[ParsedImageResult, int] | None:
+    """Cached parse of the nearest visually matching image, with its Hamming distance.
+
+    Candidates are tried closest first; those whose parse has left the cache are dropped from the index.
+    """
+    if perceptual_hash is None:
+        return None
+    namespace = _perceptual_namespace(settings)
+    for cache_key, distance in perceptual_index.within(namespace, perceptual_hash, PERCEPTUAL_DEDUPE_MAX_DISTANCE):
+        cached = await parse_result_cache.get(cache_key)
+        if cached is not None:
+            return cached, distance
+        perceptual_index.discard(namespace, cache_key)
+    return None
+
+
+def _perceptual_namespace(settings: ParseSettings) -> str:
+    return f"{settings.tier.value}|{int(settings.enable_chart_parsing)}"
 
 
 
@@ -156,7 +378,6 @@ def extract_tables(result: Any) -> list[TableResult]:
             if not rows:
                 continue
 
-            markdown = _rows_to_markdown(rows)
             bbox = getattr(item, "b_box", None)
             bbox_value = list(bbox) if isinstance(bbox, (list, tuple)) else None
             tables.append(
@@ -164,7 +385,7 @@ def extract_tables(result: Any) -> list[TableResult]:
                     page_number=page_number,
                     row_count=len(rows),
                     column_count=max((len(row) for row in rows), default=0),
-                    markdown=markdown,
+                    columns=rows_to_columns(rows),
                     bbox=bbox_value,
                 )
             )
@@ -190,7 +411,7 @@ def build_combined_markdown(results: list[ParsedImageResult]) -> str:
             section_lines.append("")
             for table_index, table in enumerate(parsed.tables, start=1):
                 section_lines.append(f"#### Table {table_index} (Page {table.page_number})")
-                section_lines.append(table.markdown)
+                section_lines.append(render_markdown(table))
                 section_lines.append("")
 
         sections.append("\n".join(section_lines).strip())
@@ -200,7 +421,26 @@ def build_combined_markdown(results: list[ParsedImageResult]) -> str:
 
 
 
-def _filename_from_url(url: str) -> str:
+async def _download_image(client: httpx.AsyncClient, image_url: str) -> bytes:
+    """Stream image body into memory, enforcing MAX_IMAGE_BYTES."""
+    async with client.stream("GET", image_url) as response:
+        response.raise_for_status()
+        declared_length = int(response.headers.get("Content-Length", "0") or 0)
+        if declared_length > MAX_IMAGE_BYTES:
+            raise LlamaCloudParseError(f"Image is larger than {MAX_IMAGE_BYTES} bytes.")
+
+        chunks: list[bytes] = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > MAX_IMAGE_BYTES:
+                raise LlamaCloudParseError(f"Image is larger than {MAX_IMAGE_BYTES} bytes.")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+
+def filename_from_url(url: str) -> str:
     """Derive a stable filename from image URL."""
     path = urlparse(url).path
     name = Path(path).name
@@ -231,21 +471,3 @@ def _normalize_rows(raw_rows: Any) -> list[list[str]]:
 
     return [row for row in rows if row]
 
-
-
-def _rows_to_markdown(rows: list[list[str]]) -> str:
-    """Render table rows to markdown table string."""
-    if not rows:
-        return ""
-
-    header = rows[0]
-    body = rows[1:] if len(rows) > 1 else []
-
-    def to_row(cells: list[str], width: int) -> str:
-        padded = cells + [""] * (width - len(cells))
-        return "| " + " | ".join(cell.replace("\n", " ") for cell in padded) + " |"
-
-    width = max(len(row) for row in rows)
-    lines = [to_row(header, width), "| " + " | ".join(["---"] * width) + " |"]
-    lines.extend(to_row(row, width) for row in body)
-    return "\n".join(lines)
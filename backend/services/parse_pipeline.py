@@ -0,0 +1,127 @@
+"""Parsing of a tweet's extracted images and assembly of the per-tweet response.
+
+Shared by the synchronous parse routes and background jobs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+import httpx
+
+from models import ParsedImageResult, ParseTweetRequest, ParseTweetResponse, ResponseInclude, TableFormat
+from services.deadline import Deadline
+from services.llamacloud_parser import ParseSettings, build_combined_markdown, filename_from_url, parse_image_from_url
+from services.table_formats import format_results
+from services.tweet_media import ExtractedTweetMedia
+
+# Process-wide ceiling on images parsed concurrently for a single request.
+MAX_PARSE_CONCURRENCY = max(1, int(os.environ.get("PARSE_IMAGE_CONCURRENCY", "4")))
+
+
+def request_concurrency(request: ParseTweetRequest) -> int:
+    """Per-request image concurrency, capped by the process-wide limit."""
+    return min(request.max_concurrency or MAX_PARSE_CONCURRENCY, MAX_PARSE_CONCURRENCY)
+
+
+def build_parse_response(
+    extracted: ExtractedTweetMedia,
+    results: list[ParsedImageResult],
+    table_format: TableFormat = TableFormat.markdown,
+    include: ResponseInclude = ResponseInclude.all,
+) -> ParseTweetResponse:
+    """Assemble per-tweet response with tables in table_format, combined markdown and warnings.
+
+    Only the parts selected by include are rendered.
+    """
+    warnings = list(extracted.warnings)
+    failed = [result.filename for result in results if not result.success]
+    if failed:
+        warnings.append(f"Failed to parse {len(failed)} image(s): {', '.join(failed)}")
+
+    if include is ResponseInclude.no_tables:
+        results = [result.model_copy(update={"tables": []}) if result.tables else result for result in results]
+
+    # Rendered from the stored tables, which the copies made for table_format may no longer carry.
+    combined_markdown = "" if include is ResponseInclude.results_only else build_combined_markdown(results)
+    if include is ResponseInclude.combined_only:
+        results = [result.model_copy(update={"markdown": "", "tables": []}) for result in results]
+    else:
+        results = format_results(results, table_format)
+
+    return ParseTweetResponse(
+        tweet_id=extracted.tweet_id,
+        normalized_tweet_url=extracted.normalized_tweet_url,
+        source=extracted.source,
+        results=results,
+        combined_markdown=combined_markdown,
+        warnings=warnings,
+    )
+
+
+async def parse_images(
+    image_urls: list[str],
+    api_key: str,
+    settings: ParseSettings,
+    max_concurrency: int,
+    client: httpx.AsyncClient | None = None,
+    deadline: Deadline | None = None,
+) -> list[ParsedImageResult]:
+    """Parse images concurrently under a semaphore, preserving input order.
+
+    Parses still running at the deadline are cancelled and reported as timed out.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [
+        asyncio.create_task(parse_one(image_url, api_key, settings, semaphore, client))
+        for image_url in image_urls
+    ]
+    if not tasks:
+        return []
+    try:
+        await asyncio.wait(tasks, timeout=deadline.remaining() if deadline else None)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return [
+        task.result() if task.done() and not task.cancelled() else timed_out_result(image_url)
+        for task, image_url in zip(tasks, image_urls)
+    ]
+
+
+def timed_out_result(image_url: str) -> ParsedImageResult:
+    """Failed result for an image whose parse was cut off by the request deadline."""
+    return ParsedImageResult(
+        image_url=image_url,
+        filename=filename_from_url(image_url),
+        success=False,
+        timed_out=True,
+        error="Parse did not finish within the request deadline.",
+    )
+
+
+async def parse_one(
+    image_url: str,
+    api_key: str,
+    settings: ParseSettings,
+    semaphore: asyncio.Semaphore,
+    client: httpx.AsyncClient | None,
+) -> ParsedImageResult:
+    """Parse one image under semaphore, converting unexpected errors to a failed result."""
+    async with semaphore:
+        try:
+            return await parse_image_from_url(
+                image_url=image_url,
+                api_key=api_key,
+                settings=settings,
+                client=client,
+            )
+        except Exception as exc:
+            return ParsedImageResult(
+                image_url=image_url,
+                filename=filename_from_url(image_url),
+                success=False,
+                error=str(exc),
+            )
@@ -0,0 +1,191 @@
+"""Perceptual image hashes and a Hamming-distance index for near-duplicate lookups."""
+
+from __future__ import annotations
+
+import io
+import itertools
+import os
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+try:  # Pillow decodes images; without it no hashes are computed.
+    from PIL import Image
+except ImportError:  # pragma: no cover - environment-specific guard
+    Image = None
+
+try:  # NumPy enables pHash; dHash needs only Pillow.
+    import numpy as np
+except ImportError:  # pragma: no cover - environment-specific guard
+    np = None
+
+V = TypeVar("V")
+
+HASH_BITS = 64
+
+# Reuse parses of visually matching images. Off by default: charts sharing a template but
+# with different numbers can hash within a few bits of each other.
+PERCEPTUAL_DEDUPE = os.environ.get("PERCEPTUAL_DEDUPE", "0") == "1"
+PERCEPTUAL_DEDUPE_MAX_DISTANCE = int(os.environ.get("PERCEPTUAL_DEDUPE_MAX_DISTANCE", "4"))
+# "dhash" needs Pillow; "phash" also needs NumPy and falls back to dHash without it.
+PERCEPTUAL_HASH_ALGORITHM = os.environ.get("PERCEPTUAL_HASH_ALGORITHM", "dhash")
+
+
+def perceptual_dedupe_enabled() -> bool:
+    return PERCEPTUAL_DEDUPE and Image is not None
+
+
+def image_hash(image_bytes: bytes, algorithm: str | None = None) -> int | None:
+    """64-bit perceptual hash of an image, or None when it cannot be decoded.
+
+    CPU-bound; call it through asyncio.to_thread.
+    """
+    if Image is None:
+        return None
+    algorithm = algorithm or PERCEPTUAL_HASH_ALGORITHM
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        image.load()
+    except Exception:
+        return None
+    if algorithm == "phash" and np is not None:
+        return phash(image)
+    return dhash(image)
+
+
+def dhash(image: "Image.Image") -> int:
+    """Difference hash: whether each pixel is brighter than its right neighbour on a 9x8 thumbnail."""
+    pixels = image.convert("L").resize((9, 8), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            value = (value << 1) | int(left > pixels[row * 9 + column + 1])
+    return value
+
+
+_DCT_SIZE = 32
+_dct_matrix = None
+
+
+def phash(image: "Image.Image") -> int:
+    """DCT hash: low-frequency coefficients of a 32x32 thumbnail compared with their median."""
+    global _dct_matrix
+    if _dct_matrix is None:
+        n = np.arange(_DCT_SIZE)
+        _dct_matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * _DCT_SIZE))
+    pixels = np.asarray(image.convert("L").resize((_DCT_SIZE, _DCT_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (_dct_matrix @ pixels @ _dct_matrix.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+class PerceptualHashIndex(Generic[V]):
+    """Bounded index of 64-bit hashes supporting nearest-neighbour search by Hamming distance.
+
+    Uses multi-index hashing: each hash is split into `chunks` 16-bit substrings, each
+    with its own bucket table. Two hashes within distance d share at least one chunk
+    within distance d // chunks, so a query only probes buckets near its own chunks
+    instead of scanning every entry. Entries live in separate namespaces (for example
+    one per parse setting) and the oldest are evicted beyond max_entries. Adding a value
+    already indexed in a namespace replaces its earlier entry.
+    """
+
+    def __init__(self, max_entries: int, chunks: int = 4) -> None:
+        if HASH_BITS % chunks:
+            raise ValueError("chunks must divide the hash width")
+        self.max_entries = max_entries
+        self.chunks = chunks
+        self._chunk_bits = HASH_BITS // chunks
+        self._chunk_mask = (1 << self._chunk_bits) - 1
+        self._entries: OrderedDict[int, tuple[str, int, V]] = OrderedDict()
+        self._buckets: dict[tuple[str, int, int], set[int]] = {}
+        self._ids: dict[tuple[str, V], int] = {}
+        self._next_id = 0
+
+    def add(self, namespace: str, value_hash: int, value: V) -> None:
+        """Index value under value_hash."""
+        if self.max_entries <= 0:
+            return
+        self.discard(namespace, value)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (namespace, value_hash, value)
+        self._ids[(namespace, value)] = entry_id
+        for bucket in self._bucket_keys(namespace, value_hash):
+            self._buckets.setdefault(bucket, set()).add(entry_id)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def nearest(self, namespace: str, value_hash: int, max_distance: int) -> tuple[V, int] | None:
+        """Closest indexed value within max_distance, newest first on ties, with its distance."""
+        matches = self.within(namespace, value_hash, max_distance)
+        return matches[0] if matches else None
+
+    def within(self, namespace: str, value_hash: int, max_distance: int) -> list[tuple[V, int]]:
+        """Every indexed value within max_distance with its distance, closest first and newest first on ties."""
+        radius = max_distance // self.chunks
+        matches: list[tuple[int, int, V]] = []
+        seen: set[int] = set()
+        for index, chunk in enumerate(self._chunks(value_hash)):
+            for probe in self._neighbours(chunk, radius):
+                for entry_id in self._buckets.get((namespace, index, probe), ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    _, candidate_hash, value = self._entries[entry_id]
+                    distance = (candidate_hash ^ value_hash).bit_count()
+                    if distance <= max_distance:
+                        matches.append((distance, -entry_id, value))
+        matches.sort(key=lambda match: match[:2])
+        return [(value, distance) for distance, _, value in matches]
+
+    def discard(self, namespace: str, value: V) -> None:
+        """Remove value from the index, for example once it no longer resolves."""
+        entry_id = self._ids.get((namespace, value))
+        if entry_id is not None:
+            self._remove(entry_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self._ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, entry_id: int) -> None:
+        namespace, value_hash, value = self._entries.pop(entry_id)
+        del self._ids[(namespace, value)]
+        for bucket in self._bucket_keys(namespace, value_hash):
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(entry_id)
+                if not members:
+                    del self._buckets[bucket]
+
+    def _chunks(self, value_hash: int) -> list[int]:
+        return [(value_hash >> (index * self._chunk_bits)) & self._chunk_mask for index in range(self.chunks)]
+
+    def _bucket_keys(self, namespace: str, value_hash: int) -> list[tuple[str, int, int]]:
+        return [(namespace, index, chunk) for index, chunk in enumerate(self._chunks(value_hash))]
+
+    def _neighbours(self, chunk: int, radius: int) -> list[int]:
+        """Every chunk value within radius bit flips of chunk, including itself."""
+        values = [chunk]
+        for flips in range(1, radius + 1):
+            for positions in itertools.combinations(range(self._chunk_bits), flips):
+                flipped = chunk
+                for position in positions:
+                    flipped ^= 1 << position
+                values.append(flipped)
+        return values
+
+
+# Parse-result cache keys of previously parsed images, namespaced by parse settings. Entries
+# only pay off while their key still resolves, so by default the index holds as many as the
+# in-memory parse cache; raise it together with PARSE_CACHE_DIR.
+perceptual_index: PerceptualHashIndex[str] = PerceptualHashIndex(
+    max_entries=int(
+        os.environ.get("PERCEPTUAL_INDEX_MAX_ENTRIES") or os.environ.get("PARSE_CACHE_MAX_ENTRIES", "512")
+    ),
+)
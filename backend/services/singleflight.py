@@ -0,0 +1,67 @@
+"""Coalescing of identical in-flight async work."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    """Shared task plus the number of callers awaiting it."""
+
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one task per key; concurrent callers with that key share its outcome.
+
+    A caller that is cancelled only stops waiting. The shared task is cancelled when
+    its last waiter goes away, so abandoned work does not keep running; its key is
+    released at once, so later callers start fresh work instead of joining it.
+
+    The shared task runs in an empty context rather than the first caller's, so no one
+    request's context variables, such as its deadline or timings, apply to work that
+    others share; each waiter bounds its own wait instead.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await the in-flight task for key, starting it via factory if there is none."""
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.get_running_loop().create_task(_call(factory), context=contextvars.Context())
+            flight = _Flight(task=task)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently running."""
+        return len(self._flights)
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+async def _call(factory: Callable[[], Awaitable[T]]) -> T:
+    return await factory()
@@ -0,0 +1,96 @@
+"""Columnar table storage and the markdown, CSV, JSON and Arrow renderings served to clients."""
+
+from __future__ import annotations
+
+import base64
+import csv
+import io
+from collections.abc import Iterator
+from itertools import zip_longest
+
+from models import ParsedImageResult, TableFormat, TableResult
+
+try:  # pyarrow is optional; format=arrow is rejected without it.
+    import pyarrow
+except ImportError:  # pragma: no cover - environment-specific guard
+    pyarrow = None
+
+
+def arrow_available() -> bool:
+    return pyarrow is not None
+
+
+def rows_to_columns(rows: list[list[str]]) -> list[list[str]]:
+    """Transpose rows into columns, padding ragged rows with empty cells."""
+    return [list(cells) for cells in zip_longest(*rows, fillvalue="")]
+
+
+def iter_rows(table: TableResult) -> Iterator[tuple[str, ...]]:
+    """Rows of a stored table, header first."""
+    return zip(*(table.columns or []))
+
+
+def render_markdown(table: TableResult) -> str:
+    """Markdown for a table, reusing a stored rendering when there is one."""
+    if table.markdown is not None:
+        return table.markdown
+    rows = iter_rows(table)
+    header = next(rows, None)
+    if header is None:
+        return ""
+
+    def to_row(cells: tuple[str, ...]) -> str:
+        return "| " + " | ".join(cell.replace("\n", " ") for cell in cells) + " |"
+
+    lines = [to_row(header), "| " + " | ".join(["---"] * len(header)) + " |"]
+    lines.extend(to_row(cells) for cells in rows)
+    return "\n".join(lines)
+
+
+def render_csv(table: TableResult) -> str:
+    """RFC 4180 CSV with the column names as the header row."""
+    output = io.StringIO()
+    csv.writer(output, lineterminator="\r\n").writerows(iter_rows(table))
+    return output.getvalue()
+
+
+def render_arrow(table: TableResult) -> str:
+    """Base64 Arrow IPC stream holding the table as string columns. Requires pyarrow."""
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is required for Arrow table output.")
+    columns = table.columns or []
+    arrow_table = pyarrow.Table.from_arrays(
+        [pyarrow.array(column[1:], type=pyarrow.string()) for column in columns],
+        names=[column[0] for column in columns],
+    )
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+    return base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+
+
+def format_table(table: TableResult, table_format: TableFormat) -> TableResult:
+    """Copy of table carrying only the requested representation."""
+    if table_format is TableFormat.json:
+        return table.model_copy(update={"markdown": None})
+    update: dict[str, object] = {"columns": None, "markdown": None}
+    if table_format is TableFormat.markdown:
+        update["markdown"] = render_markdown(table)
+    elif table_format is TableFormat.csv:
+        update["csv"] = render_csv(table)
+    else:
+        update["arrow"] = render_arrow(table)
+    return table.model_copy(update=update)
+
+
+def format_results(results: list[ParsedImageResult], table_format: TableFormat) -> list[ParsedImageResult]:
+    """Copies of results whose tables carry only the requested representation.
+
+    Results may be shared with the parse cache, so they are copied rather than modified.
+    """
+    return [
+        result.model_copy(update={"tables": [format_table(table, table_format) for table in result.tables]})
+        if result.tables
+        else result
+        for result in results
+    ]
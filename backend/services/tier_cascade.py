@@ -0,0 +1,45 @@
+"""Tier cascade for tier=auto: the cheap-tier result is kept unless a quality check fails."""
+
+from __future__ import annotations
+
+import os
+import re
+
+from models import ParsedImageResult, ParseTier
+
+# Tiers tried in order for tier=auto; each later tier runs only when the previous result fails the checks.
+TIER_CASCADE = [
+    ParseTier(tier.strip())
+    for tier in os.environ.get("TIER_CASCADE", "cost_effective,agentic").split(",")
+    if tier.strip() and tier.strip() != ParseTier.auto.value
+] or [ParseTier.agentic]
+# Escalate when more than this share of a table's cells are empty, as in ragged or misread tables.
+AUTO_TIER_MAX_EMPTY_CELL_RATIO = float(os.environ.get("AUTO_TIER_MAX_EMPTY_CELL_RATIO", "0.34"))
+
+_DIGIT_RE = re.compile(r"\d")
+
+
+def quality_issue(result: ParsedImageResult) -> str | None:
+    """Reason a cheap-tier result should be re-parsed at a higher tier, or None when it looks usable.
+
+    Charts carry numbers, so a result without any digit is treated as a misread.
+    """
+    if not result.success:
+        return "failed"
+    if not result.markdown.strip() and not result.tables:
+        return "empty"
+    for table in result.tables:
+        if table.columns is None:
+            continue
+        # Each column starts with its header cell; only body cells are judged.
+        body_cells = sum(len(column) - 1 for column in table.columns)
+        if table.row_count < 2 or not body_cells:
+            return "header_only_table"
+        empty_cells = sum(column.count("") - (column[0] == "") for column in table.columns)
+        if empty_cells / body_cells > AUTO_TIER_MAX_EMPTY_CELL_RATIO:
+            return "sparse_table"
+    if not _DIGIT_RE.search(result.markdown) and not any(
+        _DIGIT_RE.search(cell) for table in result.tables for column in table.columns or [] for cell in column[1:]
+    ):
+        return "no_values"
+    return None
@@ -0,0 +1,131 @@
+"""Per-request stage timings for Server-Timing headers and parse responses."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from models import ImageTimings, ParseTimings
+from services.metrics import Histogram
+
+T = TypeVar("T")
+
+IMAGE_STAGES = ("download", "upload", "parse")
+
+
+@dataclass
+class RequestTimings:
+    """Stage durations in milliseconds collected while serving one request."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+    images: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def add(self, stage: str, seconds: float, image_url: str | None = None) -> None:
+        """Accumulate a stage duration, per image when image_url is given."""
+        target = self.stages if image_url is None else self.images.setdefault(image_url, {})
+        target[stage] = target.get(stage, 0.0) + seconds * 1000
+
+    def merge(self, other: RequestTimings) -> None:
+        """Accumulate every stage duration recorded in other."""
+        for stage, duration in other.stages.items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + duration
+        for image_url, stages in other.images.items():
+            target = self.images.setdefault(image_url, {})
+            for stage, duration in stages.items():
+                target[stage] = target.get(stage, 0.0) + duration
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def server_timing(self) -> str:
+        """Render a Server-Timing header value; image spans are numbered in recording order."""
+        entries = [f"{stage};dur={duration:.1f}" for stage, duration in self.stages.items()]
+        for index, stages in enumerate(self.images.values(), start=1):
+            for stage in IMAGE_STAGES:
+                if stage in stages:
+                    entries.append(f'{stage}-{index};dur={stages[stage]:.1f};desc="image {index}"')
+        entries.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(entries)
+
+    def to_model(self, image_urls: list[str]) -> ParseTimings:
+        """Summarize timings for image_urls in order."""
+        images: list[ImageTimings] = []
+        for image_url in image_urls:
+            stages = self.images.get(image_url, {})
+            images.append(
+                ImageTimings(
+                    image_url=image_url,
+                    download_ms=_rounded(stages.get("download")),
+                    upload_ms=_rounded(stages.get("upload")),
+                    parse_ms=_rounded(stages.get("parse")),
+                )
+            )
+        return ParseTimings(
+            extraction_ms=_rounded(self.stages.get("extract")),
+            images=images,
+            total_ms=round(self.total_ms(), 1),
+        )
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    """Begin collecting timings for the current request context."""
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_request_timings() -> RequestTimings | None:
+    return _current_timings.get()
+
+
+async def collect_timings(work: Awaitable[T]) -> tuple[RequestTimings, T]:
+    """Await work with its stages recorded into fresh timings, returned alongside its result.
+
+    Meant for work shared between requests: run it in the shared task, then merge_timings
+    the returned timings into each request that awaited it.
+    """
+    timings = start_request_timings()
+    return timings, await work
+
+
+def merge_timings(timings: RequestTimings) -> None:
+    """Add timings recorded elsewhere to the current request's timings, if any are being collected."""
+    current = _current_timings.get()
+    if current is not None:
+        current.merge(timings)
+
+
+def record_stage(stage: str, seconds: float, image_url: str | None = None) -> None:
+    """Add a duration to the current request's timings, if any are being collected."""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds, image_url)
+
+
+@contextmanager
+def timed_stage(
+    stage: str,
+    histogram: Histogram,
+    image_url: str | None = None,
+    **labels: str,
+) -> Iterator[None]:
+    """Observe the block's duration in histogram and record it as a request stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed, **labels)
+        record_stage(stage, elapsed, image_url)
+
+
+def _rounded(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
@@ -3,14 +3,35 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
+import hashlib
+import os
+import random
 import re
-from dataclasses import dataclass
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import httpx
 
 from models import MediaExtractionErrorCode, MediaExtractionSource
-from services.tweet_urls import InvalidTweetUrlError, parse_tweet_url
+from services import fast_json, upstreams
+from services.cache import TTLCache
+from services.deadline import current_deadline
+from services.metrics import (
+    EXTRACTION_FAILURES,
+    EXTRACTION_FALLBACKS,
+    EXTRACTION_SECONDS,
+    UPSTREAM_RETRIES,
+    record_cache_lookup,
+)
+from services.singleflight import SingleFlight
+from services.timing import record_stage
+from services.tweet_urls import InvalidTweetUrlError, TweetUrlInfo, parse_tweet_url
+from services.upstreams import CircuitBreaker, CircuitOpenError, get_upstream_guard
 
 
 class TweetMediaError(Exception):
@@ -41,88 +62,274 @@ class ExtractedTweetMedia:
     warnings: list[str]
 
 
+MEDIA_CACHE_TTL_SECONDS = float(os.environ.get("MEDIA_CACHE_TTL_SECONDS", "300"))
+MEDIA_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get("MEDIA_CACHE_NEGATIVE_TTL_SECONDS", "60"))
+_NEGATIVE_CACHE_CODES = {
+    MediaExtractionErrorCode.no_media_found,
+    MediaExtractionErrorCode.unsupported_tweet,
+}
+
+# Extraction outcomes keyed by tweet_id: either the media found or the terminal error.
+# Errors are only cached for, and served to, requests without an X bearer token.
+media_cache: TTLCache[str, ExtractedTweetMedia | TweetMediaError] = TTLCache(
+    max_entries=int(os.environ.get("MEDIA_CACHE_MAX_ENTRIES", "2048")),
+)
+
+# In-flight extractions keyed by tweet_id and SHA-256 of the X bearer token (None without
+# one), shared by concurrent requests for one tweet that bring the same credentials.
+extraction_flights: SingleFlight[ExtractedTweetMedia] = SingleFlight()
+
+# "sequential" walks the fallback chain one strategy at a time; "hedged" starts the next
+# strategy after MEDIA_EXTRACTION_HEDGE_DELAY_SECONDS; "parallel" starts all at once.
+MEDIA_EXTRACTION_MODE = os.environ.get("MEDIA_EXTRACTION_MODE", "sequential")
+MEDIA_EXTRACTION_HEDGE_DELAY_SECONDS = float(os.environ.get("MEDIA_EXTRACTION_HEDGE_DELAY_SECONDS", "0.75"))
+
+# Stop reading a tweet page after this many bytes if </head> has not appeared.
+HTML_META_MAX_BYTES = int(os.environ.get("HTML_META_MAX_BYTES", str(512 * 1024)))
+# Keep strict to pbs media images, avoids random page assets.
+_PBS_MEDIA_URL_RE = re.compile(r"https://pbs\.twimg\.com/media/[A-Za-z0-9_\-]+(?:\?[^\"'\s<>]+)?")
+_HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+# Text kept between chunks; longer than any media URL or closing head tag.
+_SCAN_OVERLAP_CHARS = 2048
+
+RETRY_BASE_DELAY_SECONDS = float(os.environ.get("RETRY_BASE_DELAY_SECONDS", "0.3"))
+RETRY_MAX_DELAY_SECONDS = float(os.environ.get("RETRY_MAX_DELAY_SECONDS", "5"))
+
+
 async def extract_tweet_images(
     tweet_url: str,
     x_bearer_token: str | None = None,
     client: httpx.AsyncClient | None = None,
 ) -> ExtractedTweetMedia:
-    """Extract ordered photo URLs from a tweet URL."""
+    """Extract ordered photo URLs from a tweet URL, serving repeats from cache."""
     try:
         parsed = parse_tweet_url(tweet_url)
     except InvalidTweetUrlError as exc:
+        EXTRACTION_FAILURES.inc(code=MediaExtractionErrorCode.invalid_tweet_url.value)
         raise TweetMediaError(
             code=MediaExtractionErrorCode.invalid_tweet_url,
             message=str(exc),
             status_code=422,
         ) from exc
 
-    should_close = client is None
-    http_client = client or httpx.AsyncClient(timeout=20.0)
-    warnings: list[str] = []
+    started = time.perf_counter()
+    cached = media_cache.get(parsed.tweet_id)
+    if isinstance(cached, TweetMediaError) and x_bearer_token:
+        # Negative outcomes come from tokenless extraction; a token may reach the X API.
+        cached = None
+    record_cache_lookup("media", cached is not None)
+    if isinstance(cached, TweetMediaError):
+        EXTRACTION_FAILURES.inc(code=cached.code.value)
+        raise TweetMediaError(
+            code=cached.code,
+            message=cached.message,
+            status_code=cached.status_code,
+            details=cached.details,
+        )
+    if cached is not None:
+        record_stage("extract", time.perf_counter() - started)
+        return replace(
+            cached,
+            normalized_tweet_url=parsed.normalized_url,
+            image_urls=list(cached.image_urls),
+            warnings=list(cached.warnings),
+        )
 
     try:
-        if x_bearer_token:
-            try:
-                x_api_urls = await _extract_via_x_api(parsed.tweet_id, x_bearer_token, http_client)
-                if x_api_urls:
-                    return ExtractedTweetMedia(
-                        tweet_id=parsed.tweet_id,
-                        normalized_tweet_url=parsed.normalized_url,
-                        image_urls=x_api_urls,
-                        source=MediaExtractionSource.x_api,
-                        warnings=warnings,
-                    )
-                warnings.append("X API returned no photo media; attempting fallback extractors.")
-            except TweetMediaError as exc:
-                if exc.code in {
-                    MediaExtractionErrorCode.auth_required,
-                    MediaExtractionErrorCode.upstream_error,
-                }:
-                    warnings.append(f"X API path unavailable ({exc.code.value}); attempting fallback extractors.")
-                else:
-                    raise
+        token_hash = hashlib.sha256(x_bearer_token.encode()).hexdigest() if x_bearer_token else None
+        extracted = await extraction_flights.run(
+            (parsed.tweet_id, token_hash),
+            lambda: _extract_uncached(parsed, x_bearer_token, client),
+        )
+    except TweetMediaError as exc:
+        elapsed = time.perf_counter() - started
+        EXTRACTION_SECONDS.observe(elapsed, source="none")
+        record_stage("extract", elapsed)
+        EXTRACTION_FAILURES.inc(code=exc.code.value)
+        if exc.code in _NEGATIVE_CACHE_CODES and not x_bearer_token:
+            media_cache.set(parsed.tweet_id, exc, MEDIA_CACHE_NEGATIVE_TTL_SECONDS)
+        raise
+
+    elapsed = time.perf_counter() - started
+    EXTRACTION_SECONDS.observe(elapsed, source=extracted.source.value)
+    record_stage("extract", elapsed)
+    media_cache.set(parsed.tweet_id, extracted, MEDIA_CACHE_TTL_SECONDS)
+    return replace(extracted, image_urls=list(extracted.image_urls), warnings=list(extracted.warnings))
 
-        syndication_urls = await _extract_via_syndication(parsed.tweet_id, http_client)
-        if syndication_urls:
-            return ExtractedTweetMedia(
-                tweet_id=parsed.tweet_id,
-                normalized_tweet_url=parsed.normalized_url,
-                image_urls=syndication_urls,
-                source=MediaExtractionSource.syndication,
-                warnings=warnings,
-            )
 
-        fxtwitter_urls = await _extract_via_fxtwitter_api(parsed.tweet_id, http_client)
-        if fxtwitter_urls:
-            warnings.append("Using fxtwitter API fallback for media extraction.")
-            return ExtractedTweetMedia(
-                tweet_id=parsed.tweet_id,
-                normalized_tweet_url=parsed.normalized_url,
-                image_urls=fxtwitter_urls,
-                source=MediaExtractionSource.fxtwitter_api,
-                warnings=warnings,
-            )
+@dataclass(frozen=True)
+class _ExtractionStrategy:
+    """One media extractor in the fallback chain, in priority order."""
 
-        html_urls = await _extract_via_html_meta(parsed.normalized_url, http_client)
-        if html_urls:
-            warnings.append("Using HTML metadata fallback, which may return partial media set.")
-            return ExtractedTweetMedia(
-                tweet_id=parsed.tweet_id,
-                normalized_tweet_url=parsed.normalized_url,
-                image_urls=html_urls,
-                source=MediaExtractionSource.html_meta,
-                warnings=warnings,
-            )
+    source: MediaExtractionSource
+    run: Callable[[], Awaitable[list[str]]]
+    warning: str | None = None
+
+
+async def _extract_uncached(
+    parsed: TweetUrlInfo,
+    x_bearer_token: str | None,
+    client: httpx.AsyncClient | None,
+) -> ExtractedTweetMedia:
+    """Run the extraction strategies sequentially or hedged, per configuration."""
+    should_close = client is None
+    http_client = client or httpx.AsyncClient(timeout=20.0)
+    warnings: list[str] = []
 
+    async def run_x_api() -> list[str]:
+        try:
+            urls = await _extract_via_x_api(parsed.tweet_id, x_bearer_token or "", http_client)
+        except TweetMediaError as exc:
+            if exc.code not in {
+                MediaExtractionErrorCode.auth_required,
+                MediaExtractionErrorCode.upstream_error,
+            }:
+                raise
+            warnings.append(f"X API path unavailable ({exc.code.value}); attempting fallback extractors.")
+            return []
+        if not urls:
+            warnings.append("X API returned no photo media; attempting fallback extractors.")
+        return urls
+
+    strategies: list[_ExtractionStrategy] = []
+    if x_bearer_token:
+        strategies.append(_ExtractionStrategy(MediaExtractionSource.x_api, run_x_api))
+    strategies.extend(
+        [
+            _ExtractionStrategy(
+                MediaExtractionSource.syndication,
+                lambda: _extract_via_syndication(parsed.tweet_id, http_client),
+            ),
+            _ExtractionStrategy(
+                MediaExtractionSource.fxtwitter_api,
+                lambda: _extract_via_fxtwitter_api(parsed.tweet_id, http_client),
+                "Using fxtwitter API fallback for media extraction.",
+            ),
+            _ExtractionStrategy(
+                MediaExtractionSource.html_meta,
+                lambda: _extract_via_html_meta(parsed.normalized_url, http_client),
+                "Using HTML metadata fallback, which may return partial media set.",
+            ),
+        ]
+    )
+    strategies = [replace(strategy, run=_skip_open_circuit(strategy, warnings)) for strategy in strategies]
+
+    try:
+        if MEDIA_EXTRACTION_MODE == "sequential":
+            winner = await _run_sequential(strategies)
+        else:
+            hedge_delay = 0.0 if MEDIA_EXTRACTION_MODE == "parallel" else MEDIA_EXTRACTION_HEDGE_DELAY_SECONDS
+            winner = await _run_hedged(strategies, hedge_delay)
+    finally:
+        if should_close:
+            await http_client.aclose()
+
+    if winner is None:
         raise TweetMediaError(
             code=MediaExtractionErrorCode.no_media_found,
             message="No image media found for this tweet URL.",
             status_code=404,
             details={"tweet_id": parsed.tweet_id},
         )
+
+    strategy, image_urls = winner
+    if strategy.warning:
+        warnings.append(strategy.warning)
+    return ExtractedTweetMedia(
+        tweet_id=parsed.tweet_id,
+        normalized_tweet_url=parsed.normalized_url,
+        image_urls=image_urls,
+        source=strategy.source,
+        warnings=warnings,
+    )
+
+
+def _skip_open_circuit(
+    strategy: _ExtractionStrategy,
+    warnings: list[str],
+) -> Callable[[], Awaitable[list[str]]]:
+    """Treat a strategy whose upstream circuit is open as having found nothing.
+
+    Strategies that come back empty are counted as fallbacks.
+    """
+
+    async def run() -> list[str]:
+        try:
+            urls = await strategy.run()
+        except CircuitOpenError as exc:
+            warnings.append(f"Skipped {strategy.source.value} extractor: {exc}")
+            urls = []
+        if not urls:
+            EXTRACTION_FALLBACKS.inc(source=strategy.source.value)
+        return urls
+
+    return run
+
+
+async def _run_sequential(
+    strategies: list[_ExtractionStrategy],
+) -> tuple[_ExtractionStrategy, list[str]] | None:
+    """Try each strategy in turn and return the first with media."""
+    for strategy in strategies:
+        urls = await strategy.run()
+        if urls:
+            return strategy, urls
+    return None
+
+
+async def _run_hedged(
+    strategies: list[_ExtractionStrategy],
+    hedge_delay: float,
+) -> tuple[_ExtractionStrategy, list[str]] | None:
+    """Race strategies, starting each one after hedge_delay or when all running ones settle.
+
+    The highest-priority strategy that returns media wins; a lower-priority result is only
+    accepted once every strategy above it has come back empty. Losers are cancelled.
+    """
+    tasks: list[asyncio.Task[list[str]]] = []
+    outcomes: dict[int, list[str] | BaseException] = {}
+
+    def launch_next() -> None:
+        tasks.append(asyncio.create_task(strategies[len(tasks)].run()))
+
+    launch_next()
+    while hedge_delay <= 0 and len(tasks) < len(strategies):
+        launch_next()
+
+    try:
+        while True:
+            for index, strategy in enumerate(strategies):
+                if index not in outcomes:
+                    break
+                outcome = outcomes[index]
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                if outcome:
+                    return strategy, outcome
+            else:
+                return None
+
+            pending = [task for task in tasks if not task.done()]
+            if not pending:
+                launch_next()
+                continue
+
+            has_more = len(tasks) < len(strategies)
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=hedge_delay if has_more else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                launch_next()
+                continue
+            for task in done:
+                outcomes[tasks.index(task)] = task.exception() or task.result()
     finally:
-        if should_close:
-            await http_client.aclose()
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def _request_with_retries(
@@ -132,26 +339,84 @@ async def _request_with_retries(
     *,
     max_attempts: int = 3,
     retryable_statuses: set[int] | None = None,
+    stream: bool = False,
     **kwargs: Any,
 ) -> httpx.Response:
-    """Make resilient HTTP requests for transient upstream failures."""
+    """Make resilient HTTP requests for transient upstream failures.
+
+    Calls are rate limited and circuit broken per host, and retries draw from the
+    process-wide retry budget with jittered backoff that honours Retry-After. No retry
+    is attempted when its backoff would outlast the current request deadline, or once
+    the host's circuit has opened.
+    With stream=True the body is left unread and the caller must close the response.
+    """
     retryable_statuses = retryable_statuses or {429, 500, 502, 503, 504}
+    guard = get_upstream_guard(httpx.URL(url).host)
+    if not guard.breaker.allow():
+        raise CircuitOpenError(guard.host, guard.breaker.retry_in())
+    holds_trial = guard.breaker.trial_in_flight
+    upstreams.retry_budget.record_request()
 
-    delay = 0.3
-    for attempt in range(1, max_attempts + 1):
-        try:
-            response = await client.request(method, url, **kwargs)
-            if response.status_code not in retryable_statuses or attempt == max_attempts:
-                return response
-        except httpx.RequestError:
-            if attempt == max_attempts:
-                raise
-        await asyncio.sleep(delay)
-        delay *= 2
+    try:
+        for attempt in range(1, max_attempts + 1):
+            await guard.limiter.acquire()
+            try:
+                response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+            except httpx.RequestError:
+                guard.breaker.record_failure()
+                delay = _retry_delay(attempt, None)
+                if not _may_retry(guard.breaker, attempt, max_attempts, delay):
+                    raise
+            else:
+                if response.status_code not in retryable_statuses:
+                    guard.breaker.record_success()
+                    return response
+                guard.breaker.record_failure()
+                delay = _retry_delay(attempt, response)
+                if not _may_retry(guard.breaker, attempt, max_attempts, delay):
+                    return response
+                await response.aclose()
+            UPSTREAM_RETRIES.inc(host=guard.host)
+            await asyncio.sleep(delay)
+    finally:
+        # A half-open trial cancelled by a hedge, deadline or disconnect would otherwise hold
+        # the only trial slot forever and keep the circuit from ever closing.
+        if holds_trial:
+            guard.breaker.release_trial()
 
     raise RuntimeError("unreachable")
 
 
+def _may_retry(breaker: CircuitBreaker, attempt: int, max_attempts: int, delay: float) -> bool:
+    """Whether another attempt after delay fits max_attempts, the circuit, the request deadline and the retry budget."""
+    if attempt == max_attempts:
+        return False
+    # The failure just recorded may have opened the circuit, or reopened it after a failed trial.
+    if breaker.state == "open":
+        return False
+    deadline = current_deadline()
+    if deadline is not None and delay >= deadline.remaining():
+        return False
+    return upstreams.retry_budget.try_spend()
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    """Backoff before the next attempt: Retry-After when given, else full-jitter exponential."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(RETRY_MAX_DELAY_SECONDS, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                return min(RETRY_MAX_DELAY_SECONDS, max(0.0, seconds))
+    return random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1)))
+
+
 async def _extract_via_x_api(
     tweet_id: str,
     bearer_token: str,
@@ -194,7 +459,7 @@ async def _extract_via_x_api(
             status_code=502,
         )
 
-    payload = response.json()
+    payload = fast_json.loads(response.content)
     media_items = payload.get("includes", {}).get("media", [])
     urls: list[str] = []
     for media in media_items:
@@ -220,7 +485,7 @@ async def _extract_via_syndication(tweet_id: str, client: httpx.AsyncClient) ->
     if response.status_code >= 400:
         return []
 
-    payload = response.json()
+    payload = fast_json.loads(response.content)
     urls: list[str] = []
 
     for media in payload.get("mediaDetails", []):
@@ -249,22 +514,74 @@ async def _extract_via_syndication(tweet_id: str, client: httpx.AsyncClient) ->
 
 
 async def _extract_via_html_meta(tweet_url: str, client: httpx.AsyncClient) -> list[str]:
-    """Best-effort extraction from tweet HTML metadata."""
+    """Best-effort extraction from tweet HTML metadata, reading only the page head."""
     response = await _request_with_retries(
         client,
         "GET",
         tweet_url,
         headers={"User-Agent": "Mozilla/5.0"},
+        stream=True,
     )
-    if response.status_code >= 400:
-        return []
-
-    text = response.text
-    # Keep strict to pbs media images, avoids random page assets.
-    matches = re.findall(r"https://pbs\.twimg\.com/media/[A-Za-z0-9_\-]+(?:\?[^\"'\s<>]+)?", text)
+    try:
+        if response.status_code >= 400:
+            return []
+        matches = await _scan_html_for_media_urls(
+            response.aiter_bytes(),
+            # httpx falls back to utf-8 for a missing or unknown charset.
+            response.encoding,
+            HTML_META_MAX_BYTES,
+        )
+    finally:
+        await response.aclose()
     return _dedupe_urls(matches)
 
 
+async def _scan_html_for_media_urls(
+    chunks: AsyncIterator[bytes],
+    encoding: str,
+    max_bytes: int,
+) -> list[str]:
+    """Find pbs media URLs in streamed HTML, stopping at </head> or after max_bytes.
+
+    Only a short tail of undecided text is kept between chunks, so URLs and the
+    closing tag are found even when they straddle a chunk boundary.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    urls: list[str] = []
+    buffer = ""
+    received = 0
+    truncated = False
+    async for chunk in chunks:
+        received += len(chunk)
+        buffer += decoder.decode(chunk)
+        head_end = _HEAD_END_RE.search(buffer)
+        if head_end is not None:
+            buffer = buffer[: head_end.start()]
+            break
+        if received >= max_bytes:
+            truncated = True
+            break
+
+        cutoff = len(buffer) - _SCAN_OVERLAP_CHARS
+        if cutoff <= 0:
+            continue
+        resume = cutoff
+        for match in _PBS_MEDIA_URL_RE.finditer(buffer):
+            if match.start() >= cutoff:
+                break
+            urls.append(match.group())
+            resume = max(resume, match.end())
+        buffer = buffer[resume:]
+    else:
+        buffer += decoder.decode(b"", final=True)
+
+    for match in _PBS_MEDIA_URL_RE.finditer(buffer):
+        # A match running into the end of a truncated read may be cut short.
+        if not (truncated and match.end() == len(buffer)):
+            urls.append(match.group())
+    return urls
+
+
 async def _extract_via_fxtwitter_api(tweet_id: str, client: httpx.AsyncClient) -> list[str]:
     """Best-effort extraction from fxtwitter public API JSON."""
     response = await _request_with_retries(
@@ -278,7 +595,7 @@ async def _extract_via_fxtwitter_api(tweet_id: str, client: httpx.AsyncClient) -
         return []
 
     try:
-        payload = response.json()
+        payload = fast_json.loads(response.content)
     except ValueError:
         return []
 
@@ -0,0 +1,202 @@
+"""Per-upstream rate limiting, circuit breaking and a shared retry budget."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+
+from models import RetryBudgetStatus, UpstreamsResponse, UpstreamStatus
+
+UPSTREAM_RATE_PER_SECOND = float(os.environ.get("UPSTREAM_RATE_PER_SECOND", "20"))
+UPSTREAM_BURST = float(os.environ.get("UPSTREAM_BURST", "40"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.environ.get("CIRCUIT_COOLDOWN_SECONDS", "30"))
+RETRY_BUDGET_RATIO = float(os.environ.get("RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MIN_PER_SECOND = float(os.environ.get("RETRY_BUDGET_MIN_PER_SECOND", "1"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Upstream {host} is unavailable; retrying in {retry_in:.1f}s.")
+        self.host = host
+        self.retry_in = retry_in
+
+
+@dataclass
+class TokenBucket:
+    """Rate limiter allowing `rate` requests per second with bursts up to `burst`."""
+
+    rate: float
+    burst: float
+    tokens: float = field(init=False)
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.burst
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+@dataclass
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one trial call through after a cooldown."""
+
+    failure_threshold: int
+    cooldown_seconds: float
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown_seconds:
+            return "open"
+        return "half_open"
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Free the trial slot of a call abandoned without an outcome, such as a cancelled one."""
+        self.trial_in_flight = False
+
+
+@dataclass
+class RetryBudget:
+    """Process-wide cap on retries as a fraction of first attempts.
+
+    Each first attempt deposits `ratio` of a retry and a floor of
+    `min_per_second` retries accrues over time; each retry withdraws one.
+    """
+
+    ratio: float
+    min_per_second: float
+    initial_balance: float = 10.0
+    max_balance: float = 100.0
+    balance: float = field(init=False)
+    updated_at: float = field(default_factory=time.monotonic)
+    retries_denied: int = 0
+
+    def __post_init__(self) -> None:
+        self.balance = self.initial_balance
+
+    def record_request(self) -> None:
+        self._accrue()
+        self.balance = min(self.max_balance, self.balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry if the budget allows it."""
+        self._accrue()
+        if self.balance >= 1:
+            self.balance -= 1
+            return True
+        self.retries_denied += 1
+        return False
+
+    def reset(self) -> None:
+        self.balance = self.initial_balance
+        self.retries_denied = 0
+        self.updated_at = time.monotonic()
+
+    def _accrue(self) -> None:
+        now = time.monotonic()
+        self.balance = min(self.max_balance, self.balance + (now - self.updated_at) * self.min_per_second)
+        self.updated_at = now
+
+
+@dataclass
+class UpstreamGuard:
+    """Rate limiter and circuit breaker for one upstream host."""
+
+    host: str
+    limiter: TokenBucket
+    breaker: CircuitBreaker
+
+
+_guards: dict[str, UpstreamGuard] = {}
+retry_budget = RetryBudget(ratio=RETRY_BUDGET_RATIO, min_per_second=RETRY_BUDGET_MIN_PER_SECOND)
+
+
+def get_upstream_guard(host: str) -> UpstreamGuard:
+    """Return the guard for host, creating it on first use."""
+    guard = _guards.get(host)
+    if guard is None:
+        guard = UpstreamGuard(
+            host=host,
+            limiter=TokenBucket(rate=UPSTREAM_RATE_PER_SECOND, burst=UPSTREAM_BURST),
+            breaker=CircuitBreaker(
+                failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                cooldown_seconds=CIRCUIT_COOLDOWN_SECONDS,
+            ),
+        )
+        _guards[host] = guard
+    return guard
+
+
+def reset_upstream_guards() -> None:
+    """Forget all per-host state and refill the retry budget."""
+    _guards.clear()
+    retry_budget.reset()
+
+
+def upstreams_snapshot() -> UpstreamsResponse:
+    """Current state of every guarded upstream and the retry budget."""
+    upstreams: dict[str, UpstreamStatus] = {}
+    for host, guard in sorted(_guards.items()):
+        guard.limiter._refill()
+        upstreams[host] = UpstreamStatus(
+            circuit_state=guard.breaker.state,
+            consecutive_failures=guard.breaker.consecutive_failures,
+            retry_in_seconds=round(guard.breaker.retry_in(), 3),
+            available_tokens=round(guard.limiter.tokens, 3),
+        )
+    retry_budget._accrue()
+    return UpstreamsResponse(
+        upstreams=upstreams,
+        retry_budget=RetryBudgetStatus(
+            balance=round(retry_budget.balance, 3),
+            retries_denied=retry_budget.retries_denied,
+        ),
+    )
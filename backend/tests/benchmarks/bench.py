@@ -0,0 +1,110 @@
+"""Timing and allocation measurement with baseline regression checks."""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Allowed growth over baseline before a benchmark fails, as a fraction.
+TIME_TOLERANCE = float(os.environ.get("BENCHMARK_TIME_TOLERANCE", "0.5"))
+ALLOCATION_TOLERANCE = float(os.environ.get("BENCHMARK_ALLOCATION_TOLERANCE", "0.2"))
+REPEATS = int(os.environ.get("BENCHMARK_REPEATS", "5"))
+UPDATE_BASELINE = os.environ.get("BENCHMARK_UPDATE_BASELINE") == "1"
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Best-of-N wall time, that time relative to the calibration loop, and peak allocations."""
+
+    seconds: float
+    relative_time: float
+    peak_kib: float
+
+
+def _calibration_workload() -> None:
+    parts = [str(index) for index in range(200_000)]
+    "|".join(parts).split("|")
+
+
+def best_time(func: Callable[[], Any], repeats: int = REPEATS) -> float:
+    """Fastest of `repeats` timed calls, with GC disabled while timing."""
+    timings: list[float] = []
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+_calibration_seconds: float | None = None
+
+
+def calibration_seconds() -> float:
+    """Time of a fixed pure-Python workload, used to normalise results across machines."""
+    global _calibration_seconds
+    if _calibration_seconds is None:
+        _calibration_seconds = best_time(_calibration_workload)
+    return _calibration_seconds
+
+
+def measure(func: Callable[[], Any]) -> Measurement:
+    """Time func and record its peak traced allocation."""
+    seconds = best_time(func)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(
+        seconds=seconds,
+        relative_time=seconds / calibration_seconds(),
+        peak_kib=peak / 1024,
+    )
+
+
+def check_regression(name: str, measurement: Measurement) -> None:
+    """Fail when measurement exceeds the stored baseline beyond the tolerances.
+
+    With BENCHMARK_UPDATE_BASELINE=1 the baseline is rewritten instead.
+    """
+    baselines = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    print(f"{name}: {measurement.seconds * 1000:.2f}ms ({measurement.relative_time:.3f}x calibration), "
+          f"peak {measurement.peak_kib:.0f} KiB")
+
+    if UPDATE_BASELINE:
+        baselines[name] = {
+            "relative_time": round(measurement.relative_time, 4),
+            "peak_kib": round(measurement.peak_kib, 1),
+        }
+        BASELINE_PATH.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+        return
+
+    baseline = baselines.get(name)
+    assert baseline is not None, f"No baseline for {name}; run with BENCHMARK_UPDATE_BASELINE=1"
+
+    time_limit = baseline["relative_time"] * (1 + TIME_TOLERANCE)
+    assert measurement.relative_time <= time_limit, (
+        f"{name} regressed: {measurement.relative_time:.3f}x calibration exceeds "
+        f"baseline {baseline['relative_time']:.3f}x by more than {TIME_TOLERANCE:.0%}"
+    )
+    allocation_limit = baseline["peak_kib"] * (1 + ALLOCATION_TOLERANCE)
+    assert measurement.peak_kib <= allocation_limit, (
+        f"{name} regressed: peak {measurement.peak_kib:.0f} KiB exceeds "
+        f"baseline {baseline['peak_kib']:.0f} KiB by more than {ALLOCATION_TOLERANCE:.0%}"
+    )
@@ -0,0 +1,38 @@
+"""Streaming HTML meta scan over a tweet page with a large body."""
+
+import asyncio
+import re
+
+from bench import check_regression, measure
+
+from services.tweet_media import HTML_META_MAX_BYTES, _scan_html_for_media_urls
+
+HEAD = (
+    "<html><head>"
+    + "".join(f'<meta property="og:image" content="https://pbs.twimg.com/media/IMG{index}.jpg">' for index in range(4))
+    + "<script>" + "var state = {};" * 2000 + "</script></head>"
+).encode()
+PAGE = HEAD + ("<body>" + "<div>reply text</div>" * 20000 + "</body></html>").encode()
+
+
+async def _chunks(data: bytes, size: int = 16384):  # noqa: ANN202
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def test_html_meta_scan() -> None:
+    loop = asyncio.new_event_loop()
+
+    def scan() -> list[str]:
+        return loop.run_until_complete(_scan_html_for_media_urls(_chunks(PAGE), "utf-8", HTML_META_MAX_BYTES))
+
+    def buffer_whole_page() -> list[str]:
+        return re.findall(r"https://pbs\.twimg\.com/media/[A-Za-z0-9_\-]+(?:\?[^\"'\s<>]+)?", PAGE.decode())
+
+    try:
+        assert scan() == buffer_whole_page()[:4]
+        whole_page = measure(buffer_whole_page)
+        print(f"whole-page findall: {whole_page.seconds * 1000:.2f}ms, peak {whole_page.peak_kib:.0f} KiB")
+        check_regression("html_meta_scan", measure(lambda: [scan() for _ in range(20)]))
+    finally:
+        loop.close()
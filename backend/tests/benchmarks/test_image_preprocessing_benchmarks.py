@@ -0,0 +1,56 @@
+"""Upload size versus preprocessing time for the image budgets in image_preprocessing.
+
+Requires Pillow; run with -s to see the tradeoff table. Table accuracy is not measured
+here: compare parsed tables across budgets with the load harness against real LlamaCloud.
+"""
+
+import io
+
+import pytest
+from bench import best_time
+
+from services.image_preprocessing import optimize_image_bytes
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _table_chart(width: int, height: int, image_format: str) -> bytes:
+    """Render a dense grid of numbers resembling a screenshot of a financial table."""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    row_height, column_width = 28, 160
+    for row, top in enumerate(range(0, height, row_height)):
+        draw.line([(0, top), (width, top)], fill=(200, 200, 200))
+        for column, left in enumerate(range(0, width, column_width)):
+            draw.text((left + 6, top + 8), f"{(row * 7919 + column * 104729) % 1_000_000:,}", fill="black")
+    for left in range(0, width, column_width):
+        draw.line([(left, 0), (left, height)], fill=(200, 200, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("image_format", ["PNG", "JPEG"])
+def test_preprocessing_tradeoff(image_format: str) -> None:
+    original = _table_chart(4096, 2730, image_format)
+    budgets = [
+        ("pixels<=4MP", 4_000_000, 0),
+        ("pixels<=2MP", 2_000_000, 0),
+        ("pixels<=1MP", 1_000_000, 0),
+        ("bytes<=512KiB", 0, 512 * 1024),
+    ]
+
+    print(f"\n{image_format} original: {len(original) / 1024:.0f} KiB")
+    for label, max_pixels, max_bytes in budgets:
+        optimized = optimize_image_bytes(original, max_pixels=max_pixels, max_bytes=max_bytes)
+        seconds = best_time(lambda: optimize_image_bytes(original, max_pixels=max_pixels, max_bytes=max_bytes), 3)
+        size = Image.open(io.BytesIO(optimized)).size
+        print(
+            f"  {label:>14}: {len(optimized) / 1024:7.0f} KiB ({len(optimized) / len(original):.0%}), "
+            f"{size[0]}x{size[1]}, {seconds * 1000:.0f}ms"
+        )
+        if max_pixels:
+            assert size[0] * size[1] <= max_pixels
+        else:
+            assert len(optimized) <= len(original)
@@ -0,0 +1,64 @@
+"""Serialization cost of a large ParseTweetResponse and decoding cost of upstream payloads.
+
+"stdlib" is the path FastAPI versions without pydantic-core response serialization take
+(jsonable_encoder plus json.dumps); "pydantic" is FastAPI's own fast path when no response
+class is configured; "fast_json" is FastJSONResponse as installed by main.py with orjson.
+"""
+
+import json
+
+import pytest
+from bench import check_regression, measure
+from fastapi.encoders import jsonable_encoder
+from workloads import media_urls, parsed_results
+
+from models import MediaExtractionSource, ParseTweetResponse, TableFormat
+from services import fast_json
+from services.fast_json import FastJSONResponse
+from services.llamacloud_parser import build_combined_markdown
+
+pytest.importorskip("orjson")
+
+RESULTS = parsed_results(images=4, row_count=300, column_count=10, table_format=TableFormat.markdown)
+RESPONSE = ParseTweetResponse(
+    tweet_id="1",
+    normalized_tweet_url="https://x.com/user/status/1",
+    source=MediaExtractionSource.syndication,
+    results=RESULTS,
+    combined_markdown=build_combined_markdown(RESULTS),
+)
+SYNDICATION_PAYLOAD = json.dumps(
+    {
+        "mediaDetails": [{"type": "photo", "media_url_https": url} for url in media_urls(200)],
+        "text": "chart " * 2000,
+        "user": {"name": "user", "entities": {"description": {"urls": []}}},
+    }
+).encode()
+
+
+def _stdlib_response() -> bytes:
+    return json.dumps(jsonable_encoder(RESPONSE), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_response_serialization() -> None:
+    stdlib = measure(_stdlib_response)
+    pydantic = measure(RESPONSE.model_dump_json)
+    print(
+        f"{len(_stdlib_response()) / 1024:.0f} KiB response; stdlib {stdlib.seconds * 1000:.2f}ms, "
+        f"pydantic {pydantic.seconds * 1000:.2f}ms"
+    )
+
+    check_regression(
+        "json_response_fast_json",
+        measure(lambda: FastJSONResponse(RESPONSE.model_dump(mode="json")).body),
+    )
+
+
+def test_upstream_payload_decoding() -> None:
+    stdlib = measure(lambda: [json.loads(SYNDICATION_PAYLOAD) for _ in range(20)])
+    print(f"20x {len(SYNDICATION_PAYLOAD) / 1024:.0f} KiB payload; stdlib {stdlib.seconds * 1000:.2f}ms")
+
+    check_regression(
+        "json_decode_fast_json",
+        measure(lambda: [fast_json.loads(SYNDICATION_PAYLOAD) for _ in range(20)]),
+    )
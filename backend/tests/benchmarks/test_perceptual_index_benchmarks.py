@@ -0,0 +1,47 @@
+"""Nearest-neighbour lookups in the perceptual hash index as it grows.
+
+Set BENCHMARK_PERCEPTUAL_INDEX_SIZE (e.g. 2000000) to check lookup time at production scale;
+the baseline is recorded at the default size.
+"""
+
+import os
+import random
+
+import pytest
+from bench import check_regression, measure
+
+from services.perceptual_hash import PerceptualHashIndex
+
+INDEX_SIZE = int(os.environ.get("BENCHMARK_PERCEPTUAL_INDEX_SIZE", "200000"))
+
+
+@pytest.fixture(scope="module")
+def populated_index() -> tuple[PerceptualHashIndex[int], list[int]]:
+    rng = random.Random(0)
+    index: PerceptualHashIndex[int] = PerceptualHashIndex(max_entries=INDEX_SIZE)
+    hashes = [rng.getrandbits(64) for _ in range(INDEX_SIZE)]
+    for position, value_hash in enumerate(hashes):
+        index.add("agentic|1", value_hash, position)
+    return index, hashes
+
+
+@pytest.mark.parametrize("max_distance", [4, 7])
+def test_perceptual_index_nearest(
+    populated_index: tuple[PerceptualHashIndex[int], list[int]],
+    max_distance: int,
+) -> None:
+    index, hashes = populated_index
+    rng = random.Random(max_distance)
+    queries = []
+    for _ in range(250):
+        query = rng.choice(hashes)
+        for bit in rng.sample(range(64), max_distance):
+            query ^= 1 << bit
+        queries.append(query)
+    queries.extend(rng.getrandbits(64) for _ in range(250))
+
+    def lookup_all() -> list:
+        return [index.nearest("agentic|1", query, max_distance) for query in queries]
+
+    assert sum(found is not None for found in lookup_all()) >= 250
+    check_regression(f"perceptual_index_nearest_d{max_distance}", measure(lookup_all))
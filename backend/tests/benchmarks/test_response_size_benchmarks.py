@@ -0,0 +1,44 @@
+"""Egress size of a 4-image parse response per `include` selection, raw and compressed."""
+
+import zlib
+
+import pytest
+from bench import check_regression, measure
+from workloads import parsed_results
+
+from models import MediaExtractionSource, ResponseInclude
+from services.fast_json import dumps
+from services.parse_pipeline import build_parse_response
+from services.tweet_media import ExtractedTweetMedia
+
+RESULTS = parsed_results(images=4, row_count=300, column_count=10)
+EXTRACTED = ExtractedTweetMedia(
+    tweet_id="1",
+    normalized_tweet_url="https://x.com/user/status/1",
+    image_urls=[str(result.image_url) for result in RESULTS],
+    source=MediaExtractionSource.syndication,
+    warnings=[],
+)
+
+
+def _gzip(body: bytes) -> bytes:
+    compressor = zlib.compressobj(4, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+@pytest.mark.parametrize("include", list(ResponseInclude))
+def test_response_size(include: ResponseInclude) -> None:
+    body = dumps(build_parse_response(EXTRACTED, RESULTS, include=include).model_dump(mode="json"))
+    full = dumps(build_parse_response(EXTRACTED, RESULTS).model_dump(mode="json"))
+    print(f"include={include.value}: {len(body) / 1024:.0f} KiB raw, {len(_gzip(body)) / 1024:.0f} KiB gzip")
+
+    assert len(body) <= len(full)
+    if include is not ResponseInclude.all:
+        assert len(body) < len(full) * 0.7
+
+
+def test_gzip_parse_response() -> None:
+    body = dumps(build_parse_response(EXTRACTED, RESULTS).model_dump(mode="json"))
+
+    assert len(_gzip(body)) < len(body) // 2
+    check_regression("gzip_parse_response", measure(lambda: _gzip(body)))
@@ -0,0 +1,101 @@
+"""Microbenchmarks for the per-request transformation functions.
+
+Each benchmark fails when it runs slower or allocates more than tests/benchmarks/baseline.json
+allows (see bench.py for tolerances). After an intentional change, refresh the baseline with
+
+    BENCHMARK_UPDATE_BASELINE=1 python -m pytest -m benchmark tests/benchmarks -s
+"""
+
+import pytest
+from bench import check_regression, measure
+from workloads import media_urls, mixed_rows, parse_result, parsed_results, tweet_urls
+
+from models import TableFormat, TableResult
+from services.llamacloud_parser import _normalize_rows, build_combined_markdown, extract_tables
+from services.table_formats import format_results, render_csv, rows_to_columns, render_markdown
+from services.tier_cascade import quality_issue
+from services.tweet_media import _dedupe_urls
+from services.tweet_urls import parse_tweet_url
+
+
+@pytest.mark.parametrize(
+    ("name", "pages", "tables_per_page", "rows", "columns"),
+    [
+        ("extract_tables_many_pages", 40, 3, 50, 8),
+        ("extract_tables_tall", 1, 1, 5000, 6),
+        ("extract_tables_wide", 2, 1, 200, 120),
+    ],
+)
+def test_extract_tables(name: str, pages: int, tables_per_page: int, rows: int, columns: int) -> None:
+    result = parse_result(pages=pages, tables_per_page=tables_per_page, row_count=rows, column_count=columns)
+
+    tables = extract_tables(result)
+
+    assert len(tables) == pages * tables_per_page
+    check_regression(name, measure(lambda: extract_tables(result)))
+
+
+def test_normalize_rows() -> None:
+    rows = mixed_rows(row_count=5000, column_count=12)
+
+    assert len(_normalize_rows(rows)) == 1 + 5000 * 3 // 4
+    check_regression("normalize_rows", measure(lambda: _normalize_rows(rows)))
+
+
+def test_rows_to_markdown() -> None:
+    rows = _normalize_rows(mixed_rows(row_count=5000, column_count=12))
+    table = TableResult(page_number=1, row_count=len(rows), column_count=12, columns=rows_to_columns(rows))
+
+    assert render_markdown(table).count("\n") == len(rows)
+    check_regression("rows_to_markdown", measure(lambda: render_markdown(table)))
+
+
+def test_render_csv() -> None:
+    rows = _normalize_rows(mixed_rows(row_count=5000, column_count=12))
+    table = TableResult(page_number=1, row_count=len(rows), column_count=12, columns=rows_to_columns(rows))
+
+    assert render_csv(table).startswith("Column 0,")
+    check_regression("render_csv", measure(lambda: render_csv(table)))
+
+
+@pytest.mark.parametrize("table_format", list(TableFormat))
+def test_format_results(table_format: TableFormat) -> None:
+    if table_format is TableFormat.arrow:
+        pytest.importorskip("pyarrow")
+    results = parsed_results(images=20, row_count=300, column_count=10)
+
+    formatted = format_results(results, table_format)
+
+    assert all(table.columns is None for table in formatted[0].tables) == (table_format is not TableFormat.json)
+    check_regression(f"format_results_{table_format.value}", measure(lambda: format_results(results, table_format)))
+
+
+def test_quality_issue() -> None:
+    results = parsed_results(images=20, row_count=300, column_count=10)
+
+    assert {quality_issue(result) for result in results} == {None, "failed"}
+    check_regression("quality_issue", measure(lambda: [quality_issue(result) for result in results]))
+
+
+def test_build_combined_markdown() -> None:
+    results = parsed_results(images=200, row_count=300, column_count=10, table_format=TableFormat.markdown)
+
+    assert build_combined_markdown(results).count("## Image ") == 160
+    check_regression("build_combined_markdown", measure(lambda: build_combined_markdown(results)))
+
+
+def test_parse_tweet_url() -> None:
+    urls = tweet_urls(5000)
+
+    def parse_all() -> list:
+        return [parse_tweet_url(url) for url in urls]
+
+    assert all(info.normalized_url.startswith("https://x.com/") for info in parse_all())
+    check_regression("parse_tweet_url", measure(parse_all))
+
+
+def test_dedupe_urls() -> None:
+    urls = media_urls(20000)
+
+    assert len(_dedupe_urls(urls)) < len(urls)
+    check_regression("dedupe_urls", measure(lambda: _dedupe_urls(urls)))
@@ -0,0 +1,114 @@
+"""Synthetic inputs sized like agentic parses of dense financial tables."""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from typing import Any
+
+from models import ParsedImageResult, TableFormat
+from services.llamacloud_parser import extract_tables
+from services.table_formats import format_table
+
+
+class ObjectRow:
+    """Row exposing cells as an attribute, like SDK item rows."""
+
+    def __init__(self, cells: list[Any]) -> None:
+        self.cells = cells
+
+
+def mixed_rows(row_count: int, column_count: int, seed: int = 0) -> list[Any]:
+    """Rows in every shape _normalize_rows accepts, with ragged widths and messy cells."""
+    rng = random.Random(seed)
+    rows: list[Any] = [[f"  Column {column}\n" for column in range(column_count)]]
+    for index in range(row_count):
+        width = column_count - (index % 3)
+        cells: list[Any] = [
+            rng.choice([f" {rng.uniform(-1e6, 1e6):,.2f} ", rng.randint(0, 10**9), f"Line\n{index}", None])
+            for _ in range(width)
+        ]
+        shape = index % 4
+        if shape == 0:
+            rows.append(cells)
+        elif shape == 1:
+            rows.append({"cells": cells})
+        elif shape == 2:
+            rows.append(ObjectRow(cells))
+        else:
+            rows.append([])
+    return rows
+
+
+def parse_result(pages: int, tables_per_page: int, row_count: int, column_count: int) -> SimpleNamespace:
+    """LlamaCloud-shaped parse result with markdown pages and table items."""
+    return SimpleNamespace(
+        markdown=SimpleNamespace(
+            pages=[SimpleNamespace(markdown=f"# Page {page}\n\nSummary") for page in range(pages)],
+        ),
+        items=SimpleNamespace(
+            pages=[
+                SimpleNamespace(
+                    page_number=page + 1,
+                    items=[
+                        SimpleNamespace(
+                            rows=mixed_rows(row_count, column_count, seed=page * tables_per_page + table),
+                            b_box=[0, 0, 100, 100],
+                        )
+                        for table in range(tables_per_page)
+                    ]
+                    + [SimpleNamespace(rows=None), SimpleNamespace(text="paragraph")],
+                )
+                for page in range(pages)
+            ]
+        ),
+    )
+
+
+def parsed_results(
+    images: int,
+    row_count: int,
+    column_count: int,
+    table_format: TableFormat | None = None,
+) -> list[ParsedImageResult]:
+    """Successful and failed image results carrying large tables, as parsed or as formatted for a response."""
+    tables = extract_tables(parse_result(pages=2, tables_per_page=2, row_count=row_count, column_count=column_count))
+    if table_format is not None:
+        tables = [format_table(table, table_format) for table in tables]
+    results: list[ParsedImageResult] = []
+    for index in range(images):
+        results.append(
+            ParsedImageResult(
+                image_url=f"https://pbs.twimg.com/media/{index}.jpg",
+                filename=f"{index}.jpg",
+                success=index % 5 != 4,
+                markdown=f"Chart {index}\n\n" + "Lorem ipsum dolor sit amet. " * 200,
+                tables=tables,
+                error=None if index % 5 != 4 else "parse failed",
+            )
+        )
+    return results
+
+
+def tweet_urls(count: int) -> list[str]:
+    """Tweet URLs across the accepted host, scheme and suffix variants."""
+    variants = [
+        "https://x.com/user_{0}/status/{1}",
+        "http://www.twitter.com/User{0}/status/{1}/photo/1",
+        "  https://twitter.com/u{0}/status/{1}?s=20  ",
+        "https://WWW.X.COM/user{0}/status/{1}/",
+    ]
+    return [variants[index % len(variants)].format(index, 10**18 + index) for index in range(count)]
+
+
+def media_urls(count: int, duplicate_every: int = 3) -> list[str]:
+    """pbs URLs with periodic duplicates and blanks, as collected across extractors."""
+    urls: list[str] = []
+    for index in range(count):
+        if index % 17 == 0:
+            urls.append("")
+        elif index % duplicate_every == 0:
+            urls.append(f"https://pbs.twimg.com/media/{index // duplicate_every}.jpg?name=orig")
+        else:
+            urls.append(f"https://pbs.twimg.com/media/{index}.jpg?name=orig")
+    return urls
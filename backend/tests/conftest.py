@@ -1,6 +1,103 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):  # noqa: ANN001
+    """Mark benchmark and load tests by directory so pytest.ini can leave them out by default."""
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(pytest.mark.benchmark)
+        elif "load" in item.path.parts:
+            item.add_marker(pytest.mark.load)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_job_store(tmp_path, monkeypatch):  # noqa: ANN001
+    monkeypatch.setenv("JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+
+
+@pytest.fixture(autouse=True)
+def _accept_llama_keys(monkeypatch):  # noqa: ANN001
+    """Keep route tests off the network; key validation tests inject their own transport."""
+    from api import dependencies
+    from services.llamacloud_keys import KeyValidation
+
+    async def accept(api_key: str, client=None):  # noqa: ANN001
+        return KeyValidation(status_code=200)
+
+    monkeypatch.setattr(dependencies, "check_llama_key", accept)
+
+
+@pytest.fixture(autouse=True)
+def _reset_service_caches():
+    from services.llamacloud_keys import key_validation_cache
+    from services.llamacloud_parser import parse_result_cache
+    from services.perceptual_hash import perceptual_index
+    from services.tweet_media import media_cache
+    from services.upstreams import reset_upstream_guards
+
+    caches = [parse_result_cache, media_cache, key_validation_cache, perceptual_index]
+    for cache in caches:
+        cache.clear()
+    reset_upstream_guards()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+class FakeAsyncLlamaCloud:
+    """Stand-in for llama_cloud.AsyncLlamaCloud that records uploads and parses."""
+
+    uploads: list = []
+    parse_calls: list = []
+
+    def __init__(self, api_key: str, **kwargs) -> None:  # noqa: ANN003
+        from types import SimpleNamespace
+
+        self.api_key = api_key
+        self.closed = False
+        self.files = SimpleNamespace(create=self._create)
+        self.parsing = SimpleNamespace(parse=self._parse)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def _create(self, file, purpose):  # noqa: ANN001
+        from types import SimpleNamespace
+
+        FakeAsyncLlamaCloud.uploads.append(file)
+        return SimpleNamespace(id=f"file-{len(FakeAsyncLlamaCloud.uploads)}")
+
+    async def _parse(self, **kwargs):  # noqa: ANN003
+        from types import SimpleNamespace
+
+        FakeAsyncLlamaCloud.parse_calls.append(kwargs)
+        return SimpleNamespace(
+            markdown=SimpleNamespace(pages=[SimpleNamespace(markdown="chart")]),
+            items=SimpleNamespace(pages=[]),
+        )
+
+
+@pytest.fixture
+def fake_llama_cloud(monkeypatch):  # noqa: ANN001
+    import llama_cloud
+
+    from services import llamacloud_parser
+    from services.llamacloud_clients import LlamaCloudClientPool
+
+    FakeAsyncLlamaCloud.uploads = []
+    FakeAsyncLlamaCloud.parse_calls = []
+    monkeypatch.setattr(llama_cloud, "AsyncLlamaCloud", FakeAsyncLlamaCloud)
+    monkeypatch.setattr(
+        llamacloud_parser,
+        "llamacloud_client_pool",
+        LlamaCloudClientPool(max_clients=4, idle_seconds=60),
+    )
+    return FakeAsyncLlamaCloud
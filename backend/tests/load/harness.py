@@ -0,0 +1,169 @@
+"""Load generator driving the FastAPI app in-process and summarising throughput."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from services.http_clients import HttpClientRegistry
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    """Throughput and latency summary for one load run."""
+
+    name: str
+    path: str
+    requests: int
+    concurrency: int
+    status_counts: dict[int, int]
+    duration_seconds: float
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_rss_growth_mib: float
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.requests} x {self.path} @ c={self.concurrency} "
+            f"{self.requests_per_second:.1f} req/s, p50={self.p50_ms:.1f}ms p95={self.p95_ms:.1f}ms "
+            f"p99={self.p99_ms:.1f}ms, peak RSS +{self.peak_rss_growth_mib:.1f} MiB, statuses {self.status_counts}"
+        )
+
+
+@asynccontextmanager
+async def wired_app(app: FastAPI, transport: httpx.AsyncBaseTransport) -> AsyncIterator[FastAPI]:
+    """Point the app's pooled upstream clients at transport for the duration of the block."""
+    clients = HttpClientRegistry(
+        extraction=httpx.AsyncClient(transport=transport),
+        media=httpx.AsyncClient(transport=transport),
+        llamacloud=httpx.AsyncClient(transport=transport),
+    )
+    app.state.http_clients = clients
+    try:
+        yield app
+    finally:
+        del app.state.http_clients
+        await clients.aclose()
+
+
+async def run_load(
+    app: FastAPI,
+    name: str,
+    path: str,
+    payload_for: Callable[[int], dict[str, Any]],
+    requests: int,
+    concurrency: int,
+) -> LoadResult:
+    """POST `requests` payloads to path with `concurrency` workers and summarise the run."""
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    next_index = iter(range(requests))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client:
+
+        async def worker() -> None:
+            for index in next_index:
+                start = time.perf_counter()
+                response = await client.post(path, json=payload_for(index))
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] += 1
+
+        rss = _RssSampler()
+        sampling = asyncio.create_task(rss.sample_until_cancelled())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            duration = time.perf_counter() - started
+            sampling.cancel()
+            await asyncio.gather(sampling, return_exceptions=True)
+
+    latencies.sort()
+    result = LoadResult(
+        name=name,
+        path=path,
+        requests=requests,
+        concurrency=concurrency,
+        status_counts=dict(sorted(statuses.items())),
+        duration_seconds=round(duration, 4),
+        requests_per_second=round(requests / duration, 2) if duration else 0.0,
+        p50_ms=round(_percentile(latencies, 50), 2),
+        p95_ms=round(_percentile(latencies, 95), 2),
+        p99_ms=round(_percentile(latencies, 99), 2),
+        peak_rss_growth_mib=round(rss.peak_growth_mib(), 1),
+    )
+    _write_result(result)
+    return result
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class _RssSampler:
+    """Peak resident set size growth over the baseline taken when the sampler is created.
+
+    ru_maxrss is a whole-process high-water mark that never goes down, so it would credit
+    every scenario with the peak of the heaviest one before it. Where /proc is available the
+    current RSS is sampled while the scenario runs instead; elsewhere only growth of
+    ru_maxrss past its value at the start of the scenario is counted, a lower bound.
+    """
+
+    interval_seconds = 0.005
+
+    def __init__(self) -> None:
+        self.baseline = _current_rss_bytes()
+        self.peak = self.baseline
+
+    def sample(self) -> None:
+        self.peak = max(self.peak, _current_rss_bytes())
+
+    async def sample_until_cancelled(self) -> None:
+        try:
+            while True:
+                self.sample()
+                await asyncio.sleep(self.interval_seconds)
+        finally:
+            self.sample()
+
+    def peak_growth_mib(self) -> float:
+        return (self.peak - self.baseline) / (1024 * 1024)
+
+
+def _current_rss_bytes() -> int:
+    """Current resident set size, or the peak so far where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _write_result(result: LoadResult) -> None:
+    """Save the result as JSON under LOAD_TEST_RESULTS_DIR, when set, for comparison across commits."""
+    directory = os.environ.get("LOAD_TEST_RESULTS_DIR")
+    if not directory:
+        return
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    (Path(directory) / f"{result.name}.json").write_text(json.dumps(asdict(result), indent=2))
@@ -0,0 +1,174 @@
+"""Local stand-ins for every upstream the backend calls, for load testing.
+
+HTTP upstreams are served in-process by an httpx transport routed on host name, so
+the pooled clients in `app.state.http_clients` can point at them unchanged. The
+LlamaCloud files and parse APIs are stood in at the SDK boundary, matching the
+AsyncLlamaCloud surface that `parse_image_bytes` uses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+
+# Host name to stand-in name; the tweet HTML page is served for x.com and twitter.com.
+HOSTS = {
+    "api.x.com": "x_api",
+    "cdn.syndication.twimg.com": "syndication",
+    "api.fxtwitter.com": "fxtwitter",
+    "x.com": "tweet_html",
+    "twitter.com": "tweet_html",
+    "pbs.twimg.com": "pbs",
+    "api.cloud.llamaindex.ai": "llamacloud_api",
+}
+
+# Share of the configured pbs payload served for each size variant (`name=` query parameter).
+PBS_VARIANT_SCALE = {"orig": 1.0, "large": 0.5, "medium": 0.2, "small": 0.08}
+
+STAND_IN_NAMES = (
+    "x_api",
+    "syndication",
+    "fxtwitter",
+    "tweet_html",
+    "pbs",
+    "llamacloud_api",
+    "llamacloud_files",
+    "llamacloud_parse",
+)
+
+
+@dataclass(frozen=True)
+class StandInConfig:
+    """Behaviour of one stand-in upstream."""
+
+    latency_seconds: float = 0.0
+    jitter_seconds: float = 0.0
+    error_rate: float = 0.0
+    payload_bytes: int = 0
+
+
+class UpstreamStandIns(httpx.AsyncBaseTransport):
+    """Serve every upstream with configurable latency, payload size and error rate.
+
+    Errors are 503 responses for HTTP stand-ins and raised exceptions for the
+    LlamaCloud SDK stand-in. Each tweet has `images_per_tweet` photos whose bytes
+    are unique per URL, so parse-cache behaviour follows the tweet ids requested.
+    """
+
+    def __init__(
+        self,
+        configs: dict[str, StandInConfig] | None = None,
+        images_per_tweet: int = 2,
+        table_rows: int = 20,
+        seed: int = 0,
+    ) -> None:
+        unknown = set(configs or {}) - set(STAND_IN_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown stand-ins: {sorted(unknown)}")
+        self.configs = {name: (configs or {}).get(name, StandInConfig()) for name in STAND_IN_NAMES}
+        self.images_per_tweet = images_per_tweet
+        self.table_rows = table_rows
+        self.request_counts: Counter[str] = Counter()
+        self.uploaded_bytes = 0
+        self._random = random.Random(seed)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        name = HOSTS.get(request.url.host)
+        if name is None:
+            raise httpx.ConnectError(f"No stand-in for {request.url.host}", request=request)
+        if await self._simulate(name):
+            return httpx.Response(503, request=request)
+
+        config = self.configs[name]
+        if name == "pbs":
+            scale = PBS_VARIANT_SCALE.get(request.url.params.get("name", "orig"), 1.0)
+            body = request.url.path.encode() + b"\0" * int(config.payload_bytes * scale)
+            return httpx.Response(200, content=body, headers={"Content-Type": "image/jpeg"}, request=request)
+        if name == "tweet_html":
+            return httpx.Response(200, text=self._tweet_html(request, config), request=request)
+        if name == "llamacloud_api":
+            return httpx.Response(200, json=[{"id": "project-1"}], request=request)
+        return httpx.Response(200, content=self._json_payload(name, request, config), request=request)
+
+    def llamacloud_client(self, api_key: str) -> Any:
+        """Factory for LlamaCloudClientPool returning an SDK-shaped stand-in."""
+        return _StandInLlamaCloud(self, api_key)
+
+    async def _simulate(self, name: str) -> bool:
+        """Count the call, sleep for its latency and report whether it should fail."""
+        config = self.configs[name]
+        self.request_counts[name] += 1
+        delay = config.latency_seconds + self._random.uniform(0, config.jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._random.random() < config.error_rate
+
+    def _image_urls(self, tweet_id: str) -> list[str]:
+        return [f"https://pbs.twimg.com/media/{tweet_id}_{index}.jpg" for index in range(self.images_per_tweet)]
+
+    def _json_payload(self, name: str, request: httpx.Request, config: StandInConfig) -> bytes:
+        if name == "x_api":
+            tweet_id = request.url.path.rsplit("/", 1)[-1]
+            payload: dict[str, Any] = {
+                "data": {"id": tweet_id},
+                "includes": {"media": [{"type": "photo", "url": url} for url in self._image_urls(tweet_id)]},
+            }
+        elif name == "syndication":
+            tweet_id = request.url.params.get("id", "")
+            payload = {
+                "id_str": tweet_id,
+                "mediaDetails": [{"type": "photo", "media_url_https": url} for url in self._image_urls(tweet_id)],
+            }
+        else:
+            tweet_id = request.url.path.rsplit("/", 1)[-1]
+            payload = {
+                "tweet": {"id": tweet_id, "media": {"photos": [{"url": url} for url in self._image_urls(tweet_id)]}},
+            }
+        payload["padding"] = "x" * config.payload_bytes
+        return json.dumps(payload).encode()
+
+    def _tweet_html(self, request: httpx.Request, config: StandInConfig) -> str:
+        tweet_id = request.url.path.rsplit("/", 1)[-1]
+        meta = "".join(f'<meta property="og:image" content="{url}">' for url in self._image_urls(tweet_id))
+        filler = "<p>" + "x" * config.payload_bytes + "</p>"
+        return f"<html><head>{meta}</head><body>{filler}</body></html>"
+
+
+class _StandInLlamaCloud:
+    """AsyncLlamaCloud look-alike backed by the llamacloud_files and llamacloud_parse stand-ins."""
+
+    def __init__(self, standins: UpstreamStandIns, api_key: str) -> None:
+        self.api_key = api_key
+        self._standins = standins
+        self._uploads = 0
+        self.files = SimpleNamespace(create=self._create)
+        self.parsing = SimpleNamespace(parse=self._parse)
+
+    async def close(self) -> None:
+        return None
+
+    async def _create(self, file: tuple[str, bytes, str], purpose: str) -> SimpleNamespace:
+        if await self._standins._simulate("llamacloud_files"):
+            raise RuntimeError("LlamaCloud files stand-in returned 503")
+        self._uploads += 1
+        self._standins.uploaded_bytes += len(file[1])
+        return SimpleNamespace(id=f"file-{self._uploads}")
+
+    async def _parse(self, **kwargs: Any) -> SimpleNamespace:
+        if await self._standins._simulate("llamacloud_parse"):
+            raise RuntimeError("LlamaCloud parse stand-in returned 503")
+        padding = "x" * self._standins.configs["llamacloud_parse"].payload_bytes
+        rows = [["Quarter", "Revenue", "Margin"]] + [
+            [f"Q{index % 4 + 1}", str(index * 10), f"{index % 50}%"] for index in range(self._standins.table_rows)
+        ]
+        return SimpleNamespace(
+            markdown=SimpleNamespace(pages=[SimpleNamespace(markdown=f"# Chart {kwargs['file_id']}\n\n{padding}")]),
+            items=SimpleNamespace(pages=[SimpleNamespace(page_number=1, items=[SimpleNamespace(rows=rows)])]),
+        )
@@ -0,0 +1,141 @@
+"""Load tests against local upstream stand-ins.
+
+Scale a run with LOAD_TEST_REQUESTS, LOAD_TEST_CONCURRENCY and LOAD_TEST_LATENCY_SECONDS,
+and set LOAD_TEST_RESULTS_DIR to keep a JSON summary per scenario, e.g.
+
+    LOAD_TEST_REQUESTS=2000 LOAD_TEST_CONCURRENCY=64 LOAD_TEST_RESULTS_DIR=load-results \
+        python -m pytest -m load tests/load -s
+"""
+
+import os
+
+import pytest
+from harness import run_load, wired_app
+from standins import PBS_VARIANT_SCALE, StandInConfig, UpstreamStandIns
+
+from main import app
+
+REQUESTS = int(os.environ.get("LOAD_TEST_REQUESTS", "40"))
+CONCURRENCY = int(os.environ.get("LOAD_TEST_CONCURRENCY", "8"))
+LATENCY_SECONDS = float(os.environ.get("LOAD_TEST_LATENCY_SECONDS", "0.002"))
+PBS_PAYLOAD_BYTES = 256 * 1024
+
+
+@pytest.fixture
+def standins(monkeypatch: pytest.MonkeyPatch) -> UpstreamStandIns:
+    from api import dependencies
+    from services import llamacloud_keys, llamacloud_parser, upstreams
+    from services.llamacloud_clients import LlamaCloudClientPool
+
+    latency = StandInConfig(latency_seconds=LATENCY_SECONDS, jitter_seconds=LATENCY_SECONDS)
+    standins = UpstreamStandIns(
+        configs={
+            "syndication": latency,
+            "fxtwitter": latency,
+            "tweet_html": StandInConfig(latency_seconds=LATENCY_SECONDS, payload_bytes=64 * 1024),
+            "pbs": StandInConfig(latency_seconds=LATENCY_SECONDS, payload_bytes=PBS_PAYLOAD_BYTES),
+            "llamacloud_api": latency,
+            "llamacloud_files": latency,
+            "llamacloud_parse": StandInConfig(latency_seconds=LATENCY_SECONDS * 5, jitter_seconds=LATENCY_SECONDS),
+        },
+    )
+    # Measure the service rather than the per-host rate limits guarding real upstreams.
+    monkeypatch.setattr(upstreams, "UPSTREAM_RATE_PER_SECOND", 1e9)
+    monkeypatch.setattr(upstreams, "UPSTREAM_BURST", 1e9)
+    monkeypatch.setattr(dependencies, "check_llama_key", llamacloud_keys.check_llama_key)
+    monkeypatch.setattr(
+        llamacloud_parser,
+        "llamacloud_client_pool",
+        LlamaCloudClientPool(max_clients=8, idle_seconds=60, factory=standins.llamacloud_client),
+    )
+    return standins
+
+
+@pytest.mark.asyncio
+async def test_load_extract_tweet_images(standins: UpstreamStandIns) -> None:
+    async with wired_app(app, standins):
+        result = await run_load(
+            app,
+            name="extract_tweet_images",
+            path="/extract-tweet-images",
+            payload_for=lambda index: {"tweet_url": f"https://x.com/user/status/{1000 + index}"},
+            requests=REQUESTS,
+            concurrency=CONCURRENCY,
+        )
+
+    print(result.summary())
+    assert result.status_counts == {200: REQUESTS}
+    assert standins.request_counts["syndication"] == REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_load_parse_tweet(standins: UpstreamStandIns) -> None:
+    async with wired_app(app, standins):
+        result = await run_load(
+            app,
+            name="parse_tweet",
+            path="/parse-tweet",
+            payload_for=lambda index: {
+                "api_key": "llx-load-test",
+                "tweet_url": f"https://x.com/user/status/{1000 + index}",
+                "tier": "agentic",
+            },
+            requests=REQUESTS,
+            concurrency=CONCURRENCY,
+        )
+
+    print(result.summary())
+    assert result.status_counts == {200: REQUESTS}
+    assert standins.request_counts["llamacloud_parse"] == REQUESTS * standins.images_per_tweet
+
+
+@pytest.mark.asyncio
+async def test_load_parse_tweet_falls_back_when_syndication_fails(standins: UpstreamStandIns) -> None:
+    standins.configs["syndication"] = StandInConfig(error_rate=1.0)
+
+    async with wired_app(app, standins):
+        result = await run_load(
+            app,
+            name="parse_tweet_syndication_down",
+            path="/parse-tweet",
+            payload_for=lambda index: {
+                "api_key": "llx-load-test",
+                "tweet_url": f"https://x.com/user/status/{5000 + index}",
+            },
+            requests=REQUESTS,
+            concurrency=CONCURRENCY,
+        )
+
+    print(result.summary())
+    assert result.status_counts == {200: REQUESTS}
+    assert standins.request_counts["fxtwitter"] == REQUESTS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("variant", ["orig", "large", "small"])
+async def test_load_parse_tweet_by_image_variant(
+    standins: UpstreamStandIns,
+    monkeypatch: pytest.MonkeyPatch,
+    variant: str,
+) -> None:
+    from services import image_preprocessing
+
+    monkeypatch.setattr(image_preprocessing, "IMAGE_VARIANT_NAME", variant)
+
+    async with wired_app(app, standins):
+        result = await run_load(
+            app,
+            name=f"parse_tweet_variant_{variant}",
+            path="/parse-tweet",
+            payload_for=lambda index: {
+                "api_key": "llx-load-test",
+                "tweet_url": f"https://x.com/user/status/{9000 + index}",
+            },
+            requests=REQUESTS,
+            concurrency=CONCURRENCY,
+        )
+
+    uploads = REQUESTS * standins.images_per_tweet
+    print(result.summary(), f"avg upload {standins.uploaded_bytes / uploads / 1024:.0f} KiB")
+    assert result.status_counts == {200: REQUESTS}
+    assert standins.uploaded_bytes / uploads < PBS_PAYLOAD_BYTES * PBS_VARIANT_SCALE[variant] + 1024
@@ -0,0 +1,144 @@
+import gzip
+import types
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+
+from services import compression
+from services.compression import CompressionMiddleware, accepted_encodings
+
+BODY = "chart,value\n" * 1000
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large() -> PlainTextResponse:
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @app.get("/events")
+    async def events() -> PlainTextResponse:
+        return PlainTextResponse(BODY, media_type="text/event-stream")
+
+    @app.get("/encoded")
+    async def encoded() -> Response:
+        return Response(gzip.compress(BODY.encode()), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+
+def _get_raw(client: TestClient, path: str, accept_encoding: str) -> tuple[str | None, bytes]:
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response.headers.get("content-encoding"), b"".join(response.iter_raw())
+
+
+def test_accepted_encodings_skips_refused_codings() -> None:
+    assert accepted_encodings("gzip;q=0.5, br;q=0, deflate") == {"gzip", "deflate"}
+    assert accepted_encodings("") == set()
+
+
+def test_gzip_applies_above_threshold_only() -> None:
+    client = _client()
+
+    encoding, body = _get_raw(client, "/large", "gzip")
+    small_encoding, small_body = _get_raw(client, "/small", "gzip")
+    identity_encoding, _ = _get_raw(client, "/large", "identity")
+
+    assert encoding == "gzip"
+    assert gzip.decompress(body).decode() == BODY
+    assert len(body) < len(BODY) // 10
+    assert (small_encoding, small_body) == (None, b"ok")
+    assert identity_encoding is None
+
+
+def test_brotli_preferred_when_installed() -> None:
+    brotli = pytest.importorskip("brotli")
+
+    encoding, body = _get_raw(_client(), "/large", "gzip, br")
+
+    assert encoding == "br"
+    assert brotli.decompress(body).decode() == BODY
+
+
+def test_falls_back_to_gzip_without_brotli(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(compression, "brotli", None)
+
+    encoding, _ = _get_raw(_client(), "/large", "br, gzip")
+
+    assert encoding == "gzip"
+
+
+class _FakeBrotliCompressor:
+    """Stands in for brotli.Compressor, emitting a zlib stream so tests can decode it."""
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = zlib.compressobj()
+
+    def process(self, body: bytes) -> bytes:
+        return self._compressor.compress(body)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+@pytest.mark.parametrize("brotli_module", [None, types.SimpleNamespace(Compressor=_FakeBrotliCompressor)])
+def test_excluded_content_types_skip_every_coding(monkeypatch, brotli_module) -> None:  # noqa: ANN001
+    monkeypatch.setattr(compression, "brotli", brotli_module)
+
+    encoding, body = _get_raw(_client(), "/events", "br, gzip")
+
+    assert encoding is None
+    assert body.decode() == BODY
+
+
+def test_brotli_path_encodes_with_installed_module(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(compression, "brotli", types.SimpleNamespace(Compressor=_FakeBrotliCompressor))
+
+    encoding, body = _get_raw(_client(), "/large", "br")
+
+    assert encoding == "br"
+    assert zlib.decompress(body).decode() == BODY
+
+
+def test_already_encoded_response_passes_through() -> None:
+    encoding, body = _get_raw(_client(), "/encoded", "gzip")
+
+    assert encoding == "gzip"
+    assert gzip.decompress(body).decode() == BODY
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_flushed_per_chunk() -> None:
+    lines = [f'{{"event": {index}}}\n'.encode() for index in range(3)]
+
+    async def app(scope, receive, send) -> None:  # noqa: ANN001
+        headers = [(b"content-type", b"application/x-ndjson")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for index, line in enumerate(lines):
+            await send({"type": "http.response.body", "body": line, "more_body": index < len(lines) - 1})
+
+    sent = []
+
+    async def send(message) -> None:  # noqa: ANN001
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app)(scope, None, send)
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decompressor = zlib.decompressobj(31)
+    assert [decompressor.decompress(message["body"]) for message in sent[1:]] == lines
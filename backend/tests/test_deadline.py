@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from api import parse as parse_api
+from main import app
+from models import MediaExtractionSource, ParsedImageResult
+from services import deadline as deadline_module
+from services import parse_pipeline
+from services.deadline import (
+    DeadlineExceededError,
+    current_deadline,
+    deadline_scope,
+    request_deadline,
+    run_within_deadline,
+)
+from services.tweet_media import ExtractedTweetMedia
+
+
+def test_request_deadline_uses_tightest_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert request_deadline(None, None) is None
+    assert 2.9 < request_deadline(10, 3).remaining() <= 3
+
+    monkeypatch.setattr(deadline_module, "DEFAULT_REQUEST_DEADLINE_SECONDS", 5.0)
+    assert 4.9 < request_deadline(None).remaining() <= 5
+
+
+@pytest.mark.asyncio
+async def test_run_within_deadline_bounds_stage_by_its_share() -> None:
+    seen: list[float] = []
+
+    async def work() -> None:
+        seen.append(current_deadline().remaining())
+        await asyncio.sleep(10)
+
+    with deadline_scope(request_deadline(1.0)):
+        started = time.perf_counter()
+        with pytest.raises(DeadlineExceededError, match="Extraction"):
+            await run_within_deadline(work(), "Extraction", 0.1)
+
+    assert time.perf_counter() - started < 0.5
+    assert seen[0] <= 0.1
+
+
+@pytest.mark.asyncio
+async def test_cancel_on_disconnect_stops_work() -> None:
+    cancelled = asyncio.Event()
+
+    class DisconnectingRequest:
+        async def receive(self) -> dict:
+            await asyncio.sleep(0.01)
+            return {"type": "http.disconnect"}
+
+    async def work() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(HTTPException) as exc_info:
+        await parse_api._cancel_on_disconnect(DisconnectingRequest(), work())
+
+    assert exc_info.value.status_code == 499
+    assert cancelled.is_set()
+
+
+def _fake_extract(delay: float = 0.0):  # noqa: ANN202
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        await asyncio.sleep(delay)
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/fast.jpg", "https://pbs.twimg.com/media/slow.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    return fake_extract
+
+
+def test_parse_tweet_reports_parses_outstanding_at_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        if image_url.endswith("slow.jpg"):
+            await asyncio.sleep(10)
+        return ParsedImageResult(image_url=image_url, filename="fast.jpg", success=True, markdown="fast")
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", _fake_extract())
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+    started = time.perf_counter()
+    response = TestClient(app).post(
+        "/parse-tweet",
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123", "deadline_seconds": 0.3},
+    )
+
+    assert response.status_code == 200
+    assert time.perf_counter() - started < 2
+    fast, slow = response.json()["results"]
+    assert (fast["success"], fast["timed_out"]) == (True, False)
+    assert (slow["success"], slow["timed_out"], slow["filename"]) == (False, True, "slow.jpg")
+    assert "slow.jpg" in response.json()["warnings"][-1]
+
+
+def test_parse_tweet_returns_504_when_extraction_outlasts_its_share(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parse_api, "extract_tweet_images", _fake_extract(delay=10))
+
+    response = TestClient(app).post(
+        "/parse-tweet",
+        headers={"X-Deadline-Seconds": "0.5"},
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+    )
+
+    assert response.status_code == 504
+    assert response.json()["error_code"] == "DEADLINE_EXCEEDED"
+
+
+def test_parse_tweet_stream_emits_timed_out_images_at_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        if image_url.endswith("slow.jpg"):
+            await asyncio.sleep(10)
+        return ParsedImageResult(image_url=image_url, filename="fast.jpg", success=True, markdown="fast")
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", _fake_extract())
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+    response = TestClient(app).post(
+        "/parse-tweet/stream",
+        headers={"X-Deadline-Seconds": "0.3"},
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+    )
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    images = {event["data"]["index"]: event["data"]["result"] for event in events if event["event"] == "image"}
+    assert [event["event"] for event in events] == ["extracted", "image", "image", "complete"]
+    assert images[0]["success"] is True
+    assert images[1]["timed_out"] is True
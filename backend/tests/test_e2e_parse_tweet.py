@@ -7,8 +7,9 @@ from services.tweet_media import ExtractedTweetMedia
 
 def test_parse_tweet_end_to_end_with_mocks(monkeypatch) -> None:  # noqa: ANN001
     from api import parse as parse_api
+    from services import parse_pipeline
 
-    async def fake_extract(tweet_url: str, x_bearer_token=None):  # noqa: ANN001
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
         return ExtractedTweetMedia(
             tweet_id="111",
             normalized_tweet_url="https://x.com/demo/status/111",
@@ -20,7 +21,7 @@ def test_parse_tweet_end_to_end_with_mocks(monkeypatch) -> None:  # noqa: ANN001
             warnings=["fallback extractor used"],
         )
 
-    async def fake_parse(image_url: str, api_key: str, settings):  # noqa: ANN001
+    async def fake_parse(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
         from models import ParsedImageResult, TableResult
 
         if image_url.endswith("two.jpg"):
@@ -48,7 +49,7 @@ def test_parse_tweet_end_to_end_with_mocks(monkeypatch) -> None:  # noqa: ANN001
         )
 
     monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
-    monkeypatch.setattr(parse_api, "parse_image_from_url", fake_parse)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse)
 
     client = TestClient(app)
     response = client.post(
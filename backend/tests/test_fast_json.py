@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from models import MediaExtractionSource, ParsedImageResult, ParseTweetResponse
+from services import fast_json
+from services.fast_json import FastJSONResponse
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+def test_loads_decodes_bytes_and_rejects_malformed_json(backend: str) -> None:
+    assert fast_json.loads('{"ünïcode": [1, 2.5, null]}'.encode()) == {"ünïcode": [1, 2.5, None]}
+    with pytest.raises(ValueError):
+        fast_json.loads(b"<html>")
+
+
+def test_fast_json_response_matches_stdlib_rendering(backend: str) -> None:
+    response = ParseTweetResponse(
+        tweet_id="1",
+        normalized_tweet_url="https://x.com/user/status/1",
+        source=MediaExtractionSource.syndication,
+        results=[
+            ParsedImageResult(image_url="https://pbs.twimg.com/media/a.jpg", filename="a.jpg", success=True),
+        ],
+        combined_markdown="## Image 1: a.jpg — ✓",
+    )
+    content = {"data": response, "count": 1}
+
+    body = FastJSONResponse(content).body
+
+    assert json.loads(body) == {"data": response.model_dump(mode="json"), "count": 1}
+    assert "✓".encode() in body
@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from models import MediaExtractionSource
+from services.tweet_media import ExtractedTweetMedia
+
+
+def test_lifespan_shares_pooled_clients_across_requests(monkeypatch) -> None:  # noqa: ANN001
+    from api import extract as extract_api
+
+    seen_clients = []
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        seen_clients.append(client)
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/a.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    monkeypatch.setattr(extract_api, "extract_tweet_images", fake_extract)
+
+    with TestClient(app) as client:
+        registry = app.state.http_clients
+        for _ in range(2):
+            response = client.post("/extract-tweet-images", json={"tweet_url": "https://x.com/user/status/123"})
+            assert response.status_code == 200
+
+    assert seen_clients == [registry.extraction, registry.extraction]
+    assert registry.extraction.is_closed
+    assert registry.media.is_closed
+    assert registry.llamacloud.is_closed
+
+
+def test_routes_fall_back_to_per_call_clients_without_lifespan(monkeypatch) -> None:  # noqa: ANN001
+    from api import extract as extract_api
+
+    seen_clients = []
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        seen_clients.append(client)
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/a.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    monkeypatch.setattr(extract_api, "extract_tweet_images", fake_extract)
+
+    response = TestClient(app).post("/extract-tweet-images", json={"tweet_url": "https://x.com/user/status/123"})
+    assert response.status_code == 200
+    assert seen_clients == [None]
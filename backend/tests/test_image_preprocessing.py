@@ -0,0 +1,93 @@
+import io
+
+import httpx
+import pytest
+
+from models import ParseTier
+from services import image_preprocessing
+from services.image_preprocessing import media_variant_url, optimize_image_bytes
+from services.llamacloud_parser import ParseSettings, parse_image_from_url
+
+
+@pytest.mark.parametrize(
+    ("image_url", "name", "image_format", "expected"),
+    [
+        ("https://pbs.twimg.com/media/ABC.jpg", "large", "", "https://pbs.twimg.com/media/ABC?format=jpg&name=large"),
+        (
+            "https://pbs.twimg.com/media/ABC?format=png&name=orig",
+            "medium",
+            "",
+            "https://pbs.twimg.com/media/ABC?format=png&name=medium",
+        ),
+        (
+            "https://pbs.twimg.com/media/ABC.jpeg",
+            "small",
+            "png",
+            "https://pbs.twimg.com/media/ABC?format=png&name=small",
+        ),
+        ("https://pbs.twimg.com/media/ABC", "orig", "", "https://pbs.twimg.com/media/ABC?format=jpg&name=orig"),
+        ("https://pbs.twimg.com/media/ABC.jpg", "", "", "https://pbs.twimg.com/media/ABC.jpg"),
+        ("https://pbs.twimg.com/profile_images/1/a.jpg", "large", "", "https://pbs.twimg.com/profile_images/1/a.jpg"),
+        ("https://example.com/media/ABC.jpg", "large", "", "https://example.com/media/ABC.jpg"),
+    ],
+)
+def test_media_variant_url(image_url: str, name: str, image_format: str, expected: str) -> None:
+    assert media_variant_url(image_url, name, image_format) == expected
+
+
+def test_media_variant_url_keeps_extracted_url_by_default() -> None:
+    assert media_variant_url("https://pbs.twimg.com/media/ABC.jpg") == "https://pbs.twimg.com/media/ABC.jpg"
+
+
+@pytest.mark.asyncio
+async def test_parse_downloads_configured_variant(fake_llama_cloud, monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(image_preprocessing, "IMAGE_VARIANT_NAME", "medium")
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, content=b"jpeg-bytes")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await parse_image_from_url(
+            "https://pbs.twimg.com/media/chart.jpg",
+            "llx-1",
+            ParseSettings(tier=ParseTier.fast),
+            client,
+        )
+
+    assert requested == ["https://pbs.twimg.com/media/chart?format=jpg&name=medium"]
+    assert str(result.image_url) == "https://pbs.twimg.com/media/chart.jpg"
+    assert fake_llama_cloud.uploads == [("chart.jpg", b"jpeg-bytes", "image/jpeg")]
+
+
+@pytest.mark.asyncio
+async def test_parse_uploads_variant_under_its_downloaded_format(fake_llama_cloud, monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(image_preprocessing, "IMAGE_VARIANT_NAME", "large")
+    monkeypatch.setattr(image_preprocessing, "IMAGE_VARIANT_FORMAT", "png")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"png-bytes"))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        result = await parse_image_from_url(
+            "https://pbs.twimg.com/media/ABC.jpg",
+            "llx-1",
+            ParseSettings(tier=ParseTier.fast),
+            client,
+        )
+
+    assert result.filename == "ABC.jpg"
+    assert fake_llama_cloud.uploads == [("ABC.png", b"png-bytes", "image/png")]
+
+
+def test_optimize_image_bytes_leaves_unreadable_bytes_alone() -> None:
+    assert optimize_image_bytes(b"not-an-image", max_pixels=1, max_bytes=1) == b"not-an-image"
+
+
+def test_optimize_image_bytes_downscales_over_pixel_budget() -> None:
+    image_module = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    image_module.new("RGB", (400, 300), "white").save(buffer, format="PNG")
+
+    optimized = optimize_image_bytes(buffer.getvalue(), max_pixels=30_000, max_bytes=0)
+
+    assert image_module.open(io.BytesIO(optimized)).size == (200, 150)
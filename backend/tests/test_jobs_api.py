@@ -0,0 +1,144 @@
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import (
+    ErrorResponse,
+    MediaExtractionErrorCode,
+    MediaExtractionSource,
+    ParsedImageResult,
+    ParseTweetRequest,
+)
+from services.jobs import JobRunner, JobStore
+from services.tweet_media import ExtractedTweetMedia, TweetMediaError
+
+
+def _install_fakes(monkeypatch) -> None:  # noqa: ANN001
+    from api import jobs as jobs_api
+    from services import parse_pipeline
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        if tweet_url.endswith("/404"):
+            raise TweetMediaError(code=MediaExtractionErrorCode.no_media_found, message="none", status_code=404)
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/a.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        return ParsedImageResult(image_url=image_url, filename="a.jpg", success=True, markdown="ok", tables=[])
+
+    monkeypatch.setattr(jobs_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+
+def _wait_for_job(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        payload = client.get(f"/jobs/{job_id}").json()
+        if payload["status"] in {"succeeded", "failed"}:
+            return payload
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_runs_in_background_and_reports_result(monkeypatch) -> None:  # noqa: ANN001
+    _install_fakes(monkeypatch)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/jobs",
+            json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+        )
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+
+        payload = _wait_for_job(client, response.json()["job_id"])
+        assert payload["status"] == "succeeded"
+        assert payload["result"]["tweet_id"] == "123"
+        assert payload["result"]["results"][0]["markdown"] == "ok"
+
+        failed = client.post("/jobs", json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/404"})
+        payload = _wait_for_job(client, failed.json()["job_id"])
+        assert payload["status"] == "failed"
+        assert payload["error"]["error_code"] == "NO_MEDIA_FOUND"
+
+        assert client.get("/jobs/missing").status_code == 404
+
+
+def test_jobs_left_queued_by_previous_process_resume_on_startup(monkeypatch) -> None:  # noqa: ANN001
+    _install_fakes(monkeypatch)
+    store = JobStore(os.environ["JOBS_DB_PATH"])
+    record = store.create(ParseTweetRequest(api_key="llx-123", tweet_url="https://x.com/user/status/123"))
+
+    with TestClient(app) as client:
+        payload = _wait_for_job(client, record.id)
+
+    assert payload["status"] == "succeeded"
+    assert store.get(record.id).request is None
+
+
+def test_jobs_unavailable_without_runner() -> None:
+    response = TestClient(app).post("/jobs", json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/1"})
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "JOBS_UNAVAILABLE"
+
+
+def test_jobs_unavailable_without_configured_store(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.delenv("JOBS_DB_PATH")
+
+    with TestClient(app) as client:
+        response = client.post("/jobs", json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/1"})
+
+    assert response.status_code == 503
+
+
+def test_job_store_file_is_private_to_owner(tmp_path) -> None:  # noqa: ANN001
+    import stat
+
+    path = tmp_path / "jobs.sqlite3"
+    store = JobStore(path)
+    store.create(ParseTweetRequest(api_key="llx-123", tweet_url="https://x.com/user/status/123"))
+
+    for candidate in tmp_path.iterdir():
+        assert stat.S_IMODE(candidate.stat().st_mode) == 0o600, candidate.name
+
+
+def test_job_store_deletes_only_finished_jobs_past_retention(tmp_path) -> None:  # noqa: ANN001
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    request = ParseTweetRequest(api_key="llx-123", tweet_url="https://x.com/user/status/123")
+    finished, queued = store.create(request), store.create(request)
+    store.finish(finished.id, error=ErrorResponse(error_code="NO_MEDIA_FOUND", message="none"))
+
+    assert store.delete_finished_before(time.time() - 60) == 0
+    assert store.delete_finished_before(time.time() + 1) == 1
+    assert store.get(finished.id) is None
+    assert store.get(queued.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_job_runner_purges_expired_jobs_in_background(tmp_path) -> None:  # noqa: ANN001
+    import asyncio
+
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    record = store.create(ParseTweetRequest(api_key="llx-123", tweet_url="https://x.com/user/status/123"))
+    store.finish(record.id, error=ErrorResponse(error_code="NO_MEDIA_FOUND", message="none"))
+
+    async def handler(request):  # noqa: ANN001, ANN202
+        raise AssertionError("no job should run")
+
+    runner = JobRunner(store, handler, workers=1, retention_seconds=0.01)
+    await asyncio.sleep(0.02)
+    await runner.start()
+    for _ in range(100):
+        if store.get(record.id) is None:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    assert store.get(record.id) is None
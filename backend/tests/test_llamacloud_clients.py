@@ -0,0 +1,52 @@
+import pytest
+
+from services.llamacloud_clients import LlamaCloudClientPool
+
+
+class FakeClient:
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_per_api_key() -> None:
+    pool = LlamaCloudClientPool(max_clients=4, idle_seconds=60, factory=FakeClient)
+
+    async with pool.client("llx-a") as first:
+        pass
+    async with pool.client("llx-a") as second:
+        pass
+    async with pool.client("llx-b") as other:
+        pass
+
+    assert first is second
+    assert other is not first
+    assert len(pool) == 2
+
+    await pool.aclose()
+    assert first.closed and other.closed
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_idle_and_overflow_clients_but_not_in_use() -> None:
+    pool = LlamaCloudClientPool(max_clients=1, idle_seconds=60, factory=FakeClient)
+
+    async with pool.client("llx-a") as busy:
+        async with pool.client("llx-b") as newer:
+            pass
+        # llx-b is idle and over capacity, llx-a is still lent out.
+        assert newer.closed
+        assert not busy.closed
+    assert len(pool) == 1
+
+    pool.idle_seconds = 0
+    async with pool.client("llx-c") as latest:
+        pass
+    assert busy.closed
+    assert latest.closed
+    assert len(pool) == 0
@@ -0,0 +1,74 @@
+import hashlib
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import MediaExtractionSource
+from services.llamacloud_keys import KeyValidation, check_llama_key, key_validation_cache
+from services.tweet_media import ExtractedTweetMedia
+
+
+def _projects_client(statuses: dict[str, int], calls: list[str]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        api_key = request.headers["Authorization"].removeprefix("Bearer ")
+        calls.append(api_key)
+        return httpx.Response(statuses[api_key], json=[])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_check_llama_key_caches_definitive_outcomes_by_hash() -> None:
+    calls: list[str] = []
+    statuses = {"llx-good": 200, "llx-bad": 401, "llx-flaky": 503}
+
+    async with _projects_client(statuses, calls) as client:
+        for _ in range(3):
+            assert (await check_llama_key("llx-good", client)).valid
+            assert (await check_llama_key("llx-bad", client)).rejected
+            assert (await check_llama_key("llx-flaky", client)).status_code == 503
+
+    assert calls.count("llx-good") == 1
+    assert calls.count("llx-bad") == 1
+    assert calls.count("llx-flaky") == 3
+    assert len(key_validation_cache) == 2
+    assert key_validation_cache.get(hashlib.sha256(b"llx-good").hexdigest()) == KeyValidation(status_code=200)
+    assert key_validation_cache.get("llx-good") is None
+
+
+def test_parse_tweet_fails_fast_on_rejected_key(monkeypatch) -> None:  # noqa: ANN001
+    from api import dependencies
+    from api import parse as parse_api
+    from services import parse_pipeline
+
+    parse_calls: list[str] = []
+
+    async def reject(api_key: str, client=None):  # noqa: ANN001
+        return KeyValidation(status_code=401)
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/a.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        parse_calls.append(image_url)
+
+    monkeypatch.setattr(dependencies, "check_llama_key", reject)
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+    response = TestClient(app).post(
+        "/parse-tweet",
+        json={"api_key": "llx-revoked", "tweet_url": "https://x.com/user/status/123"},
+    )
+
+    assert response.status_code == 401
+    assert response.json()["error_code"] == "INVALID_API_KEY"
+    assert parse_calls == []
@@ -0,0 +1,76 @@
+import httpx
+import pytest
+
+from models import ParseTier
+from services import llamacloud_parser
+from services.llamacloud_parser import ParseSettings, parse_image_from_url
+
+
+def _image_client(body: bytes) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"Content-Type": "image/jpeg"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_parse_image_from_url_uploads_from_memory(fake_llama_cloud) -> None:  # noqa: ANN001
+    async with _image_client(b"jpeg-bytes") as client:
+        result = await parse_image_from_url(
+            image_url="https://pbs.twimg.com/media/chart.jpg",
+            api_key="llx-1",
+            settings=ParseSettings(tier=ParseTier.agentic),
+            client=client,
+        )
+
+    assert result.success is True
+    assert fake_llama_cloud.uploads == [("chart.jpg", b"jpeg-bytes", "image/jpeg")]
+
+
+@pytest.mark.asyncio
+async def test_parse_image_from_url_rejects_oversized_download(
+    fake_llama_cloud,  # noqa: ANN001
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(llamacloud_parser, "MAX_IMAGE_BYTES", 4)
+
+    async with _image_client(b"too-large") as client:
+        result = await parse_image_from_url(
+            image_url="https://pbs.twimg.com/media/chart.jpg",
+            api_key="llx-1",
+            settings=ParseSettings(tier=ParseTier.agentic),
+            client=client,
+        )
+
+    assert result.success is False
+    assert "larger than 4 bytes" in (result.error or "")
+    assert fake_llama_cloud.uploads == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_parses_are_only_shared_between_callers_with_the_same_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import asyncio
+
+    from models import ParsedImageResult
+
+    parsed_with: list[str] = []
+
+    async def fake_download_and_parse(image_url: str, api_key: str, settings, client):  # noqa: ANN001
+        parsed_with.append(api_key)
+        await asyncio.sleep(0.01)
+        return ParsedImageResult(image_url=image_url, filename="chart.jpg", success=True, markdown=api_key)
+
+    monkeypatch.setattr(llamacloud_parser, "_download_and_parse", fake_download_and_parse)
+
+    settings = ParseSettings(tier=ParseTier.agentic)
+    results = await asyncio.gather(
+        *(
+            parse_image_from_url("https://pbs.twimg.com/media/chart.jpg", api_key, settings)
+            for api_key in ["llx-a", "llx-a", "llx-b"]
+        )
+    )
+
+    assert sorted(parsed_with) == ["llx-a", "llx-b"]
+    assert [result.markdown for result in results] == ["llx-a", "llx-a", "llx-b"]
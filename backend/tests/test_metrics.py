@@ -0,0 +1,66 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import ParseTier
+from services import metrics
+from services.llamacloud_parser import ParseSettings, parse_image_from_url
+from services.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stage latency.", ("tier",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, tier="fast")
+    histogram.observe(0.5, tier="fast")
+    histogram.observe(3.0, tier="fast")
+
+    rendered = registry.render()
+
+    assert "# TYPE stage_seconds histogram" in rendered
+    assert 'stage_seconds_bucket{tier="fast",le="0.1"} 1' in rendered
+    assert 'stage_seconds_bucket{tier="fast",le="1"} 2' in rendered
+    assert 'stage_seconds_bucket{tier="fast",le="+Inf"} 3' in rendered
+    assert 'stage_seconds_sum{tier="fast"} 3.55' in rendered
+    assert 'stage_seconds_count{tier="fast"} 3' in rendered
+
+
+def test_counter_escapes_label_values() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("failures_total", "Failures.", ("code",))
+    counter.inc(code='bad "quote"')
+    counter.inc(code='bad "quote"')
+
+    assert 'failures_total{code="bad \\"quote\\""} 2' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_parse_records_stage_latencies_and_cache_lookups(fake_llama_cloud) -> None:  # noqa: ANN001
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"png-bytes", headers={"Content-Type": "image/png"})
+
+    uploads_before = metrics.LLAMACLOUD_UPLOAD_SECONDS.count(tier="fast")
+    misses_before = metrics.CACHE_LOOKUPS.value(cache="parse_result", result="miss")
+    hits_before = metrics.CACHE_LOOKUPS.value(cache="parse_result", result="hit")
+    settings = ParseSettings(tier=ParseTier.fast)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        for name in ("a.png", "b.png"):
+            await parse_image_from_url(f"https://pbs.twimg.com/media/{name}", "llx-1", settings, client)
+
+    assert metrics.LLAMACLOUD_UPLOAD_SECONDS.count(tier="fast") == uploads_before + 1
+    assert metrics.CACHE_LOOKUPS.value(cache="parse_result", result="miss") == misses_before + 1
+    assert metrics.CACHE_LOOKUPS.value(cache="parse_result", result="hit") == hits_before + 1
+    assert metrics.PARSES_IN_FLIGHT.value() == 0
+
+
+def test_metrics_endpoint_serves_prometheus_text() -> None:
+    client = TestClient(app)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE tcp_llamacloud_parse_seconds histogram" in response.text
+    assert "# TYPE tcp_image_parses_in_flight gauge" in response.text
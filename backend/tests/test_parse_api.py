@@ -22,8 +22,9 @@ def test_parse_tweet_rejects_invalid_api_key() -> None:
 
 def test_parse_tweet_success(monkeypatch) -> None:  # noqa: ANN001
     from api import parse as parse_api
+    from services import parse_pipeline
 
-    async def fake_extract(tweet_url: str, x_bearer_token=None):  # noqa: ANN001
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
         return ExtractedTweetMedia(
             tweet_id="123",
             normalized_tweet_url="https://x.com/user/status/123",
@@ -32,7 +33,7 @@ def test_parse_tweet_success(monkeypatch) -> None:  # noqa: ANN001
             warnings=[],
         )
 
-    async def fake_parse_image_from_url(image_url: str, api_key: str, settings):  # noqa: ANN001
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
         from models import ParsedImageResult
 
         return ParsedImageResult(
@@ -44,7 +45,7 @@ def test_parse_tweet_success(monkeypatch) -> None:  # noqa: ANN001
         )
 
     monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
-    monkeypatch.setattr(parse_api, "parse_image_from_url", fake_parse_image_from_url)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
 
     client = TestClient(app)
     response = client.post(
@@ -65,8 +66,9 @@ def test_parse_tweet_success(monkeypatch) -> None:  # noqa: ANN001
 
 def test_parse_tweet_partial_failure(monkeypatch) -> None:  # noqa: ANN001
     from api import parse as parse_api
+    from services import parse_pipeline
 
-    async def fake_extract(tweet_url: str, x_bearer_token=None):  # noqa: ANN001
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
         return ExtractedTweetMedia(
             tweet_id="123",
             normalized_tweet_url="https://x.com/user/status/123",
@@ -78,7 +80,7 @@ def test_parse_tweet_partial_failure(monkeypatch) -> None:  # noqa: ANN001
             warnings=[],
         )
 
-    async def fake_parse_image_from_url(image_url: str, api_key: str, settings):  # noqa: ANN001
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
         from models import ParsedImageResult
 
         if image_url.endswith("b.jpg"):
@@ -86,7 +88,7 @@ def test_parse_tweet_partial_failure(monkeypatch) -> None:  # noqa: ANN001
         return ParsedImageResult(image_url=image_url, filename="a.jpg", success=True, markdown="ok", tables=[])
 
     monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
-    monkeypatch.setattr(parse_api, "parse_image_from_url", fake_parse_image_from_url)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
 
     client = TestClient(app)
     response = client.post(
@@ -101,3 +103,231 @@ def test_parse_tweet_partial_failure(monkeypatch) -> None:  # noqa: ANN001
     payload = response.json()
     assert len(payload["results"]) == 2
     assert any("Failed to parse" in warning for warning in payload["warnings"])
+
+
+def test_parse_tweet_parses_images_concurrently_in_order(monkeypatch) -> None:  # noqa: ANN001
+    import asyncio
+
+    from api import parse as parse_api
+    from services import parse_pipeline
+
+    image_urls = [f"https://pbs.twimg.com/media/{index}.jpg" for index in range(5)]
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=image_urls,
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        from models import ParsedImageResult
+
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        # Finish later images first so ordering has to be restored.
+        await asyncio.sleep(0.01 * (len(image_urls) - image_urls.index(image_url)))
+        in_flight -= 1
+        if image_url.endswith("2.jpg"):
+            raise RuntimeError("boom")
+        return ParsedImageResult(image_url=image_url, filename="x.jpg", success=True, markdown="ok", tables=[])
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+    client = TestClient(app)
+    response = client.post(
+        "/parse-tweet",
+        json={
+            "api_key": "llx-123",
+            "tweet_url": "https://x.com/user/status/123",
+            "max_concurrency": 2,
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert [result["image_url"] for result in payload["results"]] == image_urls
+    assert [result["success"] for result in payload["results"]] == [True, True, False, True, True]
+    assert payload["results"][2]["error"] == "boom"
+    assert peak_in_flight == 2
+
+
+def test_parse_tweets_batch_dedupes_images_and_reports_errors_by_tweet_id(monkeypatch) -> None:  # noqa: ANN001
+    from api import parse as parse_api
+    from models import MediaExtractionErrorCode, ParsedImageResult
+    from services import parse_pipeline
+    from services.tweet_media import TweetMediaError
+
+    shared_image = "https://pbs.twimg.com/media/shared.jpg"
+    parse_calls: list[str] = []
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        tweet_id = tweet_url.rsplit("/", 1)[-1]
+        if tweet_id == "3":
+            raise TweetMediaError(
+                code=MediaExtractionErrorCode.no_media_found,
+                message="No image media found for this tweet URL.",
+                status_code=404,
+            )
+        return ExtractedTweetMedia(
+            tweet_id=tweet_id,
+            normalized_tweet_url=f"https://x.com/user/status/{tweet_id}",
+            image_urls=[shared_image, f"https://pbs.twimg.com/media/{tweet_id}.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        parse_calls.append(image_url)
+        return ParsedImageResult(image_url=image_url, filename="x.jpg", success=True, markdown="ok", tables=[])
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+    client = TestClient(app)
+    response = client.post(
+        "/parse-tweets",
+        json={
+            "api_key": "llx-123",
+            "tweet_urls": [
+                "https://x.com/user/status/1",
+                "https://x.com/user/status/2",
+                "https://twitter.com/user/status/1",
+                "https://x.com/user/status/3",
+                "not-a-url",
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert list(payload["results"]) == ["1", "2"]
+    assert [result["image_url"] for result in payload["results"]["2"]["results"]] == [
+        shared_image,
+        "https://pbs.twimg.com/media/2.jpg",
+    ]
+    assert payload["errors"]["3"]["error_code"] == "NO_MEDIA_FOUND"
+    assert payload["errors"]["not-a-url"]["error_code"] == "INVALID_TWEET_URL"
+    assert sorted(parse_calls) == sorted(
+        [shared_image, "https://pbs.twimg.com/media/1.jpg", "https://pbs.twimg.com/media/2.jpg"]
+    )
+
+
+def test_parse_tweet_stream_emits_events_as_images_finish(monkeypatch) -> None:  # noqa: ANN001
+    import asyncio
+    import json
+
+    from api import parse as parse_api
+    from models import ParsedImageResult
+    from services import parse_pipeline
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/slow.jpg", "https://pbs.twimg.com/media/fast.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        if image_url.endswith("slow.jpg"):
+            await asyncio.sleep(0.05)
+        filename = image_url.rsplit("/", 1)[-1]
+        return ParsedImageResult(image_url=image_url, filename=filename, success=True, markdown=filename, tables=[])
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+    client = TestClient(app)
+    body = {"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"}
+    response = client.post("/parse-tweet/stream", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["extracted", "image", "image", "complete"]
+    assert events[0]["data"]["tweet_id"] == "123"
+    assert [event["data"]["index"] for event in events[1:3]] == [1, 0]
+    combined_markdown = events[3]["data"]["combined_markdown"]
+    assert combined_markdown.index("slow.jpg") < combined_markdown.index("fast.jpg")
+
+    sse = client.post("/parse-tweet/stream?stream_format=sse", json=body)
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: extracted\ndata: {")
+    assert sse.text.count("event: image\n") == 2
+
+
+def test_parse_tweet_stream_reports_extraction_errors_before_streaming(monkeypatch) -> None:  # noqa: ANN001
+    from api import parse as parse_api
+    from models import MediaExtractionErrorCode
+    from services.tweet_media import TweetMediaError
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        raise TweetMediaError(code=MediaExtractionErrorCode.no_media_found, message="none", status_code=404)
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+
+    response = TestClient(app).post(
+        "/parse-tweet/stream",
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+    )
+    assert response.status_code == 404
+    assert response.json()["error_code"] == "NO_MEDIA_FOUND"
+
+
+def test_parse_tweet_include_trims_response(monkeypatch) -> None:  # noqa: ANN001
+    from api import parse as parse_api
+    from models import ParsedImageResult, TableResult
+    from services import parse_pipeline
+    from services.table_formats import rows_to_columns
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/a.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        return ParsedImageResult(
+            image_url=image_url,
+            filename="a.jpg",
+            success=True,
+            markdown="chart text",
+            tables=[
+                TableResult(page_number=1, row_count=2, column_count=1, columns=rows_to_columns([["A"], ["1"]])),
+            ],
+        )
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+    client = TestClient(app)
+
+    def parse(include: str) -> dict:
+        response = client.post(
+            f"/parse-tweet?include={include}",
+            json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    combined_only = parse("combined_only")
+    results_only = parse("results_only")
+    no_tables = parse("no_tables")
+
+    assert combined_only["results"][0]["success"] is True
+    assert (combined_only["results"][0]["markdown"], combined_only["results"][0]["tables"]) == ("", [])
+    assert "chart text" in combined_only["combined_markdown"] and "| A |" in combined_only["combined_markdown"]
+    assert results_only["combined_markdown"] == ""
+    assert results_only["results"][0]["tables"][0]["markdown"] == "| A |\n| --- |\n| 1 |"
+    assert no_tables["results"][0]["tables"] == []
+    assert "chart text" in no_tables["combined_markdown"] and "Detected Tables" not in no_tables["combined_markdown"]
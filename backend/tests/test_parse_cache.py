@@ -0,0 +1,85 @@
+import pytest
+
+from models import ParsedImageResult, ParseTier
+from services.cache import DiskCache
+from services.llamacloud_parser import ParseResultCache, ParseSettings, parse_image_bytes
+
+
+@pytest.mark.asyncio
+async def test_parse_image_bytes_serves_repeat_content_from_cache(fake_llama_cloud) -> None:  # noqa: ANN001
+    settings = ParseSettings(tier=ParseTier.agentic)
+
+    first = await parse_image_bytes(
+        image_bytes=b"same-chart",
+        filename="a.png",
+        image_url="https://pbs.twimg.com/media/a.png",
+        api_key="llx-1",
+        settings=settings,
+    )
+    repost = await parse_image_bytes(
+        image_bytes=b"same-chart",
+        filename="b.png",
+        image_url="https://pbs.twimg.com/media/b.png",
+        api_key="llx-1",
+        settings=settings,
+    )
+    other_tier = await parse_image_bytes(
+        image_bytes=b"same-chart",
+        filename="b.png",
+        image_url="https://pbs.twimg.com/media/b.png",
+        api_key="llx-1",
+        settings=ParseSettings(tier=ParseTier.fast),
+    )
+
+    assert len(fake_llama_cloud.parse_calls) == 2
+    assert first.from_cache is False
+    assert repost.from_cache is True
+    assert repost.filename == "b.png"
+    assert str(repost.image_url) == "https://pbs.twimg.com/media/b.png"
+    assert repost.markdown == "chart"
+    assert other_tier.from_cache is False
+
+
+@pytest.mark.asyncio
+async def test_parse_result_cache_reads_through_from_disk(tmp_path) -> None:  # noqa: ANN001
+    settings = ParseSettings(tier=ParseTier.agentic)
+    key = ParseResultCache.key_for(b"img", settings)
+    result = ParsedImageResult(
+        image_url="https://pbs.twimg.com/media/a.png",
+        filename="a.png",
+        success=True,
+        markdown="cached",
+    )
+
+    await ParseResultCache(max_entries=4, disk_directory=str(tmp_path), disk_max_bytes=1_000_000).set(key, result)
+    restarted = ParseResultCache(max_entries=4, disk_directory=str(tmp_path), disk_max_bytes=1_000_000)
+
+    cached = await restarted.get(key)
+    assert cached is not None
+    assert cached.markdown == "cached"
+
+
+def test_disk_cache_evicts_oldest_entries_over_budget(tmp_path) -> None:  # noqa: ANN001
+    import os
+
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    payload = os.urandom(4_000)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.set(key, payload + key.encode())
+        os.utime(tmp_path / f"{key}.zz", (index, index))
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+
+def test_disk_cache_concurrent_writers_of_one_key_leave_a_whole_entry(tmp_path) -> None:  # noqa: ANN001
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = DiskCache(tmp_path, max_bytes=10_000_000)
+    payloads = [bytes([index]) * 200_000 for index in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda payload: cache.set("shared", payload), payloads * 4))
+
+    assert cache.get("shared") in payloads
+    assert list(tmp_path.glob("*.tmp")) == []
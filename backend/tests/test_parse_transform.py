@@ -2,6 +2,7 @@ from types import SimpleNamespace
 
 from models import ParsedImageResult
 from services.llamacloud_parser import build_combined_markdown, extract_markdown_text, extract_tables
+from services.table_formats import render_markdown
 
 
 class FakeRow:
@@ -47,7 +48,9 @@ def test_extract_tables_handles_row_objects() -> None:
     tables = extract_tables(result)
     assert len(tables) == 1
     assert tables[0].row_count == 2
-    assert "| A | B |" in tables[0].markdown
+    assert tables[0].columns == [["A", "1"], ["B", "2"]]
+    assert tables[0].markdown is None
+    assert "| A | B |" in render_markdown(tables[0])
 
 
 def test_build_combined_markdown_skips_failed_items() -> None:
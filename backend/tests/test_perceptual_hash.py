@@ -0,0 +1,156 @@
+import io
+import random
+
+import pytest
+
+from models import ParsedImageResult, ParseTier
+from services import llamacloud_parser
+from services.llamacloud_parser import ParseSettings, parse_image_bytes
+from services.perceptual_hash import perceptual_index
+from services.perceptual_hash import PerceptualHashIndex, image_hash
+
+
+def test_index_finds_nearest_within_distance() -> None:
+    index: PerceptualHashIndex[str] = PerceptualHashIndex(max_entries=10)
+    index.add("fast", 0b1111, "a")
+    index.add("fast", 0b1111 << 40, "b")
+
+    assert index.nearest("fast", 0b0111, max_distance=2) == ("a", 1)
+    assert index.nearest("fast", (0b1111 << 40) | 0b11, max_distance=2) == ("b", 2)
+    assert index.nearest("fast", 0b1111 << 20, max_distance=4) is None
+    assert index.nearest("agentic", 0b1111, max_distance=4) is None
+
+
+def test_index_evicts_oldest_entries() -> None:
+    index: PerceptualHashIndex[str] = PerceptualHashIndex(max_entries=2)
+    for value_hash, value in [(1, "a"), (2, "b"), (4, "c")]:
+        index.add("fast", value_hash << 32, value)
+
+    assert len(index) == 2
+    assert index.nearest("fast", 1 << 32, max_distance=0) is None
+    assert index.nearest("fast", 4 << 32, max_distance=0) == ("c", 0)
+
+
+def test_index_lists_matches_closest_first_and_discards_values() -> None:
+    index: PerceptualHashIndex[str] = PerceptualHashIndex(max_entries=10)
+    index.add("fast", 0b111, "far")
+    index.add("fast", 0b001, "near")
+    index.add("fast", 0b011, "middle")
+    index.add("fast", 0b011, "middle")
+
+    assert index.within("fast", 0, max_distance=3) == [("near", 1), ("middle", 2), ("far", 3)]
+
+    index.discard("fast", "near")
+
+    assert len(index) == 2
+    assert index.nearest("fast", 0, max_distance=3) == ("middle", 2)
+
+
+@pytest.mark.parametrize("max_distance", [0, 3, 7, 10])
+def test_index_matches_brute_force(max_distance: int) -> None:
+    rng = random.Random(max_distance)
+    hashes = [rng.getrandbits(64) for _ in range(2000)]
+    index: PerceptualHashIndex[int] = PerceptualHashIndex(max_entries=len(hashes))
+    for position, value_hash in enumerate(hashes):
+        index.add("fast", value_hash, position)
+
+    for _ in range(200):
+        query = rng.choice(hashes)
+        for bit in rng.sample(range(64), rng.randint(0, max_distance + 2)):
+            query ^= 1 << bit
+        distances = [(value_hash ^ query).bit_count() for value_hash in hashes]
+        best = min(distances)
+
+        found = index.nearest("fast", query, max_distance)
+
+        if best > max_distance:
+            assert found is None
+        else:
+            assert found is not None and found[1] == best
+
+
+@pytest.mark.asyncio
+async def test_parse_reuses_visually_matching_image(fake_llama_cloud, monkeypatch) -> None:  # noqa: ANN001
+    hashes = {b"original-bytes": 0xF0F0, b"reposted-bytes": 0xF0F1}
+    monkeypatch.setattr(llamacloud_parser, "perceptual_dedupe_enabled", lambda: True)
+    monkeypatch.setattr(llamacloud_parser, "image_hash", lambda image_bytes: hashes[image_bytes])
+    settings = ParseSettings(tier=ParseTier.agentic)
+
+    first = await parse_image_bytes(
+        b"original-bytes", "a.jpg", "https://pbs.twimg.com/media/a.jpg", "llx-1", settings
+    )
+    second = await parse_image_bytes(
+        b"reposted-bytes", "b.jpg", "https://pbs.twimg.com/media/b.jpg", "llx-1", settings
+    )
+    other_tier = await parse_image_bytes(
+        b"reposted-bytes", "b.jpg", "https://pbs.twimg.com/media/b.jpg", "llx-1", ParseSettings(tier=ParseTier.fast)
+    )
+
+    assert first.reused_from is None
+    assert second.from_cache is True
+    assert second.reused_from == "https://pbs.twimg.com/media/a.jpg"
+    assert second.perceptual_distance == 1
+    assert second.markdown == first.markdown
+    assert other_tier.reused_from is None
+    assert len(fake_llama_cloud.parse_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_falls_back_to_farther_match_when_nearest_was_evicted(
+    fake_llama_cloud, monkeypatch  # noqa: ANN001
+) -> None:
+    hashes = {b"far-bytes": 0b01111, b"near-bytes": 0b10000, b"query-bytes": 0}
+    monkeypatch.setattr(llamacloud_parser, "perceptual_dedupe_enabled", lambda: True)
+    monkeypatch.setattr(llamacloud_parser, "image_hash", lambda image_bytes: hashes[image_bytes])
+    settings = ParseSettings(tier=ParseTier.agentic)
+    for name in ("far", "near"):
+        await parse_image_bytes(
+            f"{name}-bytes".encode(), f"{name}.jpg", f"https://pbs.twimg.com/media/{name}.jpg", "llx-1", settings
+        )
+    llamacloud_parser.parse_result_cache.clear()
+    far_key = llamacloud_parser.ParseResultCache.key_for(b"far-bytes", settings)
+    far = ParsedImageResult(image_url="https://pbs.twimg.com/media/far.jpg", filename="far.jpg", success=True)
+    await llamacloud_parser.parse_result_cache.set(far_key, far)
+
+    reused = await parse_image_bytes(
+        b"query-bytes", "q.jpg", "https://pbs.twimg.com/media/q.jpg", "llx-1", settings
+    )
+
+    assert reused.reused_from == "https://pbs.twimg.com/media/far.jpg"
+    assert reused.perceptual_distance == 4
+    assert len(fake_llama_cloud.parse_calls) == 2
+    assert len(perceptual_index) == 1
+
+
+def _bar_chart(heights: list[int], size: tuple[int, int] = (480, 320), image_format: str = "PNG") -> bytes:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (480, 320), "white")
+    draw = ImageDraw.Draw(image)
+    bar_width = 480 // len(heights)
+    for position, height in enumerate(heights):
+        left = position * bar_width + 8
+        draw.rectangle((left, 320 - height, left + bar_width - 16, 319), fill=(40, 90, 160))
+    output = io.BytesIO()
+    image.resize(size).save(output, image_format)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("algorithm", ["dhash", "phash"])
+def test_hashes_match_near_duplicates_and_separate_different_charts(algorithm: str) -> None:
+    pytest.importorskip("PIL")
+    if algorithm == "phash":
+        pytest.importorskip("numpy")
+    heights = [60, 180, 120, 260, 90, 210]
+    original = image_hash(_bar_chart(heights), algorithm)
+    repost = image_hash(_bar_chart(heights, size=(400, 267), image_format="JPEG"), algorithm)
+    different = image_hash(_bar_chart([250, 70, 200, 40, 160, 110]), algorithm)
+
+    assert (original ^ repost).bit_count() <= 4
+    assert (original ^ different).bit_count() > 10
+
+
+def test_image_hash_returns_none_for_undecodable_bytes() -> None:
+    pytest.importorskip("PIL")
+
+    assert image_hash(b"not an image") is None
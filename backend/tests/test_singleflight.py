@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_run() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    results = await asyncio.gather(*(flights.run("key", work) for _ in range(5)), flights.run("other", work))
+
+    assert results == ["done"] * 6
+    assert calls == 2
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_work() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "shared"
+
+    leaving = asyncio.create_task(flights.run("key", work))
+    staying = asyncio.create_task(flights.run("key", work))
+    await asyncio.sleep(0)
+
+    leaving.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await staying == "shared"
+    with pytest.raises(asyncio.CancelledError):
+        await leaving
+
+
+@pytest.mark.asyncio
+async def test_shared_work_is_cancelled_when_last_waiter_leaves() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def work() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "unreachable"
+
+    waiters = [asyncio.create_task(flights.run("key", work)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert cancelled.is_set()
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_arriving_after_last_waiter_left_starts_fresh_work() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "fresh"
+
+    leaving = asyncio.create_task(flights.run("key", work))
+    await asyncio.sleep(0)
+    leaving.cancel()
+    # Scheduled to run right after the leaving caller, before the shared task has unwound.
+    arriving = asyncio.create_task(flights.run("key", work))
+    await asyncio.gather(leaving, return_exceptions=True)
+
+    assert await arriving == "fresh"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_work_does_not_inherit_first_callers_context() -> None:
+    import contextvars
+
+    request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+    flights: SingleFlight[str | None] = SingleFlight()
+
+    async def work() -> str | None:
+        return request_id.get()
+
+    async def caller() -> str | None:
+        request_id.set("first")
+        return await flights.run("key", work)
+
+    assert await asyncio.create_task(caller()) is None
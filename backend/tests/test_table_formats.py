@@ -0,0 +1,144 @@
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import MediaExtractionSource, ParsedImageResult, TableFormat, TableResult
+from services import table_formats
+from services.parse_pipeline import build_parse_response
+from services.table_formats import format_results, render_csv, render_markdown, rows_to_columns
+from services.tweet_media import ExtractedTweetMedia
+
+
+def _table(rows: list[list[str]]) -> TableResult:
+    return TableResult(
+        page_number=1,
+        row_count=len(rows),
+        column_count=max(len(row) for row in rows),
+        columns=rows_to_columns(rows),
+    )
+
+
+def test_rows_to_columns_pads_ragged_rows() -> None:
+    table = _table([["Year", "Revenue", "Note"], ["2023", "1,200"], ["2024", "1,500", "est."]])
+
+    assert table.columns == [
+        ["Year", "2023", "2024"],
+        ["Revenue", "1,200", "1,500"],
+        ["Note", "", "est."],
+    ]
+
+
+def test_render_markdown_from_columns() -> None:
+    table = _table([["A", "B"], ["1", "line\nbreak"]])
+
+    assert render_markdown(table) == "| A | B |\n| --- | --- |\n| 1 | line break |"
+
+
+def test_render_csv_quotes_cells() -> None:
+    table = _table([["Label", "Value"], ['Say "hi"', "1,200"], ["multi\nline", "3"]])
+
+    assert render_csv(table) == 'Label,Value\r\n"Say ""hi""","1,200"\r\n"multi\nline",3\r\n'
+
+
+def test_format_results_copies_only_the_requested_representation() -> None:
+    result = ParsedImageResult(
+        image_url="https://pbs.twimg.com/media/a.jpg",
+        filename="a.jpg",
+        success=True,
+        tables=[_table([["A"], ["1"]])],
+    )
+
+    as_csv = format_results([result], TableFormat.csv)[0].tables[0]
+    as_json = format_results([result], TableFormat.json)[0].tables[0]
+
+    assert (as_csv.csv, as_csv.columns, as_csv.markdown) == ("A\r\n1\r\n", None, None)
+    assert (as_json.columns, as_json.markdown) == ([["A", "1"]], None)
+    assert result.tables[0].csv is None
+
+
+def test_render_arrow_round_trips() -> None:
+    pyarrow = pytest.importorskip("pyarrow")
+    table = table_formats.format_table(_table([["A", "B"], ["1", "2"]]), TableFormat.arrow)
+
+    reader = pyarrow.ipc.open_stream(base64.b64decode(table.arrow))
+    assert reader.read_all().to_pydict() == {"A": ["1"], "B": ["2"]}
+
+
+@pytest.mark.parametrize("table_format", [TableFormat.csv, TableFormat.arrow])
+def test_combined_markdown_keeps_table_rows_in_every_format(table_format: TableFormat) -> None:
+    if table_format is TableFormat.arrow:
+        pytest.importorskip("pyarrow")
+    extracted = ExtractedTweetMedia(
+        tweet_id="123",
+        normalized_tweet_url="https://x.com/user/status/123",
+        image_urls=["https://pbs.twimg.com/media/a.jpg"],
+        source=MediaExtractionSource.syndication,
+        warnings=[],
+    )
+    result = ParsedImageResult(
+        image_url="https://pbs.twimg.com/media/a.jpg",
+        filename="a.jpg",
+        success=True,
+        tables=[_table([["Year", "Revenue"], ["2024", "1,500"]])],
+    )
+
+    response = build_parse_response(extracted, [result], table_format)
+
+    assert "| 2024 | 1,500 |" in response.combined_markdown
+    assert response.results[0].tables[0].markdown is None
+
+
+def _fake_parse(monkeypatch) -> None:  # noqa: ANN001
+    from api import parse as parse_api
+    from services import parse_pipeline
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=["https://pbs.twimg.com/media/a.jpg"],
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        return ParsedImageResult(
+            image_url=image_url,
+            filename="a.jpg",
+            success=True,
+            markdown="chart",
+            tables=[_table([["Year", "Revenue"], ["2024", "1,500"]])],
+        )
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+
+def test_parse_tweet_returns_tables_in_requested_format(monkeypatch) -> None:  # noqa: ANN001
+    _fake_parse(monkeypatch)
+    client = TestClient(app)
+    body = {"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"}
+
+    default = client.post("/parse-tweet", json=body).json()
+    as_json = client.post("/parse-tweet?format=json", json=body).json()
+
+    assert default["results"][0]["tables"][0]["markdown"].startswith("| Year | Revenue |")
+    assert as_json["results"][0]["tables"][0]["columns"] == [["Year", "2024"], ["Revenue", "1,500"]]
+    assert set(default["results"][0]["tables"][0]) == {"page_number", "row_count", "column_count", "markdown", "bbox"}
+    assert set(as_json["results"][0]["tables"][0]) == {"page_number", "row_count", "column_count", "columns", "bbox"}
+    assert "| 2024 | 1,500 |" in as_json["combined_markdown"]
+
+
+def test_parse_tweet_rejects_arrow_without_pyarrow(monkeypatch) -> None:  # noqa: ANN001
+    _fake_parse(monkeypatch)
+    monkeypatch.setattr(table_formats, "pyarrow", None)
+
+    response = TestClient(app).post(
+        "/parse-tweet?format=arrow",
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "UNSUPPORTED_FORMAT"
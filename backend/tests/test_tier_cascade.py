@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import pytest
+
+from models import ParsedImageResult, ParseTier, TableResult
+from services import llamacloud_parser
+from services.llamacloud_parser import ParseSettings, parse_image_bytes
+from services.table_formats import rows_to_columns
+from services.tier_cascade import quality_issue
+
+
+def _result(markdown: str = "Revenue 2024: 1,500", rows: list[list[str]] | None = None) -> ParsedImageResult:
+    tables = []
+    if rows is not None:
+        tables.append(
+            TableResult(
+                page_number=1,
+                row_count=len(rows),
+                column_count=max(len(row) for row in rows),
+                columns=rows_to_columns(rows),
+            )
+        )
+    return ParsedImageResult(
+        image_url="https://pbs.twimg.com/media/a.jpg",
+        filename="a.jpg",
+        success=True,
+        markdown=markdown,
+        tables=tables,
+    )
+
+
+@pytest.mark.parametrize(
+    ("result", "issue"),
+    [
+        (_result(rows=[["Year", "Revenue"], ["2023", "1,200"], ["2024", "1,500"]]), None),
+        (_result(markdown="", rows=None), "empty"),
+        (_result(markdown="A bar chart", rows=None), "no_values"),
+        (_result(rows=[["Year", "Revenue"]]), "header_only_table"),
+        (_result(rows=[["Year", "Revenue", "Growth"], ["2023"], ["2024", "1,500"]]), "sparse_table"),
+        (ParsedImageResult(image_url="https://pbs.twimg.com/media/a.jpg", filename="a.jpg", success=False), "failed"),
+    ],
+)
+def test_quality_issue(result: ParsedImageResult, issue: str | None) -> None:
+    assert quality_issue(result) == issue
+
+
+def _parses_by_tier(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_llama_cloud,  # noqa: ANN001
+    markdown_by_tier: dict[str, str],
+) -> None:
+    async def parse(self, **kwargs):  # noqa: ANN001, ANN003
+        fake_llama_cloud.parse_calls.append(kwargs)
+        if kwargs["tier"] not in markdown_by_tier:
+            raise RuntimeError("parse job failed")
+        return SimpleNamespace(
+            markdown=SimpleNamespace(pages=[SimpleNamespace(markdown=markdown_by_tier[kwargs["tier"]])]),
+            items=SimpleNamespace(pages=[]),
+        )
+
+    monkeypatch.setattr(fake_llama_cloud, "_parse", parse)
+    monkeypatch.setattr(
+        llamacloud_parser,
+        "TIER_CASCADE",
+        [ParseTier.fast, ParseTier.cost_effective, ParseTier.agentic],
+    )
+
+
+async def _parse_auto() -> ParsedImageResult:
+    return await parse_image_bytes(
+        image_bytes=b"chart",
+        filename="a.png",
+        image_url="https://pbs.twimg.com/media/a.png",
+        api_key="llx-1",
+        settings=ParseSettings(tier=ParseTier.auto),
+    )
+
+
+@pytest.mark.asyncio
+async def test_auto_tier_keeps_cheap_result_that_passes(monkeypatch, fake_llama_cloud) -> None:  # noqa: ANN001
+    _parses_by_tier(monkeypatch, fake_llama_cloud, {"fast": "Revenue 2024: 1,500"})
+
+    result = await _parse_auto()
+
+    assert [call["tier"] for call in fake_llama_cloud.parse_calls] == ["fast"]
+    assert (result.tier, result.escalation_reasons) == (ParseTier.fast, [])
+
+
+@pytest.mark.asyncio
+async def test_auto_tier_escalates_with_one_upload(monkeypatch, fake_llama_cloud) -> None:  # noqa: ANN001
+    _parses_by_tier(
+        monkeypatch,
+        fake_llama_cloud,
+        {"fast": "", "cost_effective": "A bar chart", "agentic": "Revenue 2024: 1,500"},
+    )
+
+    result = await _parse_auto()
+    repeat = await _parse_auto()
+
+    assert [call["tier"] for call in fake_llama_cloud.parse_calls] == ["fast", "cost_effective", "agentic"]
+    assert len(fake_llama_cloud.uploads) == 1
+    assert result.tier == ParseTier.agentic
+    assert result.markdown == "Revenue 2024: 1,500"
+    assert result.escalation_reasons == ["fast: empty", "cost_effective: no_values"]
+    assert (repeat.tier, repeat.from_cache) == (ParseTier.agentic, True)
+
+
+@pytest.mark.asyncio
+async def test_auto_tier_keeps_cheaper_result_when_higher_tier_fails(
+    monkeypatch,  # noqa: ANN001
+    fake_llama_cloud,  # noqa: ANN001
+) -> None:
+    _parses_by_tier(monkeypatch, fake_llama_cloud, {"fast": "", "cost_effective": "A bar chart"})
+
+    result = await _parse_auto()
+
+    assert result.success is True
+    assert (result.tier, result.markdown) == (ParseTier.cost_effective, "A bar chart")
+    assert result.escalation_reasons == ["fast: empty", "cost_effective: no_values"]
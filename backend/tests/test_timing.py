@@ -0,0 +1,113 @@
+import asyncio
+import json
+import logging
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import MediaExtractionSource, ParsedImageResult, ParseTier
+from services.llamacloud_parser import ParseSettings, parse_image_from_url
+from services.log_format import JsonLogFormatter
+from services.timing import record_stage, start_request_timings
+from services.tweet_media import ExtractedTweetMedia
+
+IMAGE_URLS = ["https://pbs.twimg.com/media/a.jpg", "https://pbs.twimg.com/media/b.jpg"]
+
+
+def _patch_pipeline(monkeypatch) -> None:  # noqa: ANN001
+    from api import parse as parse_api
+    from services import parse_pipeline
+
+    async def fake_extract(tweet_url: str, x_bearer_token=None, client=None):  # noqa: ANN001
+        record_stage("extract", 0.02)
+        return ExtractedTweetMedia(
+            tweet_id="123",
+            normalized_tweet_url="https://x.com/user/status/123",
+            image_urls=list(IMAGE_URLS),
+            source=MediaExtractionSource.syndication,
+            warnings=[],
+        )
+
+    async def fake_parse_image_from_url(image_url: str, api_key: str, settings, client=None):  # noqa: ANN001
+        record_stage("download", 0.01, image_url)
+        record_stage("upload", 0.03, image_url)
+        record_stage("parse", 0.5, image_url)
+        return ParsedImageResult(image_url=image_url, filename="a.jpg", success=True, markdown="hello")
+
+    monkeypatch.setattr(parse_api, "extract_tweet_images", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "parse_image_from_url", fake_parse_image_from_url)
+
+
+def test_parse_tweet_sets_server_timing_header(monkeypatch) -> None:  # noqa: ANN001
+    _patch_pipeline(monkeypatch)
+
+    response = TestClient(app).post(
+        "/parse-tweet",
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123"},
+    )
+
+    assert response.status_code == 200
+    header = response.headers["Server-Timing"]
+    assert "extract;dur=20.0" in header
+    assert 'download-1;dur=10.0;desc="image 1"' in header
+    assert 'parse-2;dur=500.0;desc="image 2"' in header
+    assert "total;dur=" in header
+    assert response.json()["timings"] is None
+
+
+def test_parse_tweet_includes_timings_when_requested(monkeypatch) -> None:  # noqa: ANN001
+    _patch_pipeline(monkeypatch)
+
+    response = TestClient(app).post(
+        "/parse-tweet",
+        json={"api_key": "llx-123", "tweet_url": "https://x.com/user/status/123", "include_timings": True},
+    )
+
+    timings = response.json()["timings"]
+    assert timings["extraction_ms"] == 20.0
+    assert [image["image_url"] for image in timings["images"]] == IMAGE_URLS
+    assert timings["images"][0] == {
+        "image_url": IMAGE_URLS[0],
+        "download_ms": 10.0,
+        "upload_ms": 30.0,
+        "parse_ms": 500.0,
+    }
+
+
+def test_json_log_formatter_emits_extra_fields() -> None:
+    record = logging.LogRecord("twitter_chart_parser", logging.INFO, __file__, 1, "request", None, None)
+    record.path = "/parse-tweet"
+    record.duration_ms = 12.5
+
+    payload = json.loads(JsonLogFormatter().format(record))
+
+    assert payload["message"] == "request"
+    assert payload["level"] == "INFO"
+    assert payload["path"] == "/parse-tweet"
+    assert payload["duration_ms"] == 12.5
+
+
+
+@pytest.mark.asyncio
+async def test_callers_sharing_a_parse_each_get_its_stage_timings(fake_llama_cloud) -> None:  # noqa: ANN001
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, content=b"image-bytes")
+
+    async def caller(client: httpx.AsyncClient) -> float | None:
+        timings = start_request_timings()
+        await parse_image_from_url(IMAGE_URLS[0], "llx-1", ParseSettings(tier=ParseTier.fast), client)
+        return timings.to_model([IMAGE_URLS[0]]).images[0].download_ms
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        callers = [asyncio.create_task(caller(client)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        release.set()
+        download_ms = await asyncio.gather(*callers)
+
+    assert len(fake_llama_cloud.parse_calls) == 1
+    assert all(value is not None for value in download_ms)
@@ -95,3 +95,251 @@ async def test_extract_falls_back_to_fxtwitter(monkeypatch: pytest.MonkeyPatch)
     result = await extract_tweet_images("https://x.com/user/status/123")
     assert result.source == MediaExtractionSource.fxtwitter_api
     assert result.image_urls == ["https://pbs.twimg.com/media/from-fxtwitter.jpg?name=orig"]
+
+
+@pytest.mark.asyncio
+async def test_extract_serves_repeat_tweet_from_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    async def fake_syndication(tweet_id: str, client):  # noqa: ANN001
+        nonlocal calls
+        calls += 1
+        return ["https://pbs.twimg.com/media/a.jpg"]
+
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", fake_syndication)
+
+    first = await extract_tweet_images("https://x.com/user/status/123")
+    second = await extract_tweet_images("https://twitter.com/other/status/123")
+
+    assert calls == 1
+    assert second.image_urls == first.image_urls
+    assert second.source == MediaExtractionSource.syndication
+    assert second.normalized_tweet_url == "https://x.com/other/status/123"
+
+
+@pytest.mark.asyncio
+async def test_extract_negative_caches_no_media_with_separate_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    async def fake_empty(*args):  # noqa: ANN002
+        nonlocal calls
+        calls += 1
+        return []
+
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", fake_empty)
+    monkeypatch.setattr(tweet_media, "_extract_via_fxtwitter_api", fake_empty)
+    monkeypatch.setattr(tweet_media, "_extract_via_html_meta", fake_empty)
+
+    for _ in range(2):
+        with pytest.raises(TweetMediaError) as exc_info:
+            await extract_tweet_images("https://x.com/user/status/123")
+        assert exc_info.value.code == MediaExtractionErrorCode.no_media_found
+    assert calls == 3
+
+    monkeypatch.setattr(tweet_media, "MEDIA_CACHE_NEGATIVE_TTL_SECONDS", 0)
+    tweet_media.media_cache.clear()
+    for _ in range(2):
+        with pytest.raises(TweetMediaError):
+            await extract_tweet_images("https://x.com/user/status/123")
+    assert calls == 9
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_does_not_block_requests_with_bearer_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_empty(*args):  # noqa: ANN002
+        return []
+
+    async def fake_x_api(tweet_id: str, bearer_token: str, client):  # noqa: ANN001
+        return ["https://pbs.twimg.com/media/from-x.jpg"]
+
+    monkeypatch.setattr(tweet_media, "_extract_via_x_api", fake_x_api)
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", fake_empty)
+    monkeypatch.setattr(tweet_media, "_extract_via_fxtwitter_api", fake_empty)
+    monkeypatch.setattr(tweet_media, "_extract_via_html_meta", fake_empty)
+
+    with pytest.raises(TweetMediaError):
+        await extract_tweet_images("https://x.com/user/status/123")
+
+    result = await extract_tweet_images("https://x.com/user/status/123", x_bearer_token="token")
+    assert result.source == MediaExtractionSource.x_api
+    assert result.image_urls == ["https://pbs.twimg.com/media/from-x.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_hedged_extraction_starts_fallback_while_primary_is_slow(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    events: list[str] = []
+
+    async def slow_empty_syndication(tweet_id: str, client):  # noqa: ANN001
+        events.append("syndication:start")
+        await asyncio.sleep(0.2)
+        events.append("syndication:empty")
+        return []
+
+    async def fake_fxtwitter(tweet_id: str, client):  # noqa: ANN001
+        events.append("fxtwitter:start")
+        return ["https://pbs.twimg.com/media/fx.jpg"]
+
+    async def fake_html(tweet_url: str, client):  # noqa: ANN001
+        events.append("html:start")
+        return []
+
+    monkeypatch.setattr(tweet_media, "MEDIA_EXTRACTION_MODE", "hedged")
+    monkeypatch.setattr(tweet_media, "MEDIA_EXTRACTION_HEDGE_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", slow_empty_syndication)
+    monkeypatch.setattr(tweet_media, "_extract_via_fxtwitter_api", fake_fxtwitter)
+    monkeypatch.setattr(tweet_media, "_extract_via_html_meta", fake_html)
+
+    result = await extract_tweet_images("https://x.com/user/status/123")
+
+    assert result.source == MediaExtractionSource.fxtwitter_api
+    assert result.image_urls == ["https://pbs.twimg.com/media/fx.jpg"]
+    assert events.index("fxtwitter:start") < events.index("syndication:empty")
+    assert any("fxtwitter" in warning for warning in result.warnings)
+
+
+@pytest.mark.asyncio
+async def test_parallel_extraction_prefers_priority_and_cancels_losers(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    cancelled: list[str] = []
+
+    async def slow_syndication(tweet_id: str, client):  # noqa: ANN001
+        await asyncio.sleep(0.05)
+        return ["https://pbs.twimg.com/media/syn.jpg"]
+
+    async def fast_fxtwitter(tweet_id: str, client):  # noqa: ANN001
+        return ["https://pbs.twimg.com/media/fx.jpg"]
+
+    async def hanging_html(tweet_url: str, client):  # noqa: ANN001
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("html")
+            raise
+        return []
+
+    monkeypatch.setattr(tweet_media, "MEDIA_EXTRACTION_MODE", "parallel")
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", slow_syndication)
+    monkeypatch.setattr(tweet_media, "_extract_via_fxtwitter_api", fast_fxtwitter)
+    monkeypatch.setattr(tweet_media, "_extract_via_html_meta", hanging_html)
+
+    result = await extract_tweet_images("https://x.com/user/status/123")
+
+    assert result.source == MediaExtractionSource.syndication
+    assert result.image_urls == ["https://pbs.twimg.com/media/syn.jpg"]
+    assert result.warnings == []
+    assert cancelled == ["html"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_extractions_of_same_tweet_are_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    calls = 0
+
+    async def slow_syndication(tweet_id: str, client):  # noqa: ANN001
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["https://pbs.twimg.com/media/a.jpg"]
+
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", slow_syndication)
+
+    results = await asyncio.gather(*(extract_tweet_images("https://x.com/user/status/123") for _ in range(5)))
+
+    assert calls == 1
+    assert all(result.image_urls == ["https://pbs.twimg.com/media/a.jpg"] for result in results)
+
+
+
+@pytest.mark.asyncio
+async def test_concurrent_extraction_with_bearer_token_is_not_shared_with_tokenless(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import asyncio
+
+    async def slow_syndication(tweet_id: str, client):  # noqa: ANN001
+        await asyncio.sleep(0.01)
+        return ["https://pbs.twimg.com/media/syn.jpg"]
+
+    async def fake_x_api(tweet_id: str, bearer_token: str, client):  # noqa: ANN001
+        await asyncio.sleep(0.01)
+        return ["https://pbs.twimg.com/media/from-x.jpg"]
+
+    monkeypatch.setattr(tweet_media, "_extract_via_syndication", slow_syndication)
+    monkeypatch.setattr(tweet_media, "_extract_via_x_api", fake_x_api)
+
+    tokenless, with_token = await asyncio.gather(
+        extract_tweet_images("https://x.com/user/status/123"),
+        extract_tweet_images("https://x.com/user/status/123", x_bearer_token="token"),
+    )
+
+    assert tokenless.source == MediaExtractionSource.syndication
+    assert with_token.source == MediaExtractionSource.x_api
+
+async def _chunked(data: bytes, size: int, consumed: list[int]):  # noqa: ANN202
+    for start in range(0, len(data), size):
+        consumed.append(start)
+        yield data[start : start + size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100_000])
+async def test_html_scan_finds_urls_across_chunk_boundaries_and_stops_at_head(chunk_size: int) -> None:
+    head = (
+        '<html><head><meta property="og:image" content="https://pbs.twimg.com/media/AAA?format=jpg&name=large">'
+        + "<script>" + "x" * 5000 + "</script>"
+        + '<meta content="https://pbs.twimg.com/media/BBB.png"></HEAD>'
+    )
+    page = (head + '<body><img src="https://pbs.twimg.com/media/CCC.jpg">' + "y" * 50_000).encode()
+    consumed: list[int] = []
+
+    urls = await tweet_media._scan_html_for_media_urls(_chunked(page, chunk_size, consumed), "utf-8", 1 << 20)
+
+    assert urls == [
+        "https://pbs.twimg.com/media/AAA?format=jpg&name=large",
+        "https://pbs.twimg.com/media/BBB",
+    ]
+    assert consumed[-1] < len(head) + chunk_size
+
+
+@pytest.mark.asyncio
+async def test_html_scan_stops_at_byte_cap_without_partial_urls() -> None:
+    page = (
+        '<meta content="https://pbs.twimg.com/media/AAA.jpg">' + "x" * 4000 + "https://pbs.twimg.com/media/BBBBBB"
+    ).encode()
+    consumed: list[int] = []
+
+    urls = await tweet_media._scan_html_for_media_urls(_chunked(page, 16, consumed), "utf-8", len(page) - 3)
+
+    assert urls == ["https://pbs.twimg.com/media/AAA"]
+
+
+@pytest.mark.asyncio
+async def test_html_meta_extractor_streams_page() -> None:
+    import httpx
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = '<head><meta content="https://pbs.twimg.com/media/AAA.jpg"></head><body>' + "z" * 100_000
+        return httpx.Response(200, content=body.encode(), headers={"Content-Type": "text/html; charset=utf-8"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        urls = await tweet_media._extract_via_html_meta("https://x.com/user/status/1", client)
+
+    assert urls == ["https://pbs.twimg.com/media/AAA"]
+
+
+@pytest.mark.asyncio
+async def test_html_meta_extractor_falls_back_to_utf8_for_unknown_charset() -> None:
+    import httpx
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = '<head><meta content="https://pbs.twimg.com/media/AAA.jpg"></head>'
+        return httpx.Response(200, content=body.encode(), headers={"Content-Type": "text/html; charset=utf8mb4"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        urls = await tweet_media._extract_via_html_meta("https://x.com/user/status/1", client)
+
+    assert urls == ["https://pbs.twimg.com/media/AAA"]
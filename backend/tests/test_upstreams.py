@@ -0,0 +1,156 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import MediaExtractionSource
+from services import tweet_media, upstreams
+from services.deadline import Deadline, deadline_scope
+from services.tweet_media import _request_with_retries, extract_tweet_images
+from services.upstreams import CircuitOpenError, get_upstream_guard
+
+
+def _client(responses: list[httpx.Response], calls: list[str]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def recorded_sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(tweet_media.asyncio, "sleep", fake_sleep)
+    return sleeps
+
+
+@pytest.mark.asyncio
+async def test_retry_honours_retry_after_header(recorded_sleeps: list[float]) -> None:
+    calls: list[str] = []
+    responses = [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)]
+
+    async with _client(responses, calls) as client:
+        response = await _request_with_retries(client, "GET", "https://api.fxtwitter.com/status/1")
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert recorded_sleeps == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_backoff_outlasts_request_deadline(recorded_sleeps: list[float]) -> None:
+    calls: list[str] = []
+    responses = [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)]
+
+    async with _client(responses, calls) as client:
+        with deadline_scope(Deadline(1.0)):
+            response = await _request_with_retries(client, "GET", "https://api.fxtwitter.com/status/1")
+
+    assert response.status_code == 429
+    assert len(calls) == 1
+    assert recorded_sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_budget_is_exhausted(recorded_sleeps: list[float]) -> None:
+    upstreams.retry_budget.balance = 0
+    upstreams.retry_budget.min_per_second = 0
+    upstreams.retry_budget.ratio = 0
+    calls: list[str] = []
+
+    try:
+        async with _client([httpx.Response(503)], calls) as client:
+            response = await _request_with_retries(client, "GET", "https://api.fxtwitter.com/status/1")
+    finally:
+        upstreams.retry_budget.min_per_second = upstreams.RETRY_BUDGET_MIN_PER_SECOND
+        upstreams.retry_budget.ratio = upstreams.RETRY_BUDGET_RATIO
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert upstreams.retry_budget.retries_denied == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_failures_and_short_circuits(recorded_sleeps: list[float]) -> None:
+    calls: list[str] = []
+    url = "https://cdn.syndication.twimg.com/tweet-result"
+
+    async with _client([httpx.Response(503)], calls) as client:
+        while get_upstream_guard("cdn.syndication.twimg.com").breaker.state == "closed":
+            await _request_with_retries(client, "GET", url)
+        attempts = len(calls)
+
+        with pytest.raises(CircuitOpenError):
+            await _request_with_retries(client, "GET", url)
+
+    assert len(calls) == attempts
+    snapshot = TestClient(app).get("/upstreams").json()
+    assert snapshot["upstreams"]["cdn.syndication.twimg.com"]["circuit_state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_once_failures_open_the_circuit(recorded_sleeps: list[float]) -> None:
+    breaker = get_upstream_guard("cdn.syndication.twimg.com").breaker
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.record_failure()
+    calls: list[str] = []
+
+    async with _client([httpx.Response(503)], calls) as client:
+        response = await _request_with_retries(client, "GET", "https://cdn.syndication.twimg.com/tweet-result")
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert recorded_sleeps == []
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_releases_the_trial_slot() -> None:
+    import asyncio
+    import time
+
+    breaker = get_upstream_guard("cdn.syndication.twimg.com").breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at = time.monotonic() - breaker.cooldown_seconds
+    started = asyncio.Event()
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    url = "https://cdn.syndication.twimg.com/tweet-result"
+    async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+        trial = asyncio.create_task(_request_with_retries(client, "GET", url))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    assert breaker.state == "half_open"
+    assert breaker.trial_in_flight is False
+    async with _client([httpx.Response(200)], []) as client:
+        assert (await _request_with_retries(client, "GET", url)).status_code == 200
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_extraction_skips_strategy_with_open_circuit() -> None:
+    breaker = get_upstream_guard("cdn.syndication.twimg.com").breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    calls: list[str] = []
+    fxtwitter_payload = {"tweet": {"media": {"photos": [{"url": "https://pbs.twimg.com/media/fx.jpg"}]}}}
+
+    async with _client([httpx.Response(200, json=fxtwitter_payload)], calls) as client:
+        result = await extract_tweet_images("https://x.com/user/status/123", client=client)
+
+    assert result.source == MediaExtractionSource.fxtwitter_api
+    assert all("syndication" not in call for call in calls)
+    assert any("Skipped syndication" in warning for warning in result.warnings)
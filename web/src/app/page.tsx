@@ -4,13 +4,15 @@ import { useEffect, useState } from "react";
 
 import ParseResults from "@/components/ParseResults";
 import TweetParseForm from "@/components/TweetParseForm";
-import { parseTweet, validateLlamaKey } from "@/lib/api";
+import { parseTweetStream, validateLlamaKey } from "@/lib/api";
 import { clearStoredApiKey, getStoredApiKey, setStoredApiKey } from "@/lib/apiKeyStorage";
 import type {
   ApiKeyValidationStatus,
   OutputViewMode,
+  ParsedImageResult,
   ParseTweetRequest,
   ParseTweetResponse,
+  ParseTweetStreamEvent,
 } from "@/types";
 
 export default function HomePage() {
@@ -21,6 +23,7 @@ export default function HomePage() {
   const [result, setResult] = useState<ParseTweetResponse | null>(null);
   const [outputMode, setOutputMode] = useState<OutputViewMode>("rendered");
   const [loading, setLoading] = useState(false);
+  const [imageCount, setImageCount] = useState<number | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
@@ -95,12 +98,39 @@ export default function HomePage() {
       setApiKeyStatus("valid");
     }
 
+    setResult(null);
+    setImageCount(null);
+    // Images arrive in completion order; keep them in tweet order as they come in.
+    const parsedImages: ParsedImageResult[] = [];
+    const handleEvent = (event: ParseTweetStreamEvent) => {
+      if (event.event === "extracted") {
+        setImageCount(event.data.image_urls.length);
+        setResult({
+          tweet_id: event.data.tweet_id,
+          normalized_tweet_url: event.data.normalized_tweet_url,
+          source: event.data.source,
+          results: [],
+          combined_markdown: "",
+          warnings: event.data.warnings,
+        });
+      } else if (event.event === "image") {
+        parsedImages[event.data.index] = event.data.result;
+        const results = parsedImages.filter(Boolean);
+        setResult((current) => (current ? { ...current, results } : current));
+      } else {
+        const { combined_markdown, warnings } = event.data;
+        setResult((current) => (current ? { ...current, combined_markdown, warnings } : current));
+      }
+    };
+
     try {
-      const response = await parseTweet({
-        ...payload,
-        api_key: trimmedApiKey,
-      });
-      setResult(response);
+      await parseTweetStream(
+        {
+          ...payload,
+          api_key: trimmedApiKey,
+        },
+        handleEvent,
+      );
     } catch (parseError) {
       setError(parseError instanceof Error ? parseError.message : "Failed to parse tweet.");
     } finally {
@@ -108,6 +138,16 @@ export default function HomePage() {
     }
   };
 
+  const progressMessage = () => {
+    if (apiKeyStatus === "checking") {
+      return "Validating API key...";
+    }
+    if (imageCount === null) {
+      return "Finding tweet images...";
+    }
+    return `Parsed ${result?.results.length ?? 0} of ${imageCount} image(s)...`;
+  };
+
   return (
     <div className="min-h-screen bg-background">
       <div className="mx-auto flex w-full max-w-6xl flex-col gap-4 px-4 py-6 sm:px-6">
@@ -167,7 +207,7 @@ export default function HomePage() {
         {loading ? (
           <div className="flex items-center gap-2 rounded-lg border border-border bg-background-secondary px-4 py-3 text-sm text-foreground-muted">
             <div className="h-4 w-4 animate-spin rounded-full border-2 border-foreground-muted border-t-transparent" />
-            {apiKeyStatus === "checking" ? "Validating API key..." : "Parsing in progress..."}
+            {progressMessage()}
           </div>
         ) : null}
 
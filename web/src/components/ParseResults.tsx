@@ -145,13 +145,13 @@ export default function ParseResults({
                       </p>
                       {outputMode === "raw" ? (
                         <pre className="max-h-64 overflow-auto whitespace-pre-wrap rounded-lg border border-border bg-background-secondary p-3 font-mono text-sm text-foreground-secondary">
-                          {table.markdown}
+                          {table.markdown ?? ""}
                         </pre>
                       ) : (
                         <div className="max-h-64 overflow-auto rounded-lg border border-border bg-background-secondary p-3">
                           <div className="markdown-rendered text-sm text-foreground-secondary">
                             <ReactMarkdown remarkPlugins={[remarkGfm]} rehypePlugins={[rehypeRaw, rehypeSanitize]}>
-                              {table.markdown}
+                              {table.markdown ?? ""}
                             </ReactMarkdown>
                           </div>
                         </div>
@@ -16,6 +16,7 @@ interface TweetParseFormProps {
 const TIERS: Array<{ value: ParseTier; label: string }> = [
   { value: "agentic", label: "Agentic (recommended)" },
   { value: "agentic_plus", label: "Agentic Plus (higher quality, slower)" },
+  { value: "auto", label: "Auto (cheaper tier first, escalates when needed)" },
 ];
 
 export default function TweetParseForm({
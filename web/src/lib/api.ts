@@ -1,6 +1,7 @@
 import type {
   ParseTweetRequest,
   ParseTweetResponse,
+  ParseTweetStreamEvent,
   ValidateLlamaKeyResponse,
 } from "@/types";
 
@@ -47,6 +48,41 @@ export async function parseTweet(payload: ParseTweetRequest): Promise<ParseTweet
   return (await response.json()) as ParseTweetResponse;
 }
 
+export async function parseTweetStream(
+  payload: ParseTweetRequest,
+  onEvent: (event: ParseTweetStreamEvent) => void,
+): Promise<void> {
+  const response = await fetch(`${API_BASE_URL}/parse-tweet/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify(payload),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(await parseErrorMessage(response));
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffered += decoder.decode(value, { stream: !done });
+    const lines = buffered.split("\n");
+    buffered = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line.trim()) {
+        onEvent(JSON.parse(line) as ParseTweetStreamEvent);
+      }
+    }
+    if (done) {
+      break;
+    }
+  }
+}
+
 export async function extractTweetImages(tweetUrl: string, xBearerToken?: string): Promise<{ image_urls: string[] }> {
   const response = await fetch(`${API_BASE_URL}/extract-tweet-images`, {
     method: "POST",
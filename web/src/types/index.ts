@@ -1,4 +1,4 @@
-export type ParseTier = "agentic" | "agentic_plus";
+export type ParseTier = "auto" | "agentic" | "agentic_plus";
 export type OutputViewMode = "rendered" | "raw";
 export type ApiKeyValidationStatus = "idle" | "checking" | "valid" | "invalid";
 
@@ -8,7 +8,10 @@ export interface TableResult {
   page_number: number;
   row_count: number;
   column_count: number;
-  markdown: string;
+  columns?: string[][] | null;
+  markdown?: string | null;
+  csv?: string | null;
+  arrow?: string | null;
   bbox?: number[] | null;
 }
 
@@ -19,6 +22,12 @@ export interface ParsedImageResult {
   markdown: string;
   tables: TableResult[];
   error?: string | null;
+  from_cache?: boolean;
+  timed_out?: boolean;
+  tier?: string | null;
+  escalation_reasons?: string[];
+  reused_from?: string | null;
+  perceptual_distance?: number | null;
 }
 
 export interface ParseTweetRequest {
@@ -27,6 +36,21 @@ export interface ParseTweetRequest {
   tier: ParseTier;
   enable_chart_parsing: boolean;
   x_bearer_token?: string;
+  include_timings?: boolean;
+  deadline_seconds?: number;
+}
+
+export interface ImageTimings {
+  image_url: string;
+  download_ms?: number | null;
+  upload_ms?: number | null;
+  parse_ms?: number | null;
+}
+
+export interface ParseTimings {
+  extraction_ms?: number | null;
+  images: ImageTimings[];
+  total_ms: number;
 }
 
 export interface ParseTweetResponse {
@@ -36,8 +60,32 @@ export interface ParseTweetResponse {
   results: ParsedImageResult[];
   combined_markdown: string;
   warnings: string[];
+  timings?: ParseTimings | null;
 }
 
+export interface ExtractedTweetEvent {
+  tweet_id: string;
+  normalized_tweet_url: string;
+  image_urls: string[];
+  source: MediaExtractionSource;
+  warnings: string[];
+}
+
+export interface ParsedImageEvent {
+  index: number;
+  result: ParsedImageResult;
+}
+
+export interface ParseCompleteEvent {
+  combined_markdown: string;
+  warnings: string[];
+}
+
+export type ParseTweetStreamEvent =
+  | { event: "extracted"; data: ExtractedTweetEvent }
+  | { event: "image"; data: ParsedImageEvent }
+  | { event: "complete"; data: ParseCompleteEvent };
+
 export interface ValidateLlamaKeyResponse {
   valid: boolean;
   message: string;